@@ -0,0 +1,76 @@
+import numpy as np
+
+from time import time
+from scipy.sparse import csr_matrix, identity, kron, random as sparse_random
+from scipy.sparse.linalg import spsolve
+
+from pulse.processing.sweep_solver import SweepSolver
+
+
+def get_pipe_network_matrices(main_line_nodes=1000, dofs_per_node=6, number_branches=10, branch_nodes=50, seed=0):
+    """
+    This function returns stiffness-like and mass-like matrices with the sparsity pattern of a
+    pipe network: a main line of nodes with side branches connected along it.
+    """
+
+    rng = np.random.default_rng(seed)
+
+    rows = list(range(main_line_nodes - 1))
+    cols = list(range(1, main_line_nodes))
+
+    number_nodes = main_line_nodes
+    for node in rng.choice(np.arange(1, main_line_nodes - 1), number_branches, replace=False):
+        branch = np.arange(number_nodes, number_nodes + branch_nodes)
+        rows.extend([node, *branch[:-1]])
+        cols.extend(branch)
+        number_nodes += branch_nodes
+
+    adjacency = csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(number_nodes, number_nodes))
+    adjacency = adjacency + adjacency.T + identity(number_nodes)
+
+    block = sparse_random(dofs_per_node, dofs_per_node, density=0.8, random_state=seed).toarray()
+    block = block + block.T + dofs_per_node * np.eye(dofs_per_node)
+
+    K = kron(adjacency, block, format="csr") + 10 * identity(number_nodes * dofs_per_node, format="csr")
+    M = kron(adjacency, np.eye(dofs_per_node), format="csr") * 1e-3 + identity(number_nodes * dofs_per_node, format="csr")
+
+    return K, M
+
+
+def run_sweep(K, M, frequencies, solver=None):
+
+    F = np.ones(K.shape[0], dtype=complex)
+    solution = np.zeros((K.shape[0], len(frequencies)), dtype=complex)
+
+    start = time()
+    for i, freq in enumerate(frequencies):
+        omega = 2 * np.pi * freq
+        A = K + 1j * omega * 1e-4 * K - (omega**2) * 1e-3 * M
+        if solver is None:
+            solution[:, i] = spsolve(A, F)
+        else:
+            solution[:, i] = solver.solve(A, F)
+
+    return time() - start, solution
+
+
+if __name__ == "__main__":
+
+    K, M = get_pipe_network_matrices()
+    print(f"Number of degrees of freedom: {K.shape[0]} | nnz: {K.nnz}\n")
+    print(f"{'steps':>8} {'spsolve [ms/step]':>20} {'SweepSolver [ms/step]':>24} {'speed-up':>10}")
+
+    for number_steps in [10, 100, 1000]:
+
+        frequencies = np.linspace(1, 200, number_steps)
+
+        time_spsolve, solution_spsolve = run_sweep(K, M, frequencies)
+        time_sweep, solution_sweep = run_sweep(K, M, frequencies, solver=SweepSolver())
+
+        error = np.max(np.abs(solution_sweep - solution_spsolve)) / np.max(np.abs(solution_spsolve))
+        assert error < 1e-8
+
+        per_step_spsolve = 1e3 * time_spsolve / number_steps
+        per_step_sweep = 1e3 * time_sweep / number_steps
+
+        print(f"{number_steps:>8} {per_step_spsolve:>20.3f} {per_step_sweep:>24.3f} {per_step_spsolve/per_step_sweep:>10.2f}")
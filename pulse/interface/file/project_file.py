@@ -377,6 +377,14 @@ class ProjectFile:
                         f.create_dataset("harmonic_acoustic/frequencies", data=frequencies, dtype=float)
                         f.create_dataset("harmonic_acoustic/solution", data=solution, dtype=complex)
 
+                        # the solutions of the named load cases share the frequencies of the acoustic solution
+                        for name, load_case_solution in acoustic_solver.load_case_solutions.items():
+                            f.create_dataset(f"harmonic_acoustic_load_cases/{name}", data=load_case_solution, dtype=complex)
+
+                        if acoustic_solver.transfer_functions is not None:
+                            for key, data in acoustic_solver.transfer_functions.get_data().items():
+                                f.create_dataset(f"acoustic_transfer_functions/{key}", data=data)
+
                 if analysis_id in [0, 1, 5, 6]:
                     if structural_solver.solution is not None:
                         frequencies = structural_solver.frequencies
@@ -477,6 +485,7 @@ class ProjectFile:
         element_size = kwargs.get('element_size', None)
         geometry_tolerance = kwargs.get('geometry_tolerance', None)
         geometry_filename = kwargs.get('geometry_filename', None)
+        node_numbering = kwargs.get('node_numbering', None)
         
         project_setup = self.read_project_setup_from_file()
         if project_setup is None:
@@ -504,6 +513,9 @@ class ProjectFile:
             if geometry_filename is not None:
                 data['geometry_filename'] = geometry_filename
 
+            if node_numbering is not None:
+                data['node_numbering'] = node_numbering
+
             self.write_project_setup_in_file(data)
             # self.load(self._project_ini_file_path)
 
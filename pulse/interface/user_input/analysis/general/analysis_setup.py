@@ -211,6 +211,12 @@ class AnalysisSetupInput(QDialog):
         global_damping = [alpha_v, beta_v, alpha_h, beta_h]
         analysis_setup["global_damping"] = global_damping
         self.model.set_global_damping(analysis_setup)
+        self.model.set_linear_solver_setup(analysis_setup)
+        self.model.set_sweep_execution_setup(analysis_setup)
+        self.model.set_acoustic_condensation_setup(analysis_setup)
+        self.model.set_reduced_order_setup(analysis_setup)
+        self.model.set_acoustic_load_cases_setup(analysis_setup)
+        self.model.set_transfer_function_setup(analysis_setup)
 
         # from time import time
 
@@ -355,7 +355,8 @@ class ReciprocatingCompressorInputs(QDialog):
 
     def get_aquisition_parameters(self, parameters: dict):
 
-        frequencies = app().project.model.frequencies
+        # the excitation tables are evaluated on the full frequency grid, not on the selected harmonics
+        frequencies = app().project.model.frequency_grid
         rotational_speed = parameters["rotational_speed"]
 
         f_min = frequencies[0]
@@ -870,6 +871,10 @@ class ReciprocatingCompressorInputs(QDialog):
                 return
 
             self.properties._set_nodal_property("reciprocating_compressor_excitation", data, node_id)
+            # the harmonics of the new rotational speed are selected before updating the response
+            app().project.model.update_frequency_selection()
+            # the acoustic response is updated through the transfer functions without solving the model again
+            app().project.update_acoustic_solution_by_superposition()
             self.actions_to_finalize()
 
     def actions_to_finalize(self):
@@ -904,6 +909,7 @@ class ReciprocatingCompressorInputs(QDialog):
             self.remove_table_files_from_nodes(node_id)
 
             self.properties._remove_nodal_property("reciprocating_compressor_excitation", node_id)
+            app().project.model.update_frequency_selection()
             self.actions_to_finalize()
 
     def reset_callback(self):
@@ -933,6 +939,7 @@ class ReciprocatingCompressorInputs(QDialog):
                 self.remove_table_files_from_nodes(node_id)
 
             self.properties._reset_nodal_property("reciprocating_compressor_excitation")
+            app().project.model.update_frequency_selection()
             self.actions_to_finalize()
 
     def load_compressor_excitation_info(self):
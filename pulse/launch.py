@@ -1,4 +1,5 @@
 import logging
+import multiprocessing
 import os
 import platform
 import sys
@@ -93,4 +94,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # the frozen worker processes of the frequency sweeps must run their tasks instead of the application
+    multiprocessing.freeze_support()
     main()
@@ -2,11 +2,11 @@
 
 from pulse.model.perforated_plate import Foks_function
 from pulse.model.node import Node, distance
+from pulse.model.wall_friction import friction_factors, friction_velocities
 
 from numpy import sqrt, pi
 import numpy as np
 from scipy.special import jv, hankel1
-from scipy.optimize import root, fsolve
 
 
 DOF_PER_NODE = 1
@@ -369,6 +369,21 @@ class AcousticElement:
 
         return kappa_complex, impedance_complex
 
+    def get_reynolds_number(self):
+        """
+        This method returns the Reynolds number of the mean flow of the element.
+        """
+        u = self.volumetric_flow_rate / self.cross_section.area_fluid
+        return u * self.cross_section.inner_diameter * self.fluid.density / self.fluid.dynamic_viscosity
+
+    def get_friction_velocity_parameters(self):
+        """
+        This method returns the mean flow velocity, the inner diameter and the kinematic viscosity that define the
+        turbulent friction velocity of the Howe model.
+        """
+        U = self.mach * self.speed_of_sound_corrected()
+        return U, self.cross_section.inner_diameter, self.fluid.kinematic_viscosity
+
     def get_damped_liquid_wave_number_and_acoustic_impedance(self, frequencies: np.ndarray):
 
         omega = 2 * np.pi * frequencies
@@ -387,19 +402,11 @@ class AcousticElement:
 
         A = self.cross_section.area_fluid
         d = self.cross_section.inner_diameter
-        u = Q / A
-
-        Re = u * d * rho_0 / mu
 
-        # Colebrook equation for determining the Darcy friction factor
-        def colebrook_equation(x):
-            return 2 * np.log10(Re * (x**0.5)) - 0.8 - (1 / (x**0.5))
+        Re = self.get_reynolds_number()
 
-        # use Haaland approximation for Colebrook equation as initial guess value for Darcy friction factor
-        x_initial = 1 / ((-1.8 * np.log10(6.9 / Re))**2)
-
-        # Get the Darcy friction factor
-        f_d = fsolve(colebrook_equation, x_initial)
+        # Darcy friction factor of the Colebrook equation, shared by the elements with the same Reynolds number
+        f_d = friction_factors(Re)
 
         k = np.log10(14.3 / (Re**0.05))
         beta = 0.54 * (v / (d**2)) * (Re**k)
@@ -747,10 +754,8 @@ class AcousticElement:
 
             # TODO: prt warning por p < 0.5
             prt = 0.87
-            transc = lambda x: (U/x - (2.44 * np.log(x * di/(2*nu)) + 2))**2
-            res = root(transc, 1e-4, method='hybr')
-
-            ur = res.x[0]
+            # turbulent friction velocity of the log-law, shared by the elements with the same flow
+            ur = float(friction_velocities(*self.get_friction_velocity_parameters()))
             w_ast = 0.01*ur**2/nu
             delta_vs = nu/ur*6.5*(1 + (1.7*(omega/w_ast)**3)/(1+(omega/w_ast)**3))
 
@@ -60,6 +60,7 @@ class Mesh:
         self.length_unit = mesher_setup.get('length_unit', 'meter')
         self.import_type = mesher_setup.get("import_type", 1)
         self.geometry_path = mesher_setup.get('geometry_path', "")
+        self.node_numbering = mesher_setup.get('node_numbering', 'breadth_first')
 
     def generate(self):
         """
@@ -308,24 +309,14 @@ class Mesh:
 
     def _process_line_nodes(self):
         """
+        This method updates the lines of each node and the nodes of each line from the mesh incidence.
         """
         self.lines_from_node.clear()
         self.nodes_from_line.clear()
-        for node_id, elements in self.project.model.preprocessor.structural_elements_connected_to_node.items():
-            for element in elements:
-
-                line_id = self.line_from_element[element.index]
-                if line_id in self.nodes_from_line.keys():
-                    if node_id not in self.nodes_from_line[line_id]:
-                        self.nodes_from_line[line_id].append(node_id)
-                else:
-                    self.nodes_from_line[line_id].append(node_id)
-
-                if node_id in self.lines_from_node.keys():
-                    if line_id not in self.lines_from_node[node_id]:
-                        self.lines_from_node[node_id].append(line_id)
-                else:
-                    self.lines_from_node[node_id].append(line_id)
+        mesh_incidence = self.project.model.preprocessor.mesh_incidence
+        for node_id, line_id in mesh_incidence.get_node_line_pairs():
+            self.nodes_from_line[line_id].append(node_id)
+            self.lines_from_node[node_id].append(line_id)
 
     def _save_geometry_points(self):
         """
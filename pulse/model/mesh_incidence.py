@@ -0,0 +1,162 @@
+
+import numpy as np
+
+
+def _get_csr_index(keys, number_keys):
+    """
+    This function returns the row pointers and the stable ordering of the entries grouped by key.
+    """
+    order = np.argsort(keys, kind="stable")
+    indptr = np.zeros(number_keys + 1, dtype=int)
+    np.cumsum(np.bincount(keys, minlength=number_keys), out=indptr[1:])
+    return indptr, order
+
+
+class MeshIncidence:
+    """ This class stores the node-element-line incidence of a mesh in compressed sparse row arrays. The nodes,
+    elements and lines are stored by position and mapped to their ids, hence each query costs a time proportional
+    to the degree of the node or to the size of the line, regardless of the model size.
+
+    The nodes are numbered by their first appearance in the element connectivity and the elements and lines keep
+    their input order. The elements of each node and the nodes of each line are stored in these orders.
+
+    Parameters
+    ----------
+    element_ids : array
+        Element ids.
+
+    first_node_ids : array
+        Ids of the first nodes of the elements.
+
+    last_node_ids : array
+        Ids of the last nodes of the elements.
+
+    element_line_ids : array, optional
+        Line id of each element. If None, the line queries are not available.
+    """
+    def __init__(self, element_ids, first_node_ids, last_node_ids, element_line_ids=None):
+
+        self.element_ids = np.asarray(element_ids, dtype=int)
+        self.element_positions = {int(element_id): position for position, element_id in enumerate(self.element_ids)}
+
+        connectivity = np.c_[np.asarray(first_node_ids, dtype=int), np.asarray(last_node_ids, dtype=int)].reshape(-1, 2)
+
+        # node ids by first appearance in the connectivity
+        unique_ids, first_entries, inverse = np.unique(connectivity.ravel(), return_index=True, return_inverse=True)
+        appearance = np.argsort(first_entries, kind="stable")
+        ranks = np.empty(len(unique_ids), dtype=int)
+        ranks[appearance] = np.arange(len(unique_ids))
+
+        self.node_ids = unique_ids[appearance]
+        self.node_positions = {int(node_id): position for position, node_id in enumerate(self.node_ids)}
+        self.element_nodes = ranks[inverse].reshape(-1, 2)
+
+        # node to element incidence
+        entries = self.element_nodes.ravel()
+        self.node_indptr, order = _get_csr_index(entries, len(self.node_ids))
+        self.node_elements = order // 2
+
+        self.element_lines = None
+        self.line_ids = None
+
+        if element_line_ids is not None:
+
+            self.line_ids, self.element_lines = np.unique(np.asarray(element_line_ids, dtype=int), return_inverse=True)
+            self.line_positions = {int(line_id): position for position, line_id in enumerate(self.line_ids)}
+
+            # line to node incidence without repetitions
+            node_lines = self.element_lines[self.node_elements]
+            nodes = np.repeat(np.arange(len(self.node_ids)), np.diff(self.node_indptr))
+            keys = nodes * len(self.line_ids) + node_lines
+            _, first = np.unique(keys, return_index=True)
+            first = np.sort(first)
+
+            self.node_line_pairs = np.c_[nodes[first], node_lines[first]]
+            self.node_line_indptr = np.zeros(len(self.node_ids) + 1, dtype=int)
+            np.cumsum(np.bincount(nodes[first], minlength=len(self.node_ids)), out=self.node_line_indptr[1:])
+
+            self.line_indptr, order = _get_csr_index(node_lines[first], len(self.line_ids))
+            self.line_nodes = nodes[first][order]
+
+    @property
+    def number_nodes(self):
+        return len(self.node_ids)
+
+    @property
+    def number_elements(self):
+        return len(self.element_ids)
+
+    def get_elements_by_node(self, node_id):
+        """
+        This method returns the ids of the elements connected to a node.
+        """
+        position = self.node_positions.get(int(node_id))
+        if position is None:
+            return list()
+        elements = self.node_elements[self.node_indptr[position] : self.node_indptr[position + 1]]
+        return [int(element_id) for element_id in self.element_ids[elements]]
+
+    def get_nodes_by_element(self, element_id):
+        """
+        This method returns the ids of the first and last nodes of an element.
+        """
+        first, last = self.element_nodes[self.element_positions[int(element_id)]]
+        return int(self.node_ids[first]), int(self.node_ids[last])
+
+    def get_neighbor_nodes(self, node_id):
+        """
+        This method returns the ids of the nodes connected to a node by an element.
+        """
+        position = self.node_positions.get(int(node_id))
+        if position is None:
+            return list()
+        elements = self.node_elements[self.node_indptr[position] : self.node_indptr[position + 1]]
+        pairs = self.element_nodes[elements]
+        neighbors = np.where(pairs[:, 0] == position, pairs[:, 1], pairs[:, 0])
+        return [int(node_id) for node_id in self.node_ids[neighbors]]
+
+    def get_elements_between_nodes(self, node_ids):
+        """
+        This method returns the ids of the elements whose first and last nodes are both in a set of nodes. The
+        elements are returned in the input order of the elements.
+        """
+        positions = [self.node_positions[int(node_id)] for node_id in node_ids if int(node_id) in self.node_positions]
+        if not positions:
+            return list()
+
+        inside = np.zeros(len(self.node_ids), dtype=bool)
+        inside[positions] = True
+
+        elements = np.concatenate([self.node_elements[self.node_indptr[p] : self.node_indptr[p + 1]] for p in positions])
+        elements = np.unique(elements)
+        elements = elements[np.all(inside[self.element_nodes[elements]], axis=1)]
+
+        return [int(element_id) for element_id in self.element_ids[elements]]
+
+    def get_lines_by_node(self, node_id):
+        """
+        This method returns the ids of the lines that contain a node.
+        """
+        position = self.node_positions.get(int(node_id))
+        if position is None:
+            return list()
+        lines = self.node_line_pairs[self.node_line_indptr[position] : self.node_line_indptr[position + 1], 1]
+        return [int(line_id) for line_id in self.line_ids[lines]]
+
+    def get_nodes_by_line(self, line_id):
+        """
+        This method returns the ids of the nodes of a line.
+        """
+        position = self.line_positions.get(int(line_id))
+        if position is None:
+            return list()
+        nodes = self.line_nodes[self.line_indptr[position] : self.line_indptr[position + 1]]
+        return [int(node_id) for node_id in self.node_ids[nodes]]
+
+    def get_node_line_pairs(self):
+        """
+        This method returns the (node id, line id) pairs of the mesh without repetitions, grouped by node.
+        """
+        node_ids = self.node_ids[self.node_line_pairs[:, 0]]
+        line_ids = self.line_ids[self.node_line_pairs[:, 1]]
+        return [(int(node_id), int(line_id)) for node_id, line_id in zip(node_ids, line_ids)]
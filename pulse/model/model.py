@@ -35,9 +35,25 @@ class Model:
         self.f_max = 200
         self.f_step = 1
         self.frequencies = None
+        self.frequency_grid = None
         self.list_frequencies = list()
 
+        self.frequency_mode = "uniform"
+        self.harmonic_band = 0.
+        self.frequency_indexes = None
+
         self.global_damping = [0., 0., 0., 0.]
+        self.linear_solver = "auto"
+        self.sweep_execution = "serial"
+        self.number_of_workers = None
+        self.acoustic_chain_condensation = False
+        self.reduced_order_sweep = False
+        self.reduced_order_tolerance = 1e-6
+        self.max_expansion_points = 30
+        self.acoustic_load_cases = dict()
+        self.acoustic_transfer_functions = False
+        self.transfer_function_sources = list()
+        self.transfer_function_receivers = list()
 
         self.gravity_vector = np.zeros(DOF_PER_NODE_STRUCTURAL, dtype=float)
 
@@ -64,23 +80,158 @@ class Model:
         if "weight_load" in analysis_setup.keys():
             self.set_static_analysis_setup(analysis_setup)
 
+        if "linear_solver" in analysis_setup.keys():
+            self.set_linear_solver_setup(analysis_setup)
+
+        if "sweep_execution" in analysis_setup.keys():
+            self.set_sweep_execution_setup(analysis_setup)
+
+        if "acoustic_chain_condensation" in analysis_setup.keys():
+            self.set_acoustic_condensation_setup(analysis_setup)
+
+        if "reduced_order_sweep" in analysis_setup.keys():
+            self.set_reduced_order_setup(analysis_setup)
+
+        if "acoustic_load_cases" in analysis_setup.keys():
+            self.set_acoustic_load_cases_setup(analysis_setup)
+
+        if "acoustic_transfer_functions" in analysis_setup.keys():
+            self.set_transfer_function_setup(analysis_setup)
+
     def set_frequency_setup(self, analysis_setup: dict):
 
         self.f_min = analysis_setup.get("f_min", None)
         self.f_max = analysis_setup.get("f_max", None)
         self.f_step = analysis_setup.get("f_step", None)
-        self.frequencies = analysis_setup.get("frequencies", None)
+        self.frequency_grid = analysis_setup.get("frequencies", None)
+
+        if "frequency_mode" in analysis_setup.keys():
+            self.frequency_mode = analysis_setup["frequency_mode"]
+            self.harmonic_band = analysis_setup.get("harmonic_band", 0.)
 
         if "frequencies" in analysis_setup.keys():
-            self.frequencies = analysis_setup["frequencies"]
+            self.frequency_grid = analysis_setup["frequencies"]
 
         elif (self.f_min, self.f_max, self.f_step).count(None) != 3:
             frequencies = np.arange(self.f_min, self.f_max + self.f_step, self.f_step)
-            self.frequencies = frequencies[frequencies <= self.f_max]
+            self.frequency_grid = frequencies[frequencies <= self.f_max]
+
+        self.update_frequency_selection()
+
+    def update_frequency_selection(self):
+        """
+        This method updates the frequencies of analysis from the frequency grid. In the harmonics frequency mode,
+        only the harmonics of the current reciprocating machine excitations are selected, hence this method must
+        be called whenever these excitations change. The frequency grid is kept unchanged.
+        """
+
+        self.frequency_indexes = None
+        self.frequencies = self.frequency_grid
+
+        if self.frequency_mode == "harmonics" and self.frequency_grid is not None:
+            self.frequency_indexes = self.get_harmonic_frequency_indexes(self.frequency_grid)
+            if self.frequency_indexes is not None:
+                self.frequencies = np.asarray(self.frequency_grid)[self.frequency_indexes]
+
+        if self.properties is not None:
+            self.properties.set_table_frequency_indexes(self.frequency_indexes)
+
+    def get_harmonic_frequency_indexes(self, frequencies: np.ndarray) -> (np.ndarray | None):
+        """
+        This method returns the indexes of the frequencies of the grid that are harmonics of the rotational speeds
+        of the reciprocating compressor and pump excitations, since their volumetric flow rates only have energy at
+        multiples of the running speed. The frequencies closer than the harmonic band to each harmonic are also
+        selected.
+
+        Parameters
+        ----------
+        frequencies : array
+            Uniform frequency grid in Hz.
+
+        Returns
+        ----------
+        array or None
+            Sorted indexes of the selected frequencies. None if there are no reciprocating machine excitations or
+            if there are element properties defined by tables.
+        """
+
+        if self.properties is None:
+            return None
+
+        for data in self.properties.element_properties.values():
+            if isinstance(data, dict) and "table_names" in data.keys():
+                print("Warning: the harmonics frequency mode is not available for element properties defined by tables.")
+                return None
+
+        rotational_speeds = list()
+        for (property, *_), data in self.properties.nodal_properties.items():
+            if property in ["reciprocating_compressor_excitation", "reciprocating_pump_excitation"]:
+                rotational_speeds.append(data["parameters"]["rotational_speed"])
+
+        if not rotational_speeds:
+            return None
+
+        frequencies = np.asarray(frequencies, dtype=float)
+        if len(frequencies) > 1:
+            tolerance = 1e-6 * np.min(np.diff(frequencies))
+        else:
+            tolerance = 1e-6
+
+        harmonics = list()
+        for fundamental in np.unique(np.array(rotational_speeds, dtype=float) / 60):
+            harmonics.append(fundamental * np.arange(1, np.floor(frequencies[-1] / fundamental) + 1))
+        harmonics = np.concatenate(harmonics)
+        harmonics = harmonics[(harmonics >= frequencies[0] - tolerance) & (harmonics <= frequencies[-1] + tolerance)]
+
+        if len(harmonics) == 0:
+            return None
+
+        # the nearest frequency of analysis of each harmonic and the frequencies inside its band
+        distances = np.abs(frequencies.reshape(-1, 1) - harmonics)
+        indexes = np.union1d(distances.argmin(axis=0), np.flatnonzero(np.any(distances <= self.harmonic_band + tolerance, axis=1)))
+
+        return indexes
 
     def set_global_damping(self, analysis_setup: dict):
         self.global_damping = analysis_setup.get("global_damping", [0., 0., 0., 0.])
 
+    def set_linear_solver_setup(self, analysis_setup: dict):
+        self.linear_solver = analysis_setup.get("linear_solver", "auto")
+
+    def set_sweep_execution_setup(self, analysis_setup: dict):
+        self.sweep_execution = analysis_setup.get("sweep_execution", "serial")
+        self.number_of_workers = analysis_setup.get("number_of_workers", None)
+
+    def set_acoustic_condensation_setup(self, analysis_setup: dict):
+        self.acoustic_chain_condensation = analysis_setup.get("acoustic_chain_condensation", False)
+
+    def set_reduced_order_setup(self, analysis_setup: dict):
+        self.reduced_order_sweep = analysis_setup.get("reduced_order_sweep", False)
+        self.reduced_order_tolerance = analysis_setup.get("reduced_order_tolerance", 1e-6)
+        self.max_expansion_points = analysis_setup.get("max_expansion_points", 30)
+
+    def set_acoustic_load_cases_setup(self, analysis_setup: dict):
+        """
+        This method sets the named volume velocity load cases of the harmonic acoustic analysis. Each load case
+        maps the node ids to the volume velocities, given as [real, imaginary] pairs, complex numbers or arrays
+        with one value per frequency of analysis. All load cases are solved with the same factorizations.
+        """
+        self.acoustic_load_cases = dict()
+        for name, load_case in analysis_setup.get("acoustic_load_cases", dict()).items():
+            volume_velocities = dict()
+            for node_id, value in load_case.items():
+                if isinstance(value, (list, tuple)) and len(value) == 2:
+                    value = complex(*value)
+                elif isinstance(value, (list, tuple)):
+                    value = np.array(value, dtype=complex)
+                volume_velocities[int(node_id)] = value
+            self.acoustic_load_cases[str(name)] = volume_velocities
+
+    def set_transfer_function_setup(self, analysis_setup: dict):
+        self.acoustic_transfer_functions = analysis_setup.get("acoustic_transfer_functions", False)
+        self.transfer_function_sources = [int(node_id) for node_id in analysis_setup.get("transfer_function_sources", list())]
+        self.transfer_function_receivers = [int(node_id) for node_id in analysis_setup.get("transfer_function_receivers", list())]
+
     def set_static_analysis_setup(self, analysis_setup: dict):
         self.static_analysis_setup = analysis_setup
         self.weight_load = analysis_setup.get("weight_load", True) 
@@ -0,0 +1,212 @@
+
+import heapq
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+
+# node numbering methods available in the mesher setup
+NODE_NUMBERINGS = ["breadth_first", "reverse_cuthill_mckee", "minimum_degree"]
+
+
+def get_adjacency_matrix(neighbors):
+    """
+    This function returns the symmetric adjacency matrix of the nodes.
+
+    Parameters
+    ----------
+    neighbors : list
+        Positions of the neighbors of each node.
+
+    Returns
+    -------
+    csr_matrix
+        Adjacency matrix without the diagonal.
+    """
+
+    number_nodes = len(neighbors)
+    counts = np.array([len(node_neighbors) for node_neighbors in neighbors], dtype=int)
+
+    rows = np.repeat(np.arange(number_nodes), counts)
+    cols = np.fromiter((neighbor for node_neighbors in neighbors for neighbor in node_neighbors), dtype=int, count=counts.sum())
+
+    # the adjacency is symmetrized in case any neighbor list is incomplete
+    rows, cols = np.r_[rows, cols], np.r_[cols, rows]
+    mask = rows != cols
+
+    adjacency = csr_matrix((np.ones(np.count_nonzero(mask), dtype=np.int8), (rows[mask], cols[mask])), shape=(number_nodes, number_nodes))
+    adjacency.sum_duplicates()
+    adjacency.data[:] = 1
+
+    return adjacency
+
+
+def breadth_first_order(neighbors):
+    """
+    This function returns the breadth first numbering of the nodes. The neighbors are queued in the order of the
+    neighbor lists and the search restarts from the first node not yet numbered. The queued nodes are kept in a
+    set, hence each node is visited once.
+
+    Parameters
+    ----------
+    neighbors : list
+        Positions of the neighbors of each node.
+
+    Returns
+    -------
+    array
+        Node positions in the numbering order.
+    """
+
+    number_nodes = len(neighbors)
+    numbered = np.zeros(number_nodes, dtype=bool)
+    queued = set()
+    order = list()
+
+    queue = list()
+    head = 0
+
+    for start in range(number_nodes):
+
+        if numbered[start]:
+            continue
+
+        queue.append(start)
+        queued.add(start)
+
+        while head < len(queue):
+
+            top = queue[head]
+            head += 1
+
+            numbered[top] = True
+            order.append(top)
+
+            for neighbor in neighbors[top]:
+                if not numbered[neighbor] and neighbor not in queued:
+                    queue.append(neighbor)
+                    queued.add(neighbor)
+
+    return np.array(order, dtype=int)
+
+
+def minimum_degree_order(neighbors):
+    """
+    This function returns a minimum degree numbering of the nodes. The node of minimum degree in the elimination
+    graph is numbered at each step and its neighbors are connected to each other. The elimination graph is stored
+    as sets of neighbors and the degrees are kept in a heap with lazy updates.
+
+    Parameters
+    ----------
+    neighbors : list
+        Positions of the neighbors of each node.
+
+    Returns
+    -------
+    array
+        Node positions in the numbering order.
+    """
+
+    graph = [set(node_neighbors) for node_neighbors in neighbors]
+    for position, node_neighbors in enumerate(graph):
+        node_neighbors.discard(position)
+
+    heap = [(len(node_neighbors), position) for position, node_neighbors in enumerate(graph)]
+    heapq.heapify(heap)
+
+    eliminated = np.zeros(len(graph), dtype=bool)
+    order = list()
+
+    while heap:
+
+        degree, position = heapq.heappop(heap)
+        if eliminated[position] or degree != len(graph[position]):
+            continue
+
+        eliminated[position] = True
+        order.append(position)
+
+        clique = graph[position]
+        for neighbor in clique:
+            graph[neighbor].discard(position)
+            graph[neighbor].update(clique)
+            graph[neighbor].discard(neighbor)
+            heapq.heappush(heap, (len(graph[neighbor]), neighbor))
+
+        graph[position] = set()
+
+    return np.array(order, dtype=int)
+
+
+def get_node_order(neighbors, method="breadth_first"):
+    """
+    This function returns the numbering of the nodes.
+
+    Parameters
+    ----------
+    neighbors : list
+        Positions of the neighbors of each node.
+
+    method : str, optional
+        Numbering method: 'breadth_first', 'reverse_cuthill_mckee' or 'minimum_degree'.
+        Default is 'breadth_first'.
+
+    Returns
+    -------
+    array
+        Node positions in the numbering order.
+    """
+
+    if method not in NODE_NUMBERINGS:
+        raise ValueError(f"Node numbering '{method}' not available. Options: {NODE_NUMBERINGS}")
+
+    if method == "reverse_cuthill_mckee":
+        adjacency = get_adjacency_matrix(neighbors)
+        return np.asarray(reverse_cuthill_mckee(adjacency, symmetric_mode=True), dtype=int)
+
+    if method == "minimum_degree":
+        return minimum_degree_order(neighbors)
+
+    return breadth_first_order(neighbors)
+
+
+def get_bandwidth_and_profile(adjacency, order):
+    """
+    This function returns the bandwidth and the profile of the adjacency matrix permuted by the node numbering.
+    The profile is the number of entries between the first entry of each row and the diagonal.
+
+    Parameters
+    ----------
+    adjacency : csr_matrix
+        Adjacency matrix of the nodes.
+
+    order : array
+        Node positions in the numbering order.
+
+    Returns
+    -------
+    bandwidth : int
+        Largest distance between an entry and the diagonal.
+
+    profile : int
+        Envelope size of the lower triangle.
+    """
+
+    number_nodes = adjacency.shape[0]
+    if number_nodes == 0:
+        return 0, 0
+
+    indexes = np.empty(number_nodes, dtype=int)
+    indexes[order] = np.arange(number_nodes)
+
+    coo = adjacency.tocoo()
+    rows = indexes[coo.row]
+    cols = indexes[coo.col]
+
+    bandwidth = int(np.max(np.abs(rows - cols), initial=0))
+
+    first_columns = np.arange(number_nodes)
+    np.minimum.at(first_columns, rows, cols)
+    profile = int(np.sum(np.arange(number_nodes) - first_columns))
+
+    return bandwidth, profile
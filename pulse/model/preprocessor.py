@@ -7,6 +7,9 @@ from pulse.model.acoustic_element import AcousticElement, NODES_PER_ELEMENT
 from pulse.model.structural_element import StructuralElement, NODES_PER_ELEMENT
 from pulse.model.reciprocating_compressor_model import ReciprocatingCompressorModel
 from pulse.model.perforated_plate import PerforatedPlate
+from pulse.model.mesh_incidence import MeshIncidence
+from pulse.model.node_numbering import get_adjacency_matrix, get_bandwidth_and_profile, get_node_order
+from pulse.processing.structural_kernels import LocalMatrixCache
 
 from pulse.interface.user_input.model.setup.structural.expansion_joint_input import get_cross_sections_to_plot_expansion_joint
 from pulse.interface.user_input.model.setup.structural.valves_input import get_V_linear_distribution
@@ -23,6 +26,7 @@ import numpy as np
 
 # from time import time
 from collections import defaultdict, deque
+from scipy.spatial import cKDTree
 from scipy.spatial.transform import Rotation
 
 window_title_1 = "Error"
@@ -35,6 +39,7 @@ class Preprocessor:
     def __init__(self, mesh: 'Mesh'):
 
         self.mesh = mesh
+        self.element_matrix_cache = LocalMatrixCache()
         self.reset_variables()
 
     def reset_variables(self):
@@ -54,6 +59,9 @@ class Preprocessor:
         self.nodal_coordinates_matrix = list()
 
         self.neighbors = defaultdict(list)
+        self.mesh_incidence = None
+        self.numbering_bandwidth = None
+        self.numbering_profile = None
         self.structural_elements_connected_to_node = defaultdict(list)
         self.acoustic_elements_connected_to_node = defaultdict(list)
 
@@ -72,11 +80,14 @@ class Preprocessor:
 
         self.structure_principal_diagonal = None
         self.nodal_coordinates_matrix_external = None
+        self.spatial_index = None
 
         self.pipe_gdofs = None
         self.unprescribed_pipe_indexes = None
         self.stop_processing = False
 
+        self.element_matrix_cache.invalidate()
+
     # def set_mesh(self, mesh: Mesh):
     #     self.mesh = mesh
 
@@ -285,6 +296,22 @@ class Preprocessor:
             self.acoustic_elements_connected_to_node[element.first_node.external_index].append(acoustic_element)
             self.acoustic_elements_connected_to_node[element.last_node.external_index].append(acoustic_element)
 
+        self._load_mesh_incidence()
+
+    def _load_mesh_incidence(self):
+        """
+        This method updates the node-element-line incidence of the mesh.
+        """
+        element_ids = list(self.structural_elements.keys())
+        first_node_ids = [element.first_node.external_index for element in self.structural_elements.values()]
+        last_node_ids = [element.last_node.external_index for element in self.structural_elements.values()]
+
+        element_line_ids = [self.mesh.line_from_element.get(element_id) for element_id in element_ids]
+        if None in element_line_ids:
+            element_line_ids = None
+
+        self.mesh_incidence = MeshIncidence(element_ids, first_node_ids, last_node_ids, element_line_ids)
+
     def update_number_divisions(self):
         """
         This method updates the number of divisions of pipe and circular beam cross-sections based on model size. This adds some
@@ -356,24 +383,21 @@ class Preprocessor:
         """
         element_size = self.mesh.element_size
         if self.nodal_coordinates_matrix_external is not None:
-            coord_matrix = self.nodal_coordinates_matrix_external
             list_node_ids = list()
-            for node, neigh_nodes in self.neighbors.items():
-                if len(neigh_nodes) == 1:
-                    coord = node.coordinates
-                    diff = np.linalg.norm(coord_matrix[:,1:] - np.array(coord), axis=1)
-                    mask = diff < ((element_size / 2) + tolerance)
-                    if True in mask:
-                        try:
-                            external_indexes = coord_matrix[:,0][mask]
-                            if len(external_indexes) > 1:
-                                for external_index in external_indexes:
-                                    if len(self.neighbors[self.nodes[external_index]]) == 1:
-                                        list_node_ids.append(int(external_index))
-                        except Exception as _log_error:
-                            title = "Error while checking mesh at the line edges"
-                            message = str(_log_error)
-                            PrintMessageInput([window_title_1, title, message])
+            end_nodes = [node for node, neigh_nodes in self.neighbors.items() if len(neigh_nodes) == 1]
+            if end_nodes:
+                try:
+                    points = [node.coordinates for node in end_nodes]
+                    node_ids = self.get_node_ids_within_radius(points, (element_size / 2) + tolerance)
+                    for external_indexes in node_ids:
+                        if len(external_indexes) > 1:
+                            for external_index in external_indexes:
+                                if len(self.neighbors[self.nodes[external_index]]) == 1:
+                                    list_node_ids.append(int(external_index))
+                except Exception as _log_error:
+                    title = "Error while checking mesh at the line edges"
+                    message = str(_log_error)
+                    PrintMessageInput([window_title_1, title, message])
 
             if len(list_node_ids)>0:
                 title = "Problem detected in connectivity between neighbor nodes"
@@ -410,74 +434,24 @@ class Preprocessor:
          
     def _order_global_indexes(self):
         """
-        This method updates the nodes global indexes numbering.
+        This method updates the nodes global indexes numbering. The numbering method is selected by the node_numbering
+        option of the mesher setup: 'breadth_first', 'reverse_cuthill_mckee' or 'minimum_degree'. The bandwidth and the
+        profile of the resulting node adjacency are stored and reported.
         """
-        # t0 = time()
-        index = 0
-        stack = deque()
-        list_nodes = list(self.nodes.values())
-        old_version = False
-
-        if old_version:
-
-            stack.appendleft(list_nodes[0])
 
-            while stack:
-
-                top = stack.pop()
-
-                if top in list_nodes:
-                    list_nodes.remove(top)
+        list_nodes = list(self.nodes.values())
+        positions = {node: position for position, node in enumerate(list_nodes)}
+        neighbors = [[positions[neighbor] for neighbor in self.neighbors[node]] for node in list_nodes]
 
-                if top.global_index is None:
-                    # list_nodes.remove(top)
-                    top.global_index = index
-                    index += 1
-                else:
-                    continue
-                
-                for neighbor in self.neighbors[top]:
-                    if neighbor.global_index is None:
-                        stack.appendleft(neighbor)
-                
-                if len(stack) == 0:
-                    if len(list_nodes) > 0:
-                        stack.appendleft(list_nodes[0])
-                        
-                        #TODO: uncomment to rebegin from start or end nodes
-                        # for node in list_nodes:
-                        #     if len(self.neighbors[node]) == 1:
-                        #         stack.appendleft(node)
-        else:
+        method = getattr(self.mesh, "node_numbering", "breadth_first")
+        order = get_node_order(neighbors, method=method)
 
-            stack.appendleft(list_nodes[0].external_index) 
+        for index, position in enumerate(order):
+            list_nodes[position].global_index = index
 
-            while stack:
-            
-                top = self.nodes[stack.pop()]
-        
-                if top.global_index is None:
-                    top.global_index = index
-                    index += 1
-                else:
-                    continue
-                
-                for neighbor in self.neighbors[top]:
-                    if neighbor.global_index is None:
-                        if neighbor.external_index not in stack:
-                            stack.appendleft(neighbor.external_index)
-                        
-                if len(stack) == 0:
-                    if index < self.number_nodes-1:
-                        for node in list_nodes:
-                            if node.global_index is None:
-                                stack.appendleft(node.external_index)
-                                break
-                        
-                        #TODO: uncomment to begin from start or end nodes
-                        # for node in list_nodes:
-                        #     if len(self.neighbors[node]) == 1:
-                        #         stack.appendleft(node)   
+        adjacency = get_adjacency_matrix(neighbors)
+        self.numbering_bandwidth, self.numbering_profile = get_bandwidth_and_profile(adjacency, order)
+        logging.info(f"Node numbering '{method}': bandwidth = {self.numbering_bandwidth}, profile = {self.numbering_profile}")
 
     def _mapping_nodes_indexes(self):
         self.map_global_to_external_index = {node.global_index:node.external_index for node in self.nodes.values()}
@@ -521,6 +495,7 @@ class Preprocessor:
 
         self.nodal_coordinates_matrix = nodal_coordinates
         self.nodal_coordinates_matrix_external = nodal_coordinates_external
+        self.spatial_index = cKDTree(nodal_coordinates_external[:, 1:])
 
     def get_connectivity_matrix(self, reordering=True):
         """
@@ -566,32 +541,89 @@ class Preprocessor:
         --------
 
             external_index: int
-                this value correspond to the 
+                this value correspond to the node placed at 'coords' or to the single node inside the
+                influence sphere. None is returned otherwise.
         
         """
+        return self.get_node_ids_by_coordinates([coords], radius=radius)[0]
 
-        coord_matrix = self.nodal_coordinates_matrix_external
-        list_coordinates = coord_matrix[:, 1:].tolist()
-        external_indexes = coord_matrix[:, 0]
+    def get_node_ids_by_coordinates(self, points, radius=None):
+        """
+        This method returns the external node ids of a batch of points through the spatial index of the nodal
+        coordinates. A node placed exactly at the point is returned, otherwise the single node inside the influence
+        sphere centered in the point is returned. If there is no node or more than one node inside the sphere, None is
+        returned.
+
+        Parameters
+        ----------
+        points : array like
+            Coordinates of the points with shape (number of points, 3).
+
+        radius : float, optional
+            Radius of the influence spheres. The default radius is equal to element_size / 20.
+
+        Returns
+        -------
+        list
+            External node ids or None for each point.
+        """
 
-        if isinstance(coords, (np.ndarray, tuple)):
-            coords = list(coords)
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if self.spatial_index is None or self.spatial_index.n == 0:
+            return [None for _ in range(len(points))]
 
         if radius is None:
             radius = self.mesh.element_size / 20
 
-        if coords in list_coordinates:
-            ind = list_coordinates.index(coords)
-            external_index = int(external_indexes[ind])
-        else:
-            diff = np.linalg.norm(coord_matrix[:,1:] - np.array(coords), axis=1)
-            mask = diff < radius
-            try:
-                external_index = int(external_indexes[mask])
-            except:
-                return None
-        
-        return external_index
+        external_indexes = self.nodal_coordinates_matrix_external[:, 0]
+        k = min(2, self.spatial_index.n)
+        distances, rows = self.spatial_index.query(points, k=k)
+        distances = distances.reshape(len(points), k)
+        rows = rows.reshape(len(points), k)
+
+        node_ids = list()
+        for point, distance, row in zip(points, distances, rows):
+
+            if distance[0] == 0:
+                if k > 1 and distance[1] == 0:
+                    # coincident nodes are resolved by the first row of the coordinates matrix
+                    row = [min(self.spatial_index.query_ball_point(point, 0))]
+                node_ids.append(int(external_indexes[row[0]]))
+
+            elif distance[0] < radius and (k == 1 or distance[1] >= radius):
+                node_ids.append(int(external_indexes[row[0]]))
+
+            else:
+                node_ids.append(None)
+
+        return node_ids
+
+    def get_node_ids_within_radius(self, points, radius):
+        """
+        This method returns the external node ids inside the spheres of a given radius centered in a batch of points.
+
+        Parameters
+        ----------
+        points : array like
+            Coordinates of the points with shape (number of points, 3).
+
+        radius : float or array like
+            Radius of the spheres.
+
+        Returns
+        -------
+        list
+            Lists of external node ids inside each sphere.
+        """
+
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if self.spatial_index is None:
+            return [list() for _ in range(len(points))]
+
+        external_indexes = self.nodal_coordinates_matrix_external[:, 0]
+        rows = self.spatial_index.query_ball_point(points, radius)
+
+        return [[int(external_indexes[row]) for row in sorted(point_rows)] for point_rows in rows]
 
     def get_element_center_coordinates_matrix(self):
         """
@@ -684,6 +716,7 @@ class Preprocessor:
         half_length = (length/2) + tolerance
         node_central = self.nodes[node_id]
         list_nodes_ids = [node_id]
+        visited = {node_id}
         stack = deque()
         stack.appendleft(node_id)
 
@@ -692,19 +725,15 @@ class Preprocessor:
             if len(nodes) <= 2:
                 for node in nodes:
                     if np.linalg.norm((node_central.coordinates - node.coordinates)) <= half_length:
-                        if node.external_index not in list_nodes_ids:
+                        if node.external_index not in visited:
+                            visited.add(node.external_index)
                             list_nodes_ids.append(node.external_index)
                             stack.appendleft(node.external_index)                    
             else:
                 return None, None
 
-        list_elements_ids = list()
-        for element in self.structural_elements.values():
-            if element.first_node.external_index in list_nodes_ids:
-                if element.last_node.external_index in list_nodes_ids:
-                    list_elements_ids.append(element.index)
-            if len(list_elements_ids) == len(list_nodes_ids) - 1:
-                break
+        list_elements_ids = self.mesh_incidence.get_elements_between_nodes(list_nodes_ids)
+        list_elements_ids = list_elements_ids[:len(list_nodes_ids) - 1]
 
         return list_nodes_ids, list_elements_ids
 
@@ -727,22 +756,22 @@ class Preprocessor:
         list_nodes_ids, list_elements_ids = self.get_neighbor_nodes_and_elements_by_node(node_id, length_t, tolerance=tolerance)
 
         if list_nodes_ids is not None:
-                
+
+            inside_nodes_ids = list()
             for external_index in list_nodes_ids:
                 node = self.nodes[external_index]
-                if np.linalg.norm((last_node.coordinates - node.coordinates)) > ((length_t/2) + tolerance):
-                    list_nodes_ids.remove(node.external_index)
+                if np.linalg.norm((last_node.coordinates - node.coordinates)) <= ((length_t/2) + tolerance):
+                    inside_nodes_ids.append(external_index)
 
+            inside_nodes = set(inside_nodes_ids)
+            inside_elements_ids = list()
             for index in list_elements_ids:
-                element = self.structural_elements[index]
-                if element.first_node.external_index not in list_nodes_ids:
-                    if element.index in list_elements_ids:
-                        list_elements_ids.remove(element.index)
-                        
-                if element.last_node.external_index not in list_nodes_ids:
-                    if element.index in list_elements_ids: 
-                        list_elements_ids.remove(element.index)
-                        
+                first_node_id, last_node_id = self.mesh_incidence.get_nodes_by_element(index)
+                if first_node_id in inside_nodes and last_node_id in inside_nodes:
+                    inside_elements_ids.append(index)
+
+            list_nodes_ids, list_elements_ids = inside_nodes_ids, inside_elements_ids
+
             return list_nodes_ids, list_elements_ids
         else:
             return None, None
@@ -867,6 +896,8 @@ class Preprocessor:
         sections_mapping = kwargs.get("sections_mapping", False)
         variable_section = kwargs.get("variable_section", False)
 
+        self.element_matrix_cache.invalidate()
+
         if cross_section is None:
             return
 
@@ -1155,6 +1186,7 @@ class Preprocessor:
         material : Material object
             Material data.
         """
+        self.element_matrix_cache.invalidate()
         for element in slicer(self.structural_elements, elements):
             element.material = material
         for element in slicer(self.acoustic_elements, elements):
@@ -1379,6 +1411,7 @@ class Preprocessor:
 
     def modify_stress_stiffening_effect(self, _bool):
         self.stress_stiffening_enabled = _bool
+        self.element_matrix_cache.invalidate()
 
     def set_stress_stiffening_by_lines(self, lines: int | list, pressures: list | tuple):
         """
@@ -2229,6 +2262,8 @@ class Preprocessor:
         for element in self.structural_elements.values():
             element.static_analysis_evaluated = True
 
+        self.element_matrix_cache.invalidate()
+
     # def get_radius(self):
     #     """
     #     This method updates and returns the ????.
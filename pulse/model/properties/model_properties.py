@@ -68,6 +68,8 @@ class ModelProperties:
         self.valves_data = dict()
         self.expansion_joint_data = dict()
 
+        self.table_frequency_indexes = None
+
         self.global_properties["material", "global"] = DEFAULT_MATERIAL
         self.global_properties["fluid", "global"] = DEFAULT_FLUID
 
@@ -123,6 +125,23 @@ class ModelProperties:
         if node_ids is None:
             return
 
+        data["values"] = self._get_table_values(property, data)
+
+        if isinstance(node_ids, int):
+            self.nodal_properties[property, node_ids] = data
+
+        elif isinstance(node_ids, list | tuple) and len(node_ids) == 1:
+            self.nodal_properties[property, node_ids[0]] = data
+
+        elif isinstance(node_ids, list | tuple) and len(node_ids) == 2:
+            self.nodal_properties[property, node_ids[0], node_ids[1]] = data
+
+    def _get_table_values(self, property: str, data: dict) -> list:
+        """
+        This method returns the values of a nodal property from its real and imaginary values or from its imported
+        tables. If a frequency selection was set, only the selected rows of the tables are returned.
+        """
+
         group_label = self.get_data_group_label(property)
 
         tables_values = list()
@@ -150,18 +169,28 @@ class ModelProperties:
                 if table_name in imported_tables.keys():
                     data_array = imported_tables[table_name]
                     values = data_array[:, 1] + 1j*data_array[:, 2]
+                    if self.table_frequency_indexes is not None:
+                        values = values[self.table_frequency_indexes]
                     tables_values.append(values)
 
-        data["values"] = tables_values
+        return tables_values
 
-        if isinstance(node_ids, int):
-            self.nodal_properties[property, node_ids] = data
+    def set_table_frequency_indexes(self, indexes: (np.ndarray | None)):
+        """
+        This method selects the rows of the imported tables related to the frequencies of analysis and updates the
+        values of the nodal properties defined by tables.
 
-        elif isinstance(node_ids, list | tuple) and len(node_ids) == 1:
-            self.nodal_properties[property, node_ids[0]] = data
+        Parameters
+        ----------
+        indexes : array or None
+            Indexes of the selected frequencies in the frequency vector of the tables. If None, all rows are used.
+        """
 
-        elif isinstance(node_ids, list | tuple) and len(node_ids) == 2:
-            self.nodal_properties[property, node_ids[0], node_ids[1]] = data
+        self.table_frequency_indexes = indexes
+
+        for (property, *_), data in self.nodal_properties.items():
+            if isinstance(data, dict) and "table_names" in data.keys():
+                data["values"] = self._get_table_values(property, data)
 
     def _set_element_property(self, property: str, data, element_ids: (int | list | tuple | None)):
         """
@@ -375,6 +404,18 @@ class ModelProperties:
             
             return line_to_points
 
+    def get_volume_velocity_excitations(self) -> dict:
+        """
+        This method returns the acoustic excitations of the model by node id. The volume velocity, reciprocating
+        compressor and reciprocating pump excitations are given as complex values or arrays with one value per
+        frequency of analysis.
+        """
+        excitations = dict()
+        for (property, *args), data in self.nodal_properties.items():
+            if property in ["volume_velocity", "reciprocating_compressor_excitation", "reciprocating_pump_excitation"]:
+                excitations[args[0]] = data["values"][0]
+        return excitations
+
     def get_nodal_related_table_names(self, property : str, node_ids : int | list) -> list:
         """
         """
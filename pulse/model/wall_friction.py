@@ -0,0 +1,159 @@
+
+import numpy as np
+from scipy.optimize import root, fsolve
+
+
+# maximum number of Newton iterations of the vectorized solvers
+MAX_NEWTON_ITERATIONS = 50
+
+# relative tolerance of the Newton steps
+NEWTON_TOLERANCE = 1e-14
+
+# turbulent friction velocities already evaluated, keyed by (flow velocity, diameter, kinematic viscosity)
+_friction_velocities = dict()
+
+# Darcy friction factors already evaluated, keyed by the Reynolds number
+_friction_factors = dict()
+
+
+def clear_wall_friction_cache():
+    """
+    This function removes all friction velocities and friction factors from the cache.
+    """
+    _friction_velocities.clear()
+    _friction_factors.clear()
+
+
+def _solve_friction_velocities(U, d, nu):
+    """
+    This function solves the log-law of the wall
+
+        U / u_t = 2.44 * ln(u_t * d / (2 * nu)) + 2
+
+    for the turbulent friction velocities u_t of arrays of positive flow velocities through a Newton iteration on
+    y = ln(u_t). The residual is decreasing and convex in y, hence the iteration converges monotonically after the
+    first step. The Blasius friction velocity is used as initial guess.
+    """
+
+    u_blasius = np.sqrt(0.03955) * (nu / d)**(1/8) * U**(7/8)
+    y = np.log(u_blasius)
+    log_scale = np.log(d / (2 * nu))
+
+    for _ in range(MAX_NEWTON_ITERATIONS):
+        ratio = U * np.exp(-y)
+        h = ratio - 2.44 * (y + log_scale) - 2
+        step = h / (ratio + 2.44)
+        y = y + step
+        if np.all(np.abs(step) <= NEWTON_TOLERANCE * np.maximum(np.abs(y), 1)):
+            break
+
+    return np.exp(y)
+
+
+def _solve_friction_factors(Re):
+    """
+    This function solves the Colebrook equation for smooth pipes
+
+        1 / sqrt(f_d) = 2 * log10(Re * sqrt(f_d)) - 0.8
+
+    for the Darcy friction factors f_d of an array of positive Reynolds numbers through a Newton iteration on
+    s = 1 / sqrt(f_d). The Haaland approximation is used as initial guess.
+    """
+
+    s = -1.8 * np.log10(6.9 / Re)
+    log_Re = 2 * np.log10(Re)
+
+    for _ in range(MAX_NEWTON_ITERATIONS):
+        h = log_Re - 2 * np.log10(s) - 0.8 - s
+        step = h / (2 / (s * np.log(10)) + 1)
+        s = s + step
+        if np.all(np.abs(step) <= NEWTON_TOLERANCE * np.abs(s)):
+            break
+
+    return 1 / s**2
+
+
+def friction_velocities(U, d, nu):
+    """
+    This function returns the turbulent friction velocities of the Howe mean flow model. The values are cached by
+    flow velocity, diameter and kinematic viscosity, and the missing values are solved at once through a vectorized
+    Newton iteration. The non-positive flow velocities are solved by scipy.optimize.root as in the element by
+    element evaluation.
+
+    Parameters
+    ----------
+    U : float or array
+        Mean flow velocities.
+
+    d : float or array
+        Inner diameters.
+
+    nu : float or array
+        Kinematic viscosities.
+
+    Returns
+    -------
+    array
+        Friction velocities.
+    """
+
+    U, d, nu = np.broadcast_arrays(*[np.asarray(value, dtype=float) for value in [U, d, nu]])
+    keys = list(zip(U.flat, d.flat, nu.flat))
+
+    missing = list(dict.fromkeys(key for key in keys if key not in _friction_velocities))
+    if missing:
+        U_m, d_m, nu_m = np.array(missing, dtype=float).T
+
+        values = np.zeros(len(missing), dtype=float)
+        positive = U_m > 0
+        if np.any(positive):
+            values[positive] = _solve_friction_velocities(U_m[positive], d_m[positive], nu_m[positive])
+
+        for i in np.flatnonzero(~positive):
+            transc = lambda x: (U_m[i]/x - (2.44 * np.log(x * d_m[i]/(2*nu_m[i])) + 2))**2
+            values[i] = root(transc, 1e-4, method='hybr').x[0]
+
+        _friction_velocities.update(zip(missing, values))
+
+    return np.array([_friction_velocities[key] for key in keys], dtype=float).reshape(U.shape)
+
+
+def friction_factors(Re):
+    """
+    This function returns the Darcy friction factors of the Colebrook equation for smooth pipes. The values are
+    cached by Reynolds number, and the missing values are solved at once through a vectorized Newton iteration.
+    The Reynolds numbers below the validity of the Haaland initial guess are solved by scipy.optimize.fsolve as
+    in the element by element evaluation.
+
+    Parameters
+    ----------
+    Re : float or array
+        Reynolds numbers.
+
+    Returns
+    -------
+    array
+        Darcy friction factors.
+    """
+
+    Re = np.asarray(Re, dtype=float)
+    keys = list(Re.flat)
+
+    missing = list(dict.fromkeys(key for key in keys if key not in _friction_factors))
+    if missing:
+        Re_m = np.array(missing, dtype=float)
+
+        values = np.zeros(len(missing), dtype=float)
+        # the Haaland initial guess is positive above this Reynolds number
+        positive = Re_m > 6.9
+        if np.any(positive):
+            values[positive] = _solve_friction_factors(Re_m[positive])
+
+        for i in np.flatnonzero(~positive):
+            colebrook_equation = lambda x: 2 * np.log10(Re_m[i] * (x**0.5)) - 0.8 - (1 / (x**0.5))
+            x_initial = 1 / ((-1.8 * np.log10(6.9 / Re_m[i]))**2)
+            values[i] = fsolve(colebrook_equation, x_initial)[0]
+
+        _friction_factors.update(zip(missing, values))
+
+    return np.array([_friction_factors[key] for key in keys], dtype=float).reshape(Re.shape)
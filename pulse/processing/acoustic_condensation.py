@@ -0,0 +1,362 @@
+
+from pulse.processing.fetm_kernels import fetm_matrices, is_batchable
+
+import numpy as np
+from collections import defaultdict
+
+
+# element types whose admittance matrices are not symmetric with respect to the element orientation
+MEAN_FLOW_TYPES = ["undamped_mean_flow", "peters"]
+
+# segment lengths are rounded to this number of decimals to share the two-ports of equal segments
+LENGTH_DECIMALS = 12
+
+# validity data copied from the chain representative to the condensed elements
+VALIDITY_ATTRIBUTES = [ "flag_plane_wave",
+                        "flag_wide_duct",
+                        "flag_lrf_fluid_eq",
+                        "max_valid_freq",
+                        "min_valid_freq" ]
+
+
+class AcousticChain:
+    """ This class stores a chain of consecutive acoustic elements with equal properties. The chain is
+    represented by its first element evaluated with the total length of the chain.
+
+    Parameters
+    ----------
+    elements : list
+        Acoustic elements ordered from the start to the end of the chain.
+
+    nodes : list
+        Nodes ordered from the start to the end of the chain.
+    """
+    def __init__(self, elements, nodes):
+
+        self.elements = elements
+        self.nodes = nodes
+
+        lengths = np.array([element.length for element in elements], dtype=float)
+
+        self.length = np.sum(lengths)
+        self.representative_length = lengths[0]
+        # distances from the start node to the interior nodes
+        self.interior_distances = np.cumsum(lengths)[:-1]
+
+        self.representative = elements[0]
+        self.start = nodes[0].global_index
+        self.end = nodes[-1].global_index
+        self.interior_indexes = np.array([node.global_index for node in nodes[1:-1]], dtype=int)
+
+        # the condensed elements are not evaluated, the lumped assembly reads their fluid area
+        for element in elements:
+            element.area_fluid = element.cross_section.area_fluid
+
+    @property
+    def reversed(self):
+        """
+        This property returns True if the first node of the representative element is the end node of the chain.
+        """
+        return self.representative.first_node is not self.nodes[0]
+
+
+class AcousticChainCondensation:
+    """ This class condenses the chains of consecutive acoustic elements with the same element type, cross
+    section, fluid and damping model into single FETM two-ports. The FETM admittance of a uniform duct is
+    exact, hence the two-port of a chain is the admittance of its first element evaluated with the total
+    length of the chain. The interior nodes of a chain can not have nodal properties, length corrections
+    or other connected elements. Their pressures are recovered from the pressures at the chain ends.
+
+    Parameters
+    ----------
+    assembly : AssemblyAcoustic object
+        Acoustic assembly of the model.
+    """
+    def __init__(self, assembly):
+
+        self.assembly = assembly
+        self.model = assembly.model
+        self.preprocessor = assembly.preprocessor
+
+        self.chains = list()
+        self.condensed_elements = set()
+        self.interior_indexes = np.array([], dtype=int)
+
+        self._process_chains()
+
+        interior = np.zeros(assembly.total_dof, dtype=bool)
+        interior[self.interior_indexes] = True
+        free_indexes = np.asarray(assembly.unprescribed_indexes, dtype=int)
+        self.kept_indexes = free_indexes[~interior[free_indexes]]
+
+    @property
+    def number_of_condensed_dofs(self):
+        return len(self.interior_indexes)
+
+    def _get_locked_nodes(self):
+        """
+        This method returns the global indexes of the nodes that must be kept in the reduced system.
+        """
+
+        locked = set(np.asarray(self.assembly.prescribed_indexes, dtype=int))
+
+        for (_, *args) in self.model.properties.nodal_properties.keys():
+            for node_id in args:
+                if node_id in self.preprocessor.nodes:
+                    locked.add(self.preprocessor.nodes[node_id].global_index)
+
+        # the nodes excited by the load cases and the sources of the transfer functions
+        node_ids = list(self.model.transfer_function_sources)
+        for load_case in self.model.acoustic_load_cases.values():
+            node_ids.extend(load_case.keys())
+
+        for node_id in node_ids:
+            if node_id in self.preprocessor.nodes:
+                locked.add(self.preprocessor.nodes[node_id].global_index)
+
+        free = np.zeros(self.assembly.total_dof, dtype=bool)
+        free[np.asarray(self.assembly.unprescribed_indexes, dtype=int)] = True
+        locked.update(np.flatnonzero(~free))
+
+        return locked
+
+    def _get_chain_key(self, element):
+        return (element.element_type,
+                id(element.cross_section),
+                id(element.fluid),
+                id(element.material),
+                element.proportional_damping,
+                element.volumetric_flow_rate)
+
+    def _process_chains(self):
+        """
+        This method detects the chains of elements through the nodes connected to exactly two condensable
+        elements with the same chain key.
+        """
+
+        elements = self.preprocessor.get_acoustic_elements()
+        length_corrections = self.assembly.get_length_corrections()
+
+        element_properties = set(element_id for (_, element_id) in self.model.properties.element_properties.keys())
+
+        def condensable(element):
+            if not is_batchable(element):
+                return False
+            if element.index in element_properties:
+                return False
+            return length_corrections[element.index] == 0
+
+        elements_by_node = defaultdict(list)
+        for element in elements:
+            elements_by_node[element.first_node.global_index].append(element)
+            elements_by_node[element.last_node.global_index].append(element)
+
+        locked = self._get_locked_nodes()
+
+        def interior(node):
+            """
+            This function returns True if the chain can continue through the node.
+            """
+            position = node.global_index
+            if position in locked:
+                return False
+
+            connected = elements_by_node[position]
+            if len(connected) != 2:
+                return False
+
+            element_a, element_b = connected
+            if not (condensable(element_a) and condensable(element_b)):
+                return False
+            if self._get_chain_key(element_a) != self._get_chain_key(element_b):
+                return False
+
+            # the mean flow elements must follow the chain orientation
+            if element_a.element_type in MEAN_FLOW_TYPES:
+                oriented = (element_a.last_node is node and element_b.first_node is node)
+                oriented |= (element_b.last_node is node and element_a.first_node is node)
+                if not oriented:
+                    return False
+
+            return True
+
+        def other_node(element, node):
+            return element.last_node if element.first_node is node else element.first_node
+
+        def other_element(element, node):
+            element_a, element_b = elements_by_node[node.global_index]
+            return element_b if element_a is element else element_a
+
+        visited = set()
+        interior_indexes = list()
+
+        for element in elements:
+
+            if element.index in visited or not condensable(element):
+                continue
+
+            # walks backwards up to the start node of the chain
+            node = element.first_node
+            current = element
+            while interior(node):
+                previous = other_element(current, node)
+                if previous is element:
+                    # closed loop of equal elements
+                    break
+                current = previous
+                node = other_node(current, node)
+
+            # walks forwards collecting the chain elements
+            chain_elements = [current]
+            chain_nodes = [node, other_node(current, node)]
+            visited.add(current.index)
+
+            while interior(chain_nodes[-1]):
+                following = other_element(chain_elements[-1], chain_nodes[-1])
+                if following.index in visited:
+                    break
+                chain_elements.append(following)
+                chain_nodes.append(other_node(following, chain_nodes[-1]))
+                visited.add(following.index)
+
+            if len(chain_elements) < 2:
+                continue
+
+            chain = AcousticChain(chain_elements, chain_nodes)
+
+            self.chains.append(chain)
+            self.condensed_elements.update(element.index for element in chain_elements)
+            interior_indexes.extend(chain.interior_indexes)
+
+        self.interior_indexes = np.array(interior_indexes, dtype=int)
+
+    def _two_port_matrices(self, chains, lengths, frequencies):
+        """
+        This method evaluates the FETM admittance matrices of the representative elements of the chains with
+        the given lengths.
+        """
+        representatives = [chain.representative for chain in chains]
+        corrections = np.asarray(lengths, dtype=float) - np.array([chain.representative_length for chain in chains])
+        return fetm_matrices(representatives, corrections, frequencies)
+
+    def get_coo_data(self, frequencies):
+        """
+        This method evaluates the COO data of the two-ports of the chains.
+
+        Parameters
+        ----------
+        frequencies : array
+            Frequencies of analysis in Hz.
+
+        Returns
+        ----------
+        rows : array
+            Global row indexes.
+
+        cols : array
+            Global column indexes.
+
+        data : array
+            COO data. Each row corresponds to a frequency of analysis.
+        """
+
+        if not self.chains:
+            return np.array([], dtype=int), np.array([], dtype=int), np.zeros((len(frequencies), 0), dtype=complex)
+
+        starts = np.array([chain.start for chain in self.chains], dtype=int)
+        ends = np.array([chain.end for chain in self.chains], dtype=int)
+
+        # the first node of the representative element is the first row of the two-port
+        reversed = np.array([chain.reversed for chain in self.chains], dtype=bool)
+        first = np.where(reversed, ends, starts)
+        last = np.where(reversed, starts, ends)
+
+        rows = np.c_[first, first, last, last].flatten()
+        cols = np.c_[first, last, first, last].flatten()
+
+        lengths = np.array([chain.length for chain in self.chains], dtype=float)
+        matrices = self._two_port_matrices(self.chains, lengths, frequencies)
+
+        data = matrices.transpose(1, 0, 2).reshape(len(frequencies), -1)
+
+        return rows, cols, data
+
+    def update_validity_data(self):
+        """
+        This method copies the validity flags and frequency limits of the chain representatives, evaluated with
+        the two-ports, to the other condensed elements. The validity data does not depend on the element length.
+        """
+        for chain in self.chains:
+            for element in chain.elements[1:]:
+                for attribute in VALIDITY_ATTRIBUTES:
+                    setattr(element, attribute, getattr(chain.representative, attribute))
+
+    def recover_pressures(self, solution, frequencies):
+        """
+        This method evaluates the pressures at the interior nodes of the chains from the pressures at the chain
+        ends. The chain is split at each interior node into two uniform ducts and the net volume velocity at the
+        interior node vanishes:
+
+            p_x = - (Y_a[1, 0] * p_start + Y_b[0, 1] * p_end) / (Y_a[1, 1] + Y_b[0, 0])
+
+        where Y_a and Y_b are the two-ports from the start node to the interior node and from the interior node
+        to the end node. The rows and columns of the two-ports are swapped if the representative element of the
+        chain points from the end node to the start node.
+
+        Parameters
+        ----------
+        solution : array
+            Pressures of all degrees of freedom. Each column corresponds to a frequency of analysis. The rows of
+            the interior nodes are overwritten.
+
+        frequencies : array
+            Frequencies of analysis in Hz.
+
+        Returns
+        ----------
+        array
+            Solution with the pressures of the interior nodes.
+        """
+
+        if not self.chains:
+            return solution
+
+        chain_positions = list()
+        distances = list()
+        interior_indexes = list()
+        for position, chain in enumerate(self.chains):
+            chain_positions.extend([position] * len(chain.interior_indexes))
+            distances.extend(chain.interior_distances)
+            interior_indexes.extend(chain.interior_indexes)
+
+        chain_positions = np.array(chain_positions, dtype=int)
+        distances = np.array(distances, dtype=float)
+        lengths = np.array([chain.length for chain in self.chains], dtype=float)[chain_positions]
+
+        # the two-ports of a uniform duct only depend on its length, so the segments before and after the
+        # interior nodes with equal lengths share the same evaluation
+        segment_positions = np.r_[chain_positions, chain_positions]
+        segment_lengths = np.r_[distances, lengths - distances]
+        keys = np.c_[segment_positions, np.round(segment_lengths, LENGTH_DECIMALS)]
+        unique_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+
+        unique_chains = [self.chains[int(position)] for position in unique_keys[:, 0]]
+        matrices = self._two_port_matrices(unique_chains, unique_keys[:, 1], frequencies)
+
+        # [Y_11, Y_12, Y_21, Y_22] in the start to end orientation
+        reversed = np.array([chain.reversed for chain in unique_chains], dtype=bool)
+        matrices[reversed] = matrices[reversed][:, :, ::-1]
+
+        Y_a = matrices[inverse[:len(distances)]]
+        Y_b = matrices[inverse[len(distances):]]
+
+        starts = np.array([chain.start for chain in self.chains], dtype=int)[chain_positions]
+        ends = np.array([chain.end for chain in self.chains], dtype=int)[chain_positions]
+
+        p_start = solution[starts, :]
+        p_end = solution[ends, :]
+
+        solution[interior_indexes, :] = - (Y_a[:, :, 2] * p_start + Y_b[:, :, 1] * p_end) / (Y_a[:, :, 3] + Y_b[:, :, 0])
+
+        return solution
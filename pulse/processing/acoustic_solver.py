@@ -1,11 +1,16 @@
 
 from pulse.model.model import Model
+from pulse.processing.acoustic_transfer_functions import AcousticTransferFunctions
 from pulse.processing.assembly_acoustic import AssemblyAcoustic
+from pulse.processing.eigen_solvers import SpectrumSlicingEigenSolver, get_real_symmetric_matrix
+from pulse.processing.low_rank_update import LowRankUpdate
+from pulse.processing.reduced_order_sweep import ReducedOrderSweep
+from pulse.processing.sweep_executor import SweepExecutor, SweepSystem
 
 import numpy as np
 from numpy.linalg import norm
-from scipy.sparse import csr_matrix, bmat, eye, block_array
-from scipy.sparse.linalg import eigs, eigsh, spsolve, inv
+from scipy.sparse import csr_matrix
+from scipy.sparse.linalg import eigs, eigsh, splu, LinearOperator
 
 import logging
 
@@ -56,6 +61,9 @@ class AcousticSolver:
         self.complex_natural_frequencies = None
 
         self.convergence_data_log = None
+        self.reduced_order_sweep = None
+        self.load_case_solutions = dict()
+        self.transfer_functions = None
 
         self.relative_error = list()
         self.deltaP_errors = list()
@@ -63,9 +71,16 @@ class AcousticSolver:
 
         self.max_iter = 100
         self.target = 10 / 100
+        # relative change of the perforated plate pressures below which a frequency leaves the active set
+        self.frequency_target = self.target / 100
+        self.active_frequencies = list()
 
         self.warning_modal_prescribed_pressures = ""
 
+        self.sweep_executor = SweepExecutor(mode = self.model.sweep_execution,
+                                            number_of_workers = self.model.number_of_workers,
+                                            linear_solver = self.model.linear_solver)
+
     def check_non_linear_perforated_plate(self):
 
         elements = list()
@@ -79,15 +94,52 @@ class AcousticSolver:
 
     def get_global_matrices(self):
         """
-        This method updates the acoustic global matrices.
+        This method updates the acoustic global matrices. The element, link, transfer and lumped matrices are 
+        assembled into a fixed sparsity pattern and stored as CSR data arrays with one row per frequency of analysis.
+        """
+        self.data_K, self.data_Kr = self.assembly.get_global_matrices_data()
+        if self.assembly.chain_condensation is not None:
+            # the condensed elements are not evaluated, they take the validity data of their chains
+            self.assembly.chain_condensation.update_validity_data()
+        self.global_pattern = self.assembly.global_pattern
+        self.prescribed_pattern = self.assembly.prescribed_pattern
+        self.volume_velocity_eq = None
+
+    def get_global_matrix(self, index):
+        """
+        This method returns the acoustic global matrix of the free degrees of freedom related to a frequency of analysis.
+
+        Parameters
+        ----------
+        index : int
+            Index of the frequency of analysis.
+
+        Returns
+        ----------
+        sparse csr_matrix
+            Admittance matrix including the link, transfer and lumped contributions.
+        """
+        return self.global_pattern.matrix(self.data_K[index])
+
+    def get_sweep_system(self, volume_velocity):
         """
-        self.K, self.Kr = self.assembly.get_global_matrices()
-        self.K_lump, self.Kr_lump = self.assembly.get_lumped_matrices()
-        self.K_link, self.Kr_link = self.assembly.get_fetm_link_matrices()
-        self.T_link, self.Tr_link = self.assembly.get_fetm_transfer_matrices()
+        This method returns the linear systems of the frequency sweep sharing the fixed sparsity pattern of the global matrices.
 
-        # self.Kadd_lump = [ self.K[i] + self.K_link[i] + self.K_lump[i] for i in range(len(self.frequencies))]
-        self.Kadd_lump = [ self.K[i] + self.K_link[i] + self.K_lump[i] + self.T_link[i] for i in range(len(self.frequencies))]
+        Parameters
+        ----------
+        volume_velocity : array
+            Combined volume velocity. Each column corresponds to a frequency of analysis.
+
+        Returns
+        ----------
+        SweepSystem object
+            Linear systems of the frequency sweep.
+        """
+        return SweepSystem( self.global_pattern.indices,
+                            self.global_pattern.indptr,
+                            self.global_pattern.shape,
+                            volume_velocity,
+                            variable_data = self.data_K )
 
     def _reinsert_prescribed_dofs(self, solution, modal_analysis = False):
         """
@@ -110,19 +162,40 @@ class AcousticSolver:
         rows = self.all_dofs
         cols = solution.shape[1]
         full_solution = np.zeros((rows, cols), dtype=complex)
-        full_solution[self.get_pipe_and_unprescribed_indexes, :] = solution
 
         if modal_analysis:
+            full_solution[self.get_pipe_and_unprescribed_indexes, :] = solution
             full_solution[self.prescribed_indexes, :] = np.zeros((len(self.prescribed_values),cols))
         else:
+            # the interior nodes of condensed chains are not part of the free degrees of freedom
+            full_solution[self.assembly.free_indexes, :] = solution
             if len(self.prescribed_indexes) != 0:
                 full_solution[self.prescribed_indexes, :] = self.array_prescribed_values
         
         return full_solution
 
-    def get_combined_volume_velocity(self):
+    def _get_full_solution(self, solution, prescribed=True):
         """
-        This method adds the effects of prescribed acoustic pressure into volume velocity global vector.
+        This method returns the solution of all degrees of freedom, including the prescribed pressures and the
+        pressures of the interior nodes of the condensed chains. The prescribed pressures are set to zero if
+        prescribed is False.
+        """
+        full_solution = self._reinsert_prescribed_dofs(solution)
+        if not prescribed:
+            full_solution[self.prescribed_indexes, :] = 0
+        if self.assembly.chain_condensation is not None:
+            full_solution = self.assembly.chain_condensation.recover_pressures(full_solution, self.frequencies)
+        return full_solution
+
+    def get_combined_volume_velocity(self, load_case=None):
+        """
+        This method adds the effects of prescribed acoustic pressure into volume velocity global vector. The
+        contribution of the prescribed pressures is evaluated once per assembly of the global matrices.
+
+        Parameters
+        ----------
+        load_case : dict, optional
+            Volume velocities of a load case by node id. If None, the excitations of the model are used.
 
         Returns
         ----------
@@ -130,15 +203,26 @@ class AcousticSolver:
             Volume velocity. Each column corresponds to a frequency of analysis.
         """
 
-        volume_velocity = self.assembly.get_global_volume_velocity()
-  
-        Kr = [(sparse_matrix.toarray())[self.get_pipe_and_unprescribed_indexes, :] for sparse_matrix in self.Kr]
-        Kr_link = [(sparse_matrix.toarray())[self.get_pipe_and_unprescribed_indexes, :] for sparse_matrix in self.Kr_link]
-        Kr_lump = [(sparse_matrix.toarray())[self.get_pipe_and_unprescribed_indexes, :] for sparse_matrix in self.Kr_lump]
-        Tr_link = [(sparse_matrix.toarray())[self.get_pipe_and_unprescribed_indexes, :] for sparse_matrix in self.Tr_link]
+        volume_velocity = self.assembly.get_global_volume_velocity(load_case)
 
-        rows = Kr[0].shape[0]  
-        cols = len(self.frequencies)
+        if self.volume_velocity_eq is None:
+            self.volume_velocity_eq = self.get_prescribed_volume_velocity()
+
+        volume_velocity_combined = volume_velocity.T - self.volume_velocity_eq
+
+        return volume_velocity_combined
+
+    def get_prescribed_volume_velocity(self):
+        """
+        This method evaluates the equivalent volume velocity of the prescribed acoustic pressures.
+
+        Returns
+        ----------
+        array
+            Equivalent volume velocity. Each column corresponds to a frequency of analysis.
+        """
+
+        rows, cols = self.prescribed_pattern.shape[0], len(self.frequencies)
  
         aux_ones = np.ones(cols, dtype=complex)
         volume_velocity_eq = np.zeros((rows,cols), dtype=complex)
@@ -154,12 +238,98 @@ class AcousticSolver:
 
             self.array_prescribed_values = np.array(prescribed_values)
             for i in range(cols):
-                # volume_velocity_eq[:, i] = np.sum((Kr[i] + Kr_link[i] + Kr_lump[i]) * self.array_prescribed_values[:,i], axis=1)
-                volume_velocity_eq[:, i] = np.sum((Kr[i] + Kr_link[i] + Kr_lump[i] + Tr_link[i]) * self.array_prescribed_values[:,i], axis=1)
+                Kr = self.prescribed_pattern.matrix(self.data_Kr[i])
+                volume_velocity_eq[:, i] = Kr @ self.array_prescribed_values[:, i]
 
-        volume_velocity_combined = volume_velocity.T - volume_velocity_eq
+        return volume_velocity_eq
 
-        return volume_velocity_combined
+    def get_damped_modal_eigenpairs(self, K, M, C, modes, which, sigma):
+        """
+        This method evaluates the eigenpairs of the damped acoustic system through the linearized generalized 
+        eigenproblem
+
+            [  0   I ] [x]         [ I  0 ] [x]
+            [ -K  -C ] [y] = lambda [ 0  M ] [y],   y = lambda x,
+
+        in shift-invert mode. The inverse of the shifted pencil is applied as a LinearOperator that factorizes 
+        just the sparse quadratic matrix K + sigma*C + sigma^2*M, therefore no inverse of the mass matrix and 
+        no dense state-space matrix are evaluated. The accuracy of the eigenvalues far from the shift decays 
+        with their distance to it, hence the eigenvalues of symmetric systems are refined by the quadratic 
+        Rayleigh quotient of their pressure vectors x:
+
+            (x^T M x) lambda^2 + (x^T C x) lambda + x^T K x = 0.
+
+        Parameters
+        ----------
+        K, M, C : sparse matrices
+            Acoustic stiffness, mass and damping matrices of the free degrees of freedom.
+
+        modes : int
+            Number of eigenpairs to be evaluated.
+
+        which : str
+            Which eigenvalues of the shift-inverted operator to find.
+
+        sigma : float
+            Shift of the eigenvalues.
+
+        Returns
+        ----------
+        eigen_values : array
+            Eigenvalues of the state-space system.
+
+        eigen_vectors : array
+            Eigenvectors of the state-space system. The first half of the rows corresponds to the acoustic pressures.
+        """
+
+        N = K.shape[0]
+        K, M, C = [csr_matrix(matrix, dtype=complex) for matrix in [K, M, C]]
+
+        lu = splu((K + sigma*C + (sigma**2)*M).tocsc())
+        C_sigma_M = C + sigma*M
+
+        def matvec(z):
+            # solves (A - sigma*B) w = B z with the block elimination of the first row
+            z = np.asarray(z, dtype=complex).ravel()
+            u = z[:N]
+            v = M @ z[N:]
+            x = lu.solve(-v - C_sigma_M @ u)
+            return np.concatenate([x, u + sigma*x])
+
+        OP = LinearOperator((2*N, 2*N), matvec=matvec, dtype=complex)
+        nu, eigen_vectors = eigs(OP, k=modes, which=which)
+
+        eigen_values = sigma + 1/nu
+
+        symmetric = all(abs(A - A.T).max() <= 1e-10*abs(A).max() for A in [K, M, C] if A.nnz)
+        if symmetric:
+            eigen_values = self.get_rayleigh_quotient_eigenvalues(K, M, C, eigen_values, eigen_vectors[:N])
+
+        return eigen_values, eigen_vectors
+
+    def get_rayleigh_quotient_eigenvalues(self, K, M, C, eigen_values, X):
+        """
+        This method returns the roots of the quadratic Rayleigh quotients of the vectors closest to the given 
+        eigenvalues. The matrices must be (complex) symmetric. The roots only correct the last digits of the 
+        eigenvalues, otherwise (e.g., at the null eigenvalues, where the roots are dominated by round-off) the 
+        eigenvalues are kept.
+        """
+
+        a = np.sum(X * (M @ X), axis=0)
+        b = np.sum(X * (C @ X), axis=0)
+        c = np.sum(X * (K @ X), axis=0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            discriminant = np.sqrt(b**2 - 4*a*c)
+            roots = np.array([(-b + discriminant) / (2*a), (-b - discriminant) / (2*a)])
+
+        closest = np.argmin(np.abs(roots - eigen_values), axis=0)
+        refined = roots[closest, np.arange(len(eigen_values))]
+
+        with np.errstate(invalid="ignore"):
+            accepted = np.abs(refined - eigen_values) <= 1e-4 * np.abs(eigen_values)
+
+        return np.where(accepted, refined, eigen_values)
 
     def modal_analysis(self, **kwargs):
         """
@@ -185,6 +355,17 @@ class AcousticSolver:
             Find eigenvalues near sigma (in (rad/s)^2) using shift-invert mode. 
             Default is 0.01.
 
+        frequency_window : tuple of floats, optional
+            Frequency band (f_min, f_max) in Hz. If defined in the undamped analysis, all modes inside the band 
+            are evaluated through spectrum slicing and the number of modes is used as the initial guess of each 
+            slice.
+            Default is None.
+
+        number_of_slices : int, optional
+            Number of spectrum slices of the frequency band. The slices are solved by the workers of the sweep 
+            execution mode.
+            Default is 1.
+
         Returns
         ----------
         natural_frequencies : array
@@ -197,6 +378,8 @@ class AcousticSolver:
         modes = kwargs.get("modes", 40)
         which = kwargs.get("which", "LM")
         sigma_factor = kwargs.get("sigma_factor", 1e-4)
+        frequency_window = kwargs.get("frequency_window", None)
+        number_of_slices = kwargs.get("number_of_slices", 1)
 
         self.warning_modal_prescribed_pressures = ""
 
@@ -209,35 +392,7 @@ class AcousticSolver:
 
         if np.sum(C[0]):
 
-            N_t = len(self.assembly.unprescribed_indexes)
-
-            ones = eye(N_t, dtype=complex, format="csr")
-            zeros = csr_matrix((N_t, N_t), dtype=complex)
-
-            ## Reference - book
-            # A = bmat([[ C[0], M_add], 
-            #         [M_add,  None]], format="csr", dtype=complex)
-
-            # B = bmat([[K_add,   None], 
-            #         [ None, -M_add]], format="csr", dtype=complex)            
-
-            ## As Ans-theory
-            # A = bmat([  [ C[0], -M_add], 
-            #             [ ones,  zeros]  ], format="csr", dtype=complex)
-
-            # B = bmat([  [K_add, zeros], 
-            #             [zeros,  ones]  ], format="csr", dtype=complex)
-
-            # from scipy.linalg import eig
-            # eigen_values, eigen_vectors = eig(B.toarray(), b=A.toarray())
-            # eigen_values, eigen_vectors = eigs(B, M=A, k=modes, which=which, sigma=sigma_factor)
-
-            inv_M = inv(M_add.tocsc()).tocsr()
-            
-            AA = bmat([ [zeros, ones],
-                        [-inv_M@K_add, -inv_M@C[0]]])
-    
-            eigen_values, eigen_vectors = eigs(AA, k=modes, which=which, sigma=sigma_factor)
+            eigen_values, eigen_vectors = self.get_damped_modal_eigenpairs(K_add, M_add, C[0], modes, which, sigma_factor)
 
             N_dofs = int(eigen_vectors.shape[0] / 2)
 
@@ -268,7 +423,17 @@ class AcousticSolver:
 
         else:
 
-            eigen_values, eigen_vectors = eigs(K_add, M=M_add, k=modes, which=which, sigma=sigma_factor)
+            K_sym = get_real_symmetric_matrix(K_add)
+            M_sym = get_real_symmetric_matrix(M_add)
+
+            if frequency_window is not None and K_sym is not None and M_sym is not None:
+                slicing_solver = SpectrumSlicingEigenSolver(mode = self.model.sweep_execution,
+                                                            number_of_workers = self.model.number_of_workers,
+                                                            number_of_slices = number_of_slices,
+                                                            modes_per_slice = modes)
+                eigen_values, eigen_vectors = slicing_solver.solve(K_sym, M_sym, *frequency_window)
+            else:
+                eigen_values, eigen_vectors = eigs(K_add, M=M_add, k=modes, which=which, sigma=sigma_factor)
 
             Wn_2 = np.absolute(np.real(eigen_values))
             natural_frequencies = np.sqrt(Wn_2) / (2 * np.pi)
@@ -318,30 +483,141 @@ class AcousticSolver:
 
         if cond_1 or cond_2:
 
+            if self.model.acoustic_transfer_functions:
+                return self.transfer_function_method()
+
+            self.assembly.set_chain_condensation(self.model.acoustic_chain_condensation)
             self.get_global_matrices()
             volume_velocity = self.get_combined_volume_velocity()
 
-            rows = self.K[0].shape[0]
-            cols = len(self.frequencies)
-            solution = np.zeros((rows, cols), dtype=complex)
+            load_cases = self.model.acoustic_load_cases
+            if load_cases:
+                # the load cases are solved as additional right-hand sides of each factorization
+                volume_velocities = [volume_velocity] + [self.get_combined_volume_velocity(load_case) for load_case in load_cases.values()]
+                volume_velocity = np.stack(volume_velocities, axis=2)
 
-            for i, freq in enumerate(self.frequencies):
+            solution = self._solve_sweep(volume_velocity)
 
-                logging.info(f"Solution step {i+1} and frequency {freq : .3f} Hz [{i+1}/{len(self.frequencies)}]")
+            if solution is None:
+                self.solution = None
+                return None, None
 
-                solution[:, i] = spsolve(self.Kadd_lump[i], volume_velocity[:, i])
+            if solution.ndim == 3:
+                self.load_case_solutions = dict()
+                for k, name in enumerate(load_cases.keys()):
+                    self.load_case_solutions[name] = self._get_full_solution(solution[:, :, k + 1])
+                solution = solution[:, :, 0]
 
-                if self.stop_processing():
-                    self.solution = None
-                    return None, None
+            self.solution = self._get_full_solution(solution)
 
-            self.solution = self._reinsert_prescribed_dofs(solution)
             return self.solution, None      
 
         else:
 
             self.direct_method_for_non_linear_perforated_plate()
 
+    def transfer_function_method(self):
+        """
+        This method evaluates the acoustic transfer functions between the source nodes and the receiver nodes. The
+        response due to a unit volume velocity at each source and the response due to the prescribed pressures are
+        solved as load cases of the same factorizations. The excited nodes of the model are always sources and
+        the solution due to the model excitations is obtained by superposition.
+
+        Returns
+        ----------
+        array
+            Solution. Each column corresponds to a frequency of analysis. Each row corresponds to a degree of freedom.
+        """
+
+        excitations = self.model.properties.get_volume_velocity_excitations()
+
+        source_node_ids = list(excitations.keys())
+        source_node_ids += [node_id for node_id in self.model.transfer_function_sources if node_id not in excitations]
+
+        receiver_node_ids = self.model.transfer_function_receivers
+        if not receiver_node_ids:
+            receiver_node_ids = list(self.model.preprocessor.nodes.keys())
+
+        self.assembly.set_chain_condensation(self.model.acoustic_chain_condensation)
+        self.get_global_matrices()
+
+        volume_velocities = [self.get_combined_volume_velocity(dict())]
+        for node_id in source_node_ids:
+            volume_velocities.append(self.assembly.get_global_volume_velocity({node_id : 1 + 0j}).T)
+
+        logging.info(f"Solving the acoustic transfer functions of {len(source_node_ids)} sources")
+        solution = self._solve_sweep(np.stack(volume_velocities, axis=2))
+
+        if solution is None:
+            self.solution = None
+            return None, None
+
+        receiver_indexes = [self.model.preprocessor.nodes[node_id].global_index for node_id in receiver_node_ids]
+
+        self.solution = self._get_full_solution(solution[:, :, 0])
+        prescribed_response = self.solution[receiver_indexes, :]
+
+        transfer_functions = np.zeros((len(receiver_indexes), len(self.frequencies), len(source_node_ids)), dtype=complex)
+        for k, node_id in enumerate(source_node_ids):
+            response = self._get_full_solution(solution[:, :, k + 1], prescribed=False)
+            transfer_functions[:, :, k] = response[receiver_indexes, :]
+            if node_id in excitations:
+                self.solution += response * excitations[node_id]
+
+        self.transfer_functions = AcousticTransferFunctions(self.frequencies,
+                                                            source_node_ids,
+                                                            receiver_node_ids,
+                                                            transfer_functions,
+                                                            prescribed_response)
+
+        return self.solution, None
+
+    def _solve_sweep(self, volume_velocity):
+        """
+        This method solves the acoustic systems of all frequencies of analysis through the sweep executor or
+        through the reduced order sweep. The load cases of a volume velocity with three axes are solved with the
+        same factorizations, except in the reduced order sweep, where a reduced model is built for each case.
+
+        Returns
+        ----------
+        array
+            Solution of the free degrees of freedom. None if the solution was interrupted.
+        """
+
+        if self.model.reduced_order_sweep:
+
+            self.reduced_order_sweep = ReducedOrderSweep(   tolerance = self.model.reduced_order_tolerance,
+                                                            max_expansion_points = self.model.max_expansion_points,
+                                                            linear_solver = self.model.linear_solver   )
+
+            # the reduced order model is built for each load case
+            solutions = list()
+            for rhs in np.atleast_3d(volume_velocity).transpose(2, 0, 1):
+                solutions.append(self.reduced_order_sweep.solve(self.get_sweep_system(rhs),
+                                                                frequencies = self.frequencies,
+                                                                stop_processing = self.stop_processing))
+                if solutions[-1] is None:
+                    break
+
+            self.reduced_order_sweep.release()
+
+            if solutions[-1] is None:
+                solution = None
+            elif volume_velocity.ndim == 3:
+                solution = np.stack(solutions, axis=2)
+            else:
+                solution = solutions[0]
+
+        else:
+
+            solution = self.sweep_executor.solve(   self.get_sweep_system(volume_velocity),
+                                                    frequencies = self.frequencies,
+                                                    stop_processing = self.stop_processing   )
+
+            self.sweep_executor.release()
+
+        return solution
+
     def direct_method_for_non_linear_perforated_plate(self):
         """
         This method evaluate the FETM acoustic solution through direct method.
@@ -360,13 +636,17 @@ class AcousticSolver:
         self.get_global_matrices()
         volume_velocity = self.get_combined_volume_velocity()
 
-        rows = self.K[0].shape[0]
+        rows = self.global_pattern.shape[0]
         cols = len(self.frequencies)
         solution = np.zeros((rows, cols), dtype=complex)
 
         indexes = list(np.arange(cols, dtype=int))[1:]
         previous_solution = np.zeros((rows, cols), dtype=complex)
 
+        # only the frequencies of the active set are solved again, the converged ones keep their last solution
+        active = np.ones(cols, dtype=bool)
+        reduced_solution = np.zeros((len(self.assembly.unprescribed_indexes), cols), dtype=complex)
+
         pressure_residues = list()
         delta_residues = list()
 
@@ -385,6 +665,14 @@ class AcousticSolver:
             _criteria = 100*self.target
             self.update_xy_plot_data()
 
+            # the base systems are factorized once and the perforated plates are updated as low-rank changes
+            low_rank_update = self.get_perforated_plate_low_rank_update(volume_velocity)
+            if low_rank_update is None:
+                self.solution = None
+                return None, None
+
+            delta = np.zeros((cols, low_rank_update.rank, low_rank_update.rank), dtype=complex)
+
             while relative_difference > self.target or not converged:
                 
                 progress = 2 * (count + 1) + 50
@@ -403,13 +691,15 @@ class AcousticSolver:
                 logging.info(log_message)
                                                                                                         
                 if self.stop_processing():
+                    self.sweep_executor.release()
                     self.solution = None
                     return None, None
 
-                for i, freq in enumerate(self.frequencies):
-                    solution[:, i] = spsolve(self.Kadd_lump[i], volume_velocity[:, i])
+                active_indexes = np.flatnonzero(active)
+                self.active_frequencies.append(len(active_indexes))
 
-                solution = self._reinsert_prescribed_dofs(solution)
+                reduced_solution[:, active_indexes] = low_rank_update.solve(delta, active_indexes)
+                solution = self._reinsert_prescribed_dofs(reduced_solution)
                 
                 delta_pressures_list = list()
                 cache_delta_residues = list()
@@ -429,7 +719,7 @@ class AcousticSolver:
                     pressure_residue_last = relative_error(solution[last_index, indexes], previous_solution[last_index, indexes])
                     cache_pressure_residues = np.r_[ cache_pressure_residues, pressure_residue_first, pressure_residue_last ] 
 
-                    index = np.argmax(np.abs(pp_delta_pressure[indexes]))
+                    index = indexes[np.argmax(np.abs(pp_delta_pressure[indexes]))]
                     max_value = np.max(np.abs(pp_delta_pressure[indexes]))
 
                     if len(delta_pressures_list) == len(self.nl_pp_elements):
@@ -451,6 +741,9 @@ class AcousticSolver:
                         else:
                             cache_delta.append(max_value)
 
+                frequency_residues = self.get_perforated_plate_frequency_residues(solution, previous_solution)
+                active &= (frequency_residues > self.frequency_target)
+
                 count += 1
                 relative_difference = np.max(cache_pressure_residues)
                 pressure_residues.append(100*relative_difference)
@@ -460,13 +753,13 @@ class AcousticSolver:
                 cache_delta_pressures = delta_pressures_list.copy()
                 previous_solution = solution.copy()
 
-                for ind, repetitions in freq_indexes.items():
+                for index, repetitions in freq_indexes.items():
                     if repetitions >= 4:
-                        if ind not in self.unstable_frequencies:
-                            _frequencies = self.frequencies[indexes]
-                            freq = _frequencies[ind]
-                            self.unstable_frequencies[ind] = freq
-                            indexes.remove(freq)
+                        if index not in self.unstable_frequencies:
+                            freq = self.frequencies[index]
+                            self.unstable_frequencies[index] = freq
+                            indexes.remove(index)
+                            active[index] = False
                             message = f"The {freq}Hz frequency step produces unstable results, therefore "
                             message += "it will be excluded from the calculation of the residue convergence criteria.\n"
                             print(message)
@@ -475,30 +768,130 @@ class AcousticSolver:
                 self.deltaP_errors = delta_residues
                 converged = self.check_convergence_criterias(pressure_residues, delta_residues)
 
+                if not converged and not active.any():
+                    print(f"The solution converged after {count} iterations: all frequency steps left the active set.\n")
+                    converged = True
+
                 if converged:
+                    self.sweep_executor.release()
                     self.xy_plot.show()
+                    self.update_xy_plot_data()
                     self.convergence_data_log = [self.iterations, pressure_residues, delta_residues, 100*self.target]
                     self.solution = previous_solution
                     return self.solution, self.convergence_data_log
 
                 else:
                     self.update_xy_plot_data()
-                    self.get_global_matrices()
+                    delta = self.get_perforated_plate_delta(low_rank_update)
                     solution = np.zeros((rows, cols), dtype=complex)
 
+    def get_perforated_plate_low_rank_update(self, volume_velocity):
+        """
+        This method solves the base systems of the non-linear perforated plate iteration. The volume velocity and
+        the unit vectors of the free degrees of freedom of the perforated plate nodes are solved as load cases of
+        the same factorizations and the admittance matrices of the perforated plates are stored as reference.
+
+        Returns
+        ----------
+        LowRankUpdate object
+            Low-rank update of the systems. None if the solution was interrupted.
+        """
+
+        free_indexes = np.asarray(self.assembly.unprescribed_indexes, dtype=int)
+        positions = np.full(self.all_dofs, -1, dtype=int)
+        positions[free_indexes] = np.arange(len(free_indexes))
+
+        global_indexes = [[element.first_node.global_index, element.last_node.global_index] for element in self.nl_pp_elements]
+        element_positions = positions[np.array(global_indexes, dtype=int)]
+
+        # the changes of the prescribed degrees of freedom do not take part in the systems
+        modified_positions = np.unique(element_positions[element_positions >= 0])
+        self.pp_local_indexes = np.where(element_positions >= 0, np.searchsorted(modified_positions, element_positions), -1)
+
+        low_rank_update = LowRankUpdate(modified_positions)
+
+        rows = len(free_indexes)
+        cols = len(self.frequencies)
+        rhs = np.concatenate([volume_velocity[:, :, None], low_rank_update.get_unit_rhs(rows, cols)], axis=2)
+
+        solution = self.sweep_executor.solve(   self.get_sweep_system(rhs),
+                                                stop_processing = self.stop_processing,
+                                                log_progress = False   )
+
+        self.sweep_executor.release()
+
+        if solution is None:
+            return None
+
+        low_rank_update.set_base_solutions(solution[:, :, 0], solution[:, :, 1:])
+        self.pp_base_matrices = self.assembly.get_element_matrices(self.nl_pp_elements)
+
+        return low_rank_update
+
+    def get_perforated_plate_frequency_residues(self, solution, previous_solution):
+        """
+        This method returns the largest relative change of the pressures and of the pressure differences of the
+        non-linear perforated plates at each frequency of analysis.
+
+        Returns
+        ----------
+        array
+            Relative changes. Each item corresponds to a frequency of analysis.
+        """
+
+        def relative_changes(values, previous_values):
+            changes = np.abs(values - previous_values)
+            scales = np.abs(values)
+            return np.max(np.divide(changes, scales, out=np.zeros_like(changes), where=(scales > 0)), axis=0)
+
+        first_indexes = [element.first_node.global_index for element in self.nl_pp_elements]
+        last_indexes = [element.last_node.global_index for element in self.nl_pp_elements]
+        indexes = first_indexes + last_indexes
+
+        delta_pressures = solution[last_indexes, :] - solution[first_indexes, :]
+        previous_delta_pressures = previous_solution[last_indexes, :] - previous_solution[first_indexes, :]
+
+        pressure_residues = relative_changes(solution[indexes, :], previous_solution[indexes, :])
+        delta_pressure_residues = relative_changes(delta_pressures, previous_delta_pressures)
+
+        return np.maximum(pressure_residues, delta_pressure_residues)
+
+    def get_perforated_plate_delta(self, low_rank_update):
+        """
+        This method reassembles the admittance matrices of the non-linear perforated plates only and returns their
+        changes with respect to the base systems in the modified degrees of freedom.
+
+        Returns
+        ----------
+        array
+            Changes of the matrices with shape (n_frequencies, rank, rank).
+        """
+
+        matrices = self.assembly.get_element_matrices(self.nl_pp_elements) - self.pp_base_matrices
+
+        rank = low_rank_update.rank
+        delta = np.zeros((len(self.frequencies), rank, rank), dtype=complex)
+
+        for (first, last), matrix in zip(self.pp_local_indexes, matrices):
+            for k, (i, j) in enumerate([(first, first), (first, last), (last, first), (last, last)]):
+                if i >= 0 and j >= 0:
+                    delta[:, i, j] += matrix[:, k]
+
+        return delta
+
     def initialize_xy_plotter(self):
 
         from pulse.interface.user_input.plots.general.xy_plot import XYPlot
 
-        legends = [f'Target: {self.target*100}%', "Pressure residues", "Delta pressure residues"]
+        legends = [f'Target: {self.target*100}%', "Pressure residues", "Delta pressure residues", "Active frequencies [%]"]
 
         plots_config = {
-                        "number_of_plots" : 3,
+                        "number_of_plots" : 4,
                         "x_label" : "Iterations [n]",
                         "y_label" : "Relative error [%]",
-                        "colors" : [(0,0,0), (0,0,1), (1,0,0)],
-                        "line_styles" : ["--", "-", "-"],
-                        "markers" : [None, "o", "o"],
+                        "colors" : [(0,0,0), (0,0,1), (1,0,0), (0,0.6,0)],
+                        "line_styles" : ["--", "-", "-", ":"],
+                        "markers" : [None, "o", "o", "s"],
                         "legends" : legends,
                         "title" : "Perforated plate convergence plot"
                         }
@@ -515,6 +908,9 @@ class AcousticSolver:
             self.xy_plot.set_plot_data(x_data, self.relative_error, 1, (xlim, ylim))
             if self.deltaP_errors:
                 self.xy_plot.set_plot_data(x_data, self.deltaP_errors, 2, (xlim, ylim))
+            if self.active_frequencies:
+                active_frequencies = 100 * np.array(self.active_frequencies) / len(self.frequencies)
+                self.xy_plot.set_plot_data(x_data, active_frequencies, 3, (xlim, ylim))
 
         else:
             criteria = 100* self.target
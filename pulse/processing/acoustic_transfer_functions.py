@@ -0,0 +1,97 @@
+
+import numpy as np
+
+
+class AcousticTransferFunctions:
+    """ This class stores the acoustic transfer functions between the source nodes and the receiver nodes of a
+    model. The transfer function H[r, f, s] is the pressure at the receiver r and frequency f due to a unit volume
+    velocity at the source s. The acoustic response is linear on the volume velocities, hence the pressures due
+    to any set of source spectra are obtained by superposition
+
+        p[r, f] = p_0[r, f] + sum_s H[r, f, s] * Q_s[f]
+
+    where p_0 is the response due to the prescribed pressures only, without solving the acoustic system again.
+
+    Parameters
+    ----------
+    frequencies : array
+        Frequencies of analysis in Hz.
+
+    source_node_ids : array
+        Node ids of the sources.
+
+    receiver_node_ids : array
+        Node ids of the receivers.
+
+    transfer_functions : array
+        Transfer functions. The axes correspond to the receivers, frequencies and sources.
+
+    prescribed_response : array
+        Pressures at the receivers due to the prescribed pressures. Each column corresponds to a frequency of
+        analysis.
+    """
+    def __init__(self, frequencies, source_node_ids, receiver_node_ids, transfer_functions, prescribed_response):
+
+        self.frequencies = np.asarray(frequencies, dtype=float)
+        self.source_node_ids = np.asarray(source_node_ids, dtype=int)
+        self.receiver_node_ids = np.asarray(receiver_node_ids, dtype=int)
+        self.transfer_functions = np.asarray(transfer_functions, dtype=complex)
+        self.prescribed_response = np.asarray(prescribed_response, dtype=complex)
+
+        self.source_positions = {int(node_id): position for position, node_id in enumerate(self.source_node_ids)}
+
+    def check_frequencies(self, frequencies) -> bool:
+        """
+        This method returns True if the frequencies of analysis match the frequencies of the transfer functions.
+        """
+        if frequencies is None:
+            return False
+        frequencies = np.asarray(frequencies, dtype=float)
+        if frequencies.shape != self.frequencies.shape:
+            return False
+        return np.allclose(frequencies, self.frequencies)
+
+    def check_sources(self, volume_velocities: dict) -> bool:
+        """
+        This method returns True if all excited nodes are sources of the transfer functions.
+        """
+        return all(int(node_id) in self.source_positions for node_id in volume_velocities.keys())
+
+    def get_response(self, volume_velocities: dict):
+        """
+        This method evaluates the pressures at the receivers due to the volume velocities of the sources by
+        superposition of the transfer functions.
+
+        Parameters
+        ----------
+        volume_velocities : dict
+            Volume velocities by source node id. The values can be complex or arrays with one value per
+            frequency of analysis.
+
+        Returns
+        ----------
+        array
+            Pressures at the receivers. Each column corresponds to a frequency of analysis.
+        """
+
+        if not self.check_sources(volume_velocities):
+            missing = [node_id for node_id in volume_velocities.keys() if int(node_id) not in self.source_positions]
+            raise ValueError(f"The nodes {missing} are not sources of the acoustic transfer functions.")
+
+        spectra = np.zeros((len(self.frequencies), len(self.source_node_ids)), dtype=complex)
+        for node_id, values in volume_velocities.items():
+            spectra[:, self.source_positions[int(node_id)]] = values
+
+        return self.prescribed_response + np.einsum("rfs,fs->rf", self.transfer_functions, spectra)
+
+    def get_data(self) -> dict:
+        """
+        This method returns the arrays of the transfer functions to be stored in the results file.
+        """
+        return {
+                "frequencies" : self.frequencies,
+                "source_node_ids" : self.source_node_ids,
+                "receiver_node_ids" : self.receiver_node_ids,
+                "transfer_functions" : self.transfer_functions,
+                "prescribed_response" : self.prescribed_response
+                }
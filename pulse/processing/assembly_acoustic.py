@@ -2,76 +2,17 @@
 from pulse.model.model import Model
 from pulse.model.node import DOF_PER_NODE_ACOUSTIC
 from pulse.model.acoustic_element import ENTRIES_PER_ELEMENT, DOF_PER_ELEMENT
+from pulse.model.wall_friction import friction_factors, friction_velocities
+from pulse.processing.acoustic_condensation import AcousticChainCondensation
+from pulse.processing.fetm_kernels import fetm_matrices, is_batchable
+from pulse.processing.length_corrections import get_element_length_corrections, length_correction_branch, length_correction_expansion
+from pulse.processing.sparse_pattern import FixedSparsityPattern
 
 import numpy as np
 from scipy.sparse import csr_matrix, csc_matrix
-from scipy.special import jn_zeros, jv
 from time import time
 
 
-def length_correction_expansion(smaller_diameter, larger_diameter):
-    """ This function returns the acoustic length correction due to expansion in the acoustic domain. This discontinuity is characterized by two elements in line with different diameters.
-
-    Parameters
-    ----------
-    smaller_diameter: float
-        Smaller diameter between the two elements diameters.
-
-    larger_diameter: float
-        Larger diameter between the two elements diameters.
-
-    Returns
-    -------
-    float
-        Length correction due to expansion.
-
-    See also
-    --------
-    length_correction_branch : Length correction due to sidebranch in the acoustic domain.
-    """
-
-    jm = jn_zeros(1, 200)
-    r_min = smaller_diameter / 2
-    xi = smaller_diameter / larger_diameter
-
-    H = (3*np.pi/2) * sum(((jv(1, jm * xi))**2) / (jm * xi * ((jm * jv(0, jm))**2)))
-    delta_L = ((8 * r_min) / (3 * np.pi)) * H
-
-    # proprosed approximation
-    # if xi <= 0.5:
-    #     delta_L = ((8 * r_min) / (3 * np.pi)) * (1 - 1.238 * xi)
-    # else:
-    #     delta_L = ((8 * r_min) / (3 * np.pi)) * (0.875 * (1 - xi) * (1.371 - xi))
-
-    return delta_L
-
-def length_correction_branch(branch_diameter, principal_diameter):
-    """ This function returns the acoustic length correction due to sidebranch in the acoustic domain. This discontinuity is characterized by three elements, two with the same diameters in line, and the other with different diameter connected to these two.
-
-    Parameters
-    ----------
-    smaller_diameter: float
-        Smaller diameter between the two elements diameters.
-
-    larger_diameter: float
-        Larger diameter between the two elements diameters.
-
-    Returns
-    -------
-    float
-        Length correction due to side branch.
-
-    See also
-    --------
-    length_correction_expansion : Length correction due to expansion in the acoustic domain.
-    """
-    xi = branch_diameter / principal_diameter
-    if xi <= 0.4:
-        factor = 0.8216 - 0.0644 * xi - 0.694 * xi**2
-    elif xi > 0.4:
-        factor = 0.9326 - 0.6196 * xi
-    return branch_diameter * factor / 2
-
 class AssemblyAcoustic:
     """ This class creates a acoustic assembly object from input data.
 
@@ -92,9 +33,38 @@ class AssemblyAcoustic:
         self.total_dof = DOF_PER_NODE_ACOUSTIC * len(self.preprocessor.nodes)
 
         self.neighbor_diameters = self.preprocessor.neighbor_elements_diameter_global()
+        self.length_corrections = None
         self.prescribed_indexes = self.get_prescribed_indexes()
         self.unprescribed_indexes = self.get_pipe_and_unprescribed_indexes()
 
+        self.chain_condensation = None
+        self.free_indexes = self.unprescribed_indexes
+
+        self.global_pattern = None
+        self.prescribed_pattern = None
+
+    def set_chain_condensation(self, enabled: bool):
+        """
+        This method enables or disables the condensation of the chains of equal acoustic elements into FETM 
+        two-ports. If enabled, the interior nodes of the chains are removed from the free degrees of freedom 
+        of the global matrices and the volume velocity.
+
+        Parameters
+        ----------
+        enabled : bool
+            True to condense the chains of elements.
+        """
+
+        if enabled:
+            self.chain_condensation = AcousticChainCondensation(self)
+            self.free_indexes = self.chain_condensation.kept_indexes
+        else:
+            self.chain_condensation = None
+            self.free_indexes = self.unprescribed_indexes
+
+        self.global_pattern = None
+        self.prescribed_pattern = None
+
     def get_prescribed_indexes(self):
         """
         This method returns all the indexes of the acoustic degrees of freedom with prescribed pressure boundary condition.
@@ -214,65 +184,153 @@ class AssemblyAcoustic:
         float
             Length correction.
         """
-        length_correction = 0
-        if element.length_correction_data is not None:
+        if element.acoustic_link_diameters:
+            return 0
+        return get_element_length_corrections([element], self.neighbor_diameters)[0]
 
-            correction_type = element.length_correction_data["correction_type"]
+    def get_length_correction_for_acoustic_link(self, diameters):
+        d_minor, d_major = diameters
+        return length_correction_expansion(d_minor, d_major)
 
-            first = element.first_node.global_index
-            last = element.last_node.global_index
+    def get_length_corrections(self):
+        """
+        This method evaluates the acoustic length corrections of all acoustic elements at once. The corrections
+        are evaluated on the first call and shared by the harmonic and modal assemblies.
 
-            di_actual = element.cross_section.inner_diameter
+        Returns
+        ----------
+        dict
+            Length corrections. Giving an acoustic element index, returns its length correction.
+        """
+        if self.length_corrections is None:
+            elements = self.preprocessor.get_acoustic_elements()
+            corrections = get_element_length_corrections(elements, self.neighbor_diameters)
+            self.length_corrections = dict(zip([element.index for element in elements], corrections))
+        return self.length_corrections
 
-            diameters_first = np.array(self.neighbor_diameters[first])
-            diameters_last = np.array(self.neighbor_diameters[last])
+    def update_wall_friction_cache(self, elements):
+        """
+        This method evaluates at once the turbulent friction velocities of the Howe elements and the Darcy friction
+        factors of the damped liquid elements with mean flow. The values are cached by the flow parameters, hence
+        the element matrices only read the cache.
 
-            corrections_first = [0]
-            corrections_last = [0]
+        Parameters
+        ----------
+        elements : list
+            Acoustic elements.
+        """
 
-            for _, _, di in diameters_first:
-                if di_actual < di:
+        howe_parameters = list()
+        reynolds_numbers = list()
 
-                    if correction_type in [0, 2]:
-                        correction = length_correction_expansion(di_actual, di)
+        for element in elements:
+            if element.perforated_plate:
+                continue
+            if element.element_type == "howe":
+                # the fluid area of the mach number is updated as in the AcousticElement.matrix method
+                element.area_fluid = element.cross_section.area_fluid
+                howe_parameters.append(element.get_friction_velocity_parameters())
+            elif element.element_type == "damped_liquid" and element.volumetric_flow_rate != 0:
+                reynolds_numbers.append(element.get_reynolds_number())
 
-                    elif correction_type == 1:
-                        correction = length_correction_branch(di_actual, di)
-                        if len(diameters_first) == 2:
-                            message = "Warning: Expansion identified in acoustic "
-                            message += "domain is being corrected as side branch."
-                            print(message)
+        if howe_parameters:
+            friction_velocities(*np.array(howe_parameters, dtype=float).T)
 
-                    else:
-                        print("Datatype not understood")
+        if reynolds_numbers:
+            friction_factors(reynolds_numbers)
 
-                    corrections_first.append(correction)
+    def get_global_coo_data(self):
+        """
+        This method evaluates the COO data of the acoustic FETM element matrices.
 
-            for _, _, di in diameters_last:
-                if di_actual < di:
+        Returns
+        ----------
+        rows : array
+            Global row indexes.
 
-                    if correction_type in [0, 2]:
-                        correction = length_correction_expansion(di_actual, di)
+        cols : array
+            Global column indexes.
 
-                    elif correction_type == 1:
-                        correction = length_correction_branch(di_actual, di)
-                        if len(diameters_last) == 2:
-                            message = "Warning: Expansion identified in acoustic "
-                            message += "domain is being corrected as side branch."
-                            print(message)
+        data_k : array
+            COO data. Each row corresponds to a frequency of analysis.
+        """
 
-                    else:
-                        print("Datatype not understood")
+        total_entries = ENTRIES_PER_ELEMENT * len(self.preprocessor.acoustic_elements)
 
-                    corrections_last.append(correction)
+        rows, cols = self.preprocessor.get_global_acoustic_indexes()
+        data_k = np.zeros([len(self.frequencies), total_entries], dtype = complex)
 
-            length_correction = max(corrections_first) + max(corrections_last)
+        batched_elements = list()
+        batched_corrections = list()
 
-        return length_correction
+        length_corrections = self.get_length_corrections()
 
-    def get_length_correction_for_acoustic_link(self, diameters):
-        d_minor, d_major = diameters
-        return length_correction_expansion(d_minor, d_major)
+        condensed_elements = set()
+        if self.chain_condensation is not None:
+            condensed_elements = self.chain_condensation.condensed_elements
+
+        self.update_wall_friction_cache(self.preprocessor.get_acoustic_elements())
+
+        for element in self.preprocessor.get_acoustic_elements():
+
+            if element.index in condensed_elements:
+                continue
+
+            length_correction = length_corrections[element.index]
+
+            if is_batchable(element):
+                batched_elements.append(element)
+                batched_corrections.append(length_correction)
+                continue
+
+            index = element.index
+            start = (index - 1) * ENTRIES_PER_ELEMENT
+            end = start + ENTRIES_PER_ELEMENT
+
+            data_k[:, start:end] = element.matrix(self.frequencies, length_correction = length_correction)
+
+        if batched_elements:
+            # the admittance matrices are evaluated by element type for all elements and frequencies at once
+            matrices = fetm_matrices(batched_elements, batched_corrections, self.frequencies)
+            starts = (np.array([element.index for element in batched_elements]) - 1) * ENTRIES_PER_ELEMENT
+            positions = starts.reshape(-1, 1) + np.arange(ENTRIES_PER_ELEMENT)
+            data_k[:, positions] = matrices.transpose(1, 0, 2)
+
+        if condensed_elements:
+            # the condensed elements are replaced by the two-ports of the chains
+            starts = (np.array(sorted(condensed_elements)) - 1) * ENTRIES_PER_ELEMENT
+            mask = np.ones(total_entries, dtype=bool)
+            mask[(starts.reshape(-1, 1) + np.arange(ENTRIES_PER_ELEMENT)).flatten()] = False
+            chain_rows, chain_cols, chain_data = self.chain_condensation.get_coo_data(self.frequencies)
+            rows = np.r_[rows[mask], chain_rows]
+            cols = np.r_[cols[mask], chain_cols]
+            data_k = np.c_[data_k[:, mask], chain_data]
+
+        return rows, cols, data_k
+
+    def get_element_matrices(self, elements):
+        """
+        This method evaluates the admittance matrices of a list of acoustic elements without assembling the global
+        matrices.
+
+        Parameters
+        ----------
+        elements : list
+            Acoustic elements.
+
+        Returns
+        ----------
+        array
+            Admittance matrices with shape (n_elements, n_frequencies, 4).
+        """
+
+        length_corrections = self.get_length_corrections()
+
+        matrices = np.zeros((len(elements), len(self.frequencies), ENTRIES_PER_ELEMENT), dtype=complex)
+        for i, element in enumerate(elements):
+            matrices[i] = element.matrix(self.frequencies, length_correction = length_corrections[element.index])
+
+        return matrices
 
     def get_global_matrices(self):
         """
@@ -288,50 +346,35 @@ class AssemblyAcoustic:
         """
 
         total_dof = DOF_PER_NODE_ACOUSTIC * len(self.preprocessor.nodes)
-        total_entries = ENTRIES_PER_ELEMENT * len(self.preprocessor.acoustic_elements)
 
-        rows, cols = self.preprocessor.get_global_acoustic_indexes()
-        data_k = np.zeros([len(self.frequencies), total_entries], dtype = complex)
-
-        for element in self.preprocessor.get_acoustic_elements():
-
-            index = element.index
-            start = (index - 1) * ENTRIES_PER_ELEMENT
-            end = start + ENTRIES_PER_ELEMENT
-
-            if element.acoustic_link_diameters:
-                length_correction = self.get_length_correction_for_acoustic_link(element.acoustic_link_diameters)
-            else:
-                length_correction = self.get_length_corretion(element)
-
-            data_k[:, start:end] = element.matrix(self.frequencies, length_correction = length_correction)
+        rows, cols, data_k = self.get_global_coo_data()
 
         full_K = [csr_matrix((data, (rows, cols)), shape=[total_dof, total_dof], dtype=complex) for data in data_k]
 
-        K = [full[self.unprescribed_indexes, :][:, self.unprescribed_indexes] for full in full_K]
+        K = [full[self.free_indexes, :][:, self.free_indexes] for full in full_K]
         Kr = [full[:, self.prescribed_indexes] for full in full_K]
 
         return K, Kr
 
-    def get_fetm_link_matrices(self):
-
+    def get_fetm_link_coo_data(self):
         """
-        This method perform the assembly process of the acoustic FETM link matrices.
+        This method evaluates the COO data of the acoustic FETM link matrices.
 
         Returns
         ----------
-        K_link : list
-            List of linked admittance matrices of the free degree of freedom. Each item of the list is a sparse csr_matrix that corresponds to one frequency of analysis.
+        rows : list
+            Global row indexes.
 
-        Kr_link : list
-            List of linked admittance matrices of the prescribed degree of freedom. Each item of the list is a sparse csr_matrix that corresponds to one frequency of analysis.
-        """
+        cols : list
+            Global column indexes.
 
-        total_dof = DOF_PER_NODE_ACOUSTIC * len(self.preprocessor.nodes)
+        data_Klink : array
+            COO data. Each row corresponds to a frequency of analysis.
+        """
 
         rows = list()
         cols = list()
-        data_Klink = list()
+        data_Klink = np.zeros((len(self.frequencies), 0), dtype=complex)
 
         for (_property, *args) in self.model.properties.nodal_properties.keys():
 
@@ -344,13 +387,29 @@ class AssemblyAcoustic:
                 element = psd_link_data["element_pipe"]
 
                 data_Ke = element.fetm_link_matrix(self.frequencies)
+                data_Klink = np.c_[data_Klink, data_Ke]
 
-                if len(data_Klink):
-                    data_Klink = np.c_[data_Klink, data_Ke]
-                else:
-                    data_Klink = data_Ke
+        return rows, cols, data_Klink
 
-        if len(data_Klink):
+    def get_fetm_link_matrices(self):
+
+        """
+        This method perform the assembly process of the acoustic FETM link matrices.
+
+        Returns
+        ----------
+        K_link : list
+            List of linked admittance matrices of the free degree of freedom. Each item of the list is a sparse csr_matrix that corresponds to one frequency of analysis.
+
+        Kr_link : list
+            List of linked admittance matrices of the prescribed degree of freedom. Each item of the list is a sparse csr_matrix that corresponds to one frequency of analysis.
+        """
+
+        total_dof = DOF_PER_NODE_ACOUSTIC * len(self.preprocessor.nodes)
+
+        rows, cols, data_Klink = self.get_fetm_link_coo_data()
+
+        if len(rows):
             full_K_link = [csr_matrix((data, (rows, cols)), shape=[total_dof, total_dof]) for data in data_Klink]
         else:
             full_K_link = [csr_matrix((total_dof, total_dof)) for _ in self.frequencies]
@@ -360,27 +419,25 @@ class AssemblyAcoustic:
 
         return K_link, Kr_link  
 
-    def get_fetm_transfer_matrices(self):
-
+    def get_fetm_transfer_coo_data(self):
         """
-        This method perform the assembly process of the acoustic FETM transfer matrices.
+        This method evaluates the COO data of the acoustic FETM transfer matrices.
 
         Returns
         ----------
-        T_link : list
-            List of linked admittance matrices of the free degree of freedom. Each item of the list is a 
-            sparse csr_matrix that corresponds to one frequency of analysis.
+        rows : list
+            Global row indexes.
 
-        Tr_link : list
-            List of linked admittance matrices of the prescribed degree of freedom. Each item of the list 
-            is a sparse csr_matrix that corresponds to one frequency of analysis.
-        """
+        cols : list
+            Global column indexes.
 
-        total_dof = DOF_PER_NODE_ACOUSTIC * len(self.preprocessor.nodes)
+        data_T : array
+            COO data. Each row corresponds to a frequency of analysis.
+        """
 
         rows = list()
         cols = list()
-        data_T = list()
+        data_T = np.zeros((len(self.frequencies), 0), dtype=complex)
 
         for (_property, *args), data in self.model.properties.nodal_properties.items():
 
@@ -389,14 +446,32 @@ class AssemblyAcoustic:
                 et_data = self.preprocessor.get_acoustic_transfer_element_data(args, data)
                 rows.extend(et_data["indexes_i"])
                 cols.extend(et_data["indexes_j"])
-                data_Te = et_data["data_Te"]
+                data_Te = np.broadcast_to(et_data["data_Te"], (len(self.frequencies), 4))
+                data_T = np.c_[data_T, data_Te]
 
-                if len(data_T):
-                    data_T = np.c_[data_T, data_Te]
-                else:
-                    data_T = data_Te
+        return rows, cols, data_T
 
-        if len(data_T):
+    def get_fetm_transfer_matrices(self):
+
+        """
+        This method perform the assembly process of the acoustic FETM transfer matrices.
+
+        Returns
+        ----------
+        T_link : list
+            List of linked admittance matrices of the free degree of freedom. Each item of the list is a 
+            sparse csr_matrix that corresponds to one frequency of analysis.
+
+        Tr_link : list
+            List of linked admittance matrices of the prescribed degree of freedom. Each item of the list 
+            is a sparse csr_matrix that corresponds to one frequency of analysis.
+        """
+
+        total_dof = DOF_PER_NODE_ACOUSTIC * len(self.preprocessor.nodes)
+
+        rows, cols, data_T = self.get_fetm_transfer_coo_data()
+
+        if len(rows):
             full_T_link = [csr_matrix((data, (rows, cols)), shape=[total_dof, total_dof]) for data in data_T]
         else:
             full_T_link = [csr_matrix((total_dof, total_dof)) for _ in self.frequencies]
@@ -406,27 +481,23 @@ class AssemblyAcoustic:
 
         return T_link, Tr_link 
 
-    def get_lumped_matrices(self):
+    def get_lumped_coo_data(self):
         """
-        This method perform the assembly process of the acoustic FETM lumped matrices.
+        This method evaluates the COO data of the acoustic FETM lumped matrices.
 
         Returns
         ----------
-        K_lump : list
-            List of lumped admittance matrices of the free degree of freedom. Each item of the list is a sparse csr_matrix that corresponds to one frequency of analysis.
+        ind_Klump : list
+            Global row and column indexes.
 
-        Kr_lump : list
-            List of lumped admittance matrices of the prescribed degree of freedom. Each item of the list is a sparse csr_matrix that corresponds to one frequency of analysis.
+        data_Klump : array
+            COO data. Each row corresponds to a frequency of analysis.
         """
 
-        total_dof = DOF_PER_NODE_ACOUSTIC * len(self.preprocessor.nodes)
-        
-        data_Klump = list()
+        data_Klump = np.zeros((len(self.frequencies), 0), dtype=complex)
         ind_Klump = list()
         area_fluid = None
 
-        elements = self.preprocessor.get_acoustic_elements()
-
         # processing external elements by node
         for (property, *args), data in self.model.properties.nodal_properties.items():
             if property in ["specific_impedance", "radiation_impedance"]:
@@ -439,9 +510,10 @@ class AssemblyAcoustic:
     
                     impedance = data["values"][0]
 
-                    for element in elements:
-                        if element.first_node.global_index == position or element.last_node.global_index == position:
-                            area_fluid = element.cross_section.area_fluid
+                    element_ids = self.preprocessor.mesh_incidence.get_elements_by_node(node_id)
+                    if element_ids:
+                        element = self.preprocessor.acoustic_elements[element_ids[-1]]
+                        area_fluid = element.cross_section.area_fluid
 
                 elif property == "radiation_impedance":
 
@@ -455,22 +527,78 @@ class AssemblyAcoustic:
 
                 ind_Klump.append(position)
                 admittance = self.get_nodal_admittance(impedance, area_fluid, self.frequencies)
-
-                if len(data_Klump):
-                    data_Klump = np.c_[data_Klump, admittance]
-                else:
-                    data_Klump = admittance
+                data_Klump = np.c_[data_Klump, admittance]
 
         if area_fluid is None:
-            full_K = [csr_matrix((total_dof, total_dof)) for _ in self.frequencies]
-        else:
+            return list(), np.zeros((len(self.frequencies), 0), dtype=complex)
+
+        return ind_Klump, data_Klump
+
+    def get_lumped_matrices(self):
+        """
+        This method perform the assembly process of the acoustic FETM lumped matrices.
+
+        Returns
+        ----------
+        K_lump : list
+            List of lumped admittance matrices of the free degree of freedom. Each item of the list is a sparse csr_matrix that corresponds to one frequency of analysis.
+
+        Kr_lump : list
+            List of lumped admittance matrices of the prescribed degree of freedom. Each item of the list is a sparse csr_matrix that corresponds to one frequency of analysis.
+        """
+
+        total_dof = DOF_PER_NODE_ACOUSTIC * len(self.preprocessor.nodes)
+
+        ind_Klump, data_Klump = self.get_lumped_coo_data()
+
+        if len(ind_Klump):
             full_K = [csr_matrix((data, (ind_Klump, ind_Klump)), shape=[total_dof, total_dof]) for data in data_Klump]
+        else:
+            full_K = [csr_matrix((total_dof, total_dof)) for _ in self.frequencies]
         
         K_lump = [full[self.unprescribed_indexes, :][:, self.unprescribed_indexes] for full in full_K]
         Kr_lump = [full[:, self.prescribed_indexes] for full in full_K]
 
         return K_lump, Kr_lump  
 
+    def get_global_matrices_data(self):
+        """
+        This method perform the assembly process of the acoustic FETM element, link, transfer and lumped matrices 
+        in a fixed sparsity pattern. The reduced CSR pattern and the scatter permutation are evaluated once per model 
+        and each frequency of analysis is written straight into a row of the data arrays.
+
+        Returns
+        ----------
+        data_K : array
+            CSR data of the admittance matrices of the free degrees of freedom. Each row corresponds to a frequency of analysis 
+            and shares the indices and indptr arrays of the global_pattern attribute.
+
+        data_Kr : array
+            CSR data of the admittance matrices of the prescribed degrees of freedom (rows of the free degrees of freedom only). 
+            Each row corresponds to a frequency of analysis and shares the indices and indptr arrays of the prescribed_pattern attribute.
+        """
+
+        total_dof = DOF_PER_NODE_ACOUSTIC * len(self.preprocessor.nodes)
+        n_freqs = len(self.frequencies)
+
+        rows, cols, data = self.get_global_coo_data()
+        link_rows, link_cols, data_Klink = self.get_fetm_link_coo_data()
+        transfer_rows, transfer_cols, data_T = self.get_fetm_transfer_coo_data()
+        ind_Klump, data_Klump = self.get_lumped_coo_data()
+
+        rows = np.concatenate([rows, link_rows, transfer_rows, ind_Klump]).astype(np.int64)
+        cols = np.concatenate([cols, link_cols, transfer_cols, ind_Klump]).astype(np.int64)
+        data = np.concatenate([data, data_Klink, data_T, np.broadcast_to(data_Klump, (n_freqs, len(ind_Klump)))], axis=1)
+
+        if self.global_pattern is None or not self.global_pattern.matches(rows, cols):
+            self.global_pattern = FixedSparsityPattern(rows, cols, self.free_indexes, self.free_indexes, total_dof)
+            self.prescribed_pattern = FixedSparsityPattern(rows, cols, self.free_indexes, self.prescribed_indexes, total_dof)
+
+        data_K = self.global_pattern.scatter(data)
+        data_Kr = self.prescribed_pattern.scatter(data)
+
+        return data_K, data_Kr
+
     def get_nodal_admittance(self, impedance: (None | complex | np.ndarray), area_fluid: float, frequencies: np.ndarray) -> np.ndarray:
 
         admittance = np.zeros(len(frequencies), dtype=complex)
@@ -526,8 +654,6 @@ class AssemblyAcoustic:
         ind_Clump = list()
         data_Clump = list()
 
-        elements = self.preprocessor.get_acoustic_elements()
-
         # processing external elements by node
         for (property, *args), data in self.model.properties.nodal_properties.items():
             if property in ["specific_impedance", "radiation_impedance"]:
@@ -540,10 +666,11 @@ class AssemblyAcoustic:
     
                     impedance = data["values"][0]
 
-                    for element in elements:
-                        if element.first_node.global_index == position or element.last_node.global_index == position:
-                            rho = element.fluid.density
-                            area_fluid = element.cross_section.area_fluid
+                    element_ids = self.preprocessor.mesh_incidence.get_elements_by_node(node_id)
+                    if element_ids:
+                        element = self.preprocessor.acoustic_elements[element_ids[-1]]
+                        rho = element.fluid.density
+                        area_fluid = element.cross_section.area_fluid
 
                 elif property == "radiation_impedance":
 
@@ -603,14 +730,13 @@ class AssemblyAcoustic:
         mat_Ke = np.zeros((number_elements, DOF_PER_ELEMENT, DOF_PER_ELEMENT), dtype=complex)
         mat_Me = np.zeros((number_elements, DOF_PER_ELEMENT, DOF_PER_ELEMENT), dtype=complex)
 
+        length_corrections = self.get_length_corrections()
+
         # for index, element in enumerate(self.preprocessor.acoustic_elements.values()):
         for element in self.preprocessor.get_acoustic_elements():
 
             index = element.index - 1
-            if element.acoustic_link_diameters:
-                length_correction = self.get_length_correction_for_acoustic_link(element.acoustic_link_diameters)
-            else:
-                length_correction = self.get_length_corretion(element)
+            length_correction = length_corrections[element.index]
             
             mat_Ke[index,:,:], mat_Me[index,:,:] = element.fem_1d_matrix(length_correction)
 
@@ -670,10 +796,17 @@ class AssemblyAcoustic:
 
         return K_link, M_link
 
-    def get_global_volume_velocity(self):
+    def get_global_volume_velocity(self, load_case=None):
         """
         This method perform the assembly process of the acoustic load, volume velocity.
 
+        Parameters
+        ----------
+        load_case : dict, optional
+            Volume velocities of a load case by node id. The values can be complex or arrays with one value per 
+            frequency of analysis. If None, the volume velocity, reciprocating compressor and reciprocating pump 
+            excitations of the model are assembled.
+
         Returns
         ----------
         volume_velocity : array
@@ -683,21 +816,21 @@ class AssemblyAcoustic:
         total_dof = DOF_PER_NODE_ACOUSTIC * len(self.preprocessor.nodes)
         volume_velocity = np.zeros([len(self.frequencies), total_dof], dtype=complex)
 
-        for (property, *args), data in self.model.properties.nodal_properties.items():
-            if property in ["volume_velocity", "reciprocating_compressor_excitation", "reciprocating_pump_excitation"]:
+        if load_case is None:
+            load_case = self.model.properties.get_volume_velocity_excitations()
 
-                node_id = args[0]
-                node = self.preprocessor.nodes[node_id]
-                position = node.global_index
-                values = data["values"][0]
+        for node_id, values in load_case.items():
+
+            node = self.preprocessor.nodes[node_id]
+            position = node.global_index
 
-                if isinstance(values, complex):
-                    aux_ones = np.ones_like(self.frequencies)
-                    volume_velocity[:, position] = values * aux_ones
+            if isinstance(values, complex | float | int):
+                aux_ones = np.ones_like(self.frequencies)
+                volume_velocity[:, position] = values * aux_ones
 
-                elif isinstance(values, np.ndarray):
-                    volume_velocity[:, position] = values
+            elif isinstance(values, np.ndarray):
+                volume_velocity[:, position] = values
 
-        volume_velocity = volume_velocity[:, self.unprescribed_indexes]
+        volume_velocity = volume_velocity[:, self.free_indexes]
 
         return volume_velocity
\ No newline at end of file
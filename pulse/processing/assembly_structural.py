@@ -3,7 +3,9 @@
 from pulse.model.node import DOF_PER_NODE_STRUCTURAL
 from pulse.model.model import Model
 from pulse.model.structural_element import ENTRIES_PER_ELEMENT, DOF_PER_ELEMENT
+from pulse.processing.structural_kernels import timoshenko_matrices, is_batchable
 
+import logging
 import numpy as np
 from scipy.sparse import csr_matrix
 from time import time
@@ -162,9 +164,15 @@ class AssemblyStructural:
         mat_Ke = np.zeros((number_elements, DOF_PER_ELEMENT, DOF_PER_ELEMENT), dtype=float)
         mat_Me = np.zeros((number_elements, DOF_PER_ELEMENT, DOF_PER_ELEMENT), dtype=float)
         
+        batched_indexes = list()
+        batched_elements = list()
+
         for index, element in enumerate(self.preprocessor.structural_elements.values()):
             if element.element_type == "expansion_joint":
                 self.expansion_joint_data[index] = element
+            elif is_batchable(element):
+                batched_indexes.append(index)
+                batched_elements.append(element)
             else:
                 mat_Ke[index,:,:], mat_Me[index,:,:] = element.matrices_gcs()
 
@@ -174,6 +182,23 @@ class AssemblyStructural:
             #     np.savetxt("elementary_matrix_Ke_1.dat", mat_Ke[index,:,:], delimiter=",", fmt="%.24e")
             #     np.savetxt("elementary_matrix_Me_1.dat", mat_Me[index,:,:], delimiter=",", fmt="%.24e")
 
+        if batched_elements:
+            # the local matrices are evaluated by element type and rotated for all elements at once
+            transformation_matrices = self.preprocessor.transformation_matrices
+            if transformation_matrices is not None and len(transformation_matrices) == number_elements:
+                transformation_matrices = transformation_matrices[batched_indexes]
+            else:
+                transformation_matrices = None
+            cache = self.preprocessor.element_matrix_cache
+            # the statistics are reported for each assembly
+            cache.reset_statistics()
+            mat_Ke[batched_indexes], mat_Me[batched_indexes] = timoshenko_matrices(   batched_elements, 
+                                                                                        transformation_matrices, 
+                                                                                        cache = cache   )
+
+            statistics = cache.report()
+            logging.info(f"Local element matrices: {statistics['hits']} cache hits and {statistics['misses']} misses (hit rate {statistics['hit_rate'] : .2f})")
+
         full_K = csr_matrix((mat_Ke.flatten(), (rows, cols)), shape=[total_dof, total_dof])
         full_M = csr_matrix((mat_Me.flatten(), (rows, cols)), shape=[total_dof, total_dof])
 
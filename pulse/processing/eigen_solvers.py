@@ -0,0 +1,394 @@
+
+import os
+import hashlib
+import logging
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from scipy.sparse import csr_matrix
+from scipy.sparse.linalg import eigsh, lobpcg, norm, splu, LinearOperator
+
+
+
+def get_real_symmetric_matrix(A, tolerance=1e-10):
+    """
+    This function returns the real part of the matrix if it is a real symmetric matrix stored with a complex
+    data type. None is returned if the matrix has non-null imaginary entries or if it is not symmetric.
+    """
+
+    A = csr_matrix(A)
+
+    if np.iscomplexobj(A.data):
+        if np.any(A.data.imag):
+            return None
+        A = A.real.tocsr()
+
+    scale = np.max(np.abs(A.data)) if A.nnz else 0
+    if A.nnz and abs(A - A.T).max() > tolerance*scale:
+        return None
+
+    return A
+
+
+def get_matrix_checksum(A):
+    """
+    This function returns a checksum of the shape, sparsity pattern and data of a sparse matrix.
+    """
+
+    A = csr_matrix(A)
+
+    checksum = hashlib.sha1(str((A.shape, A.dtype.str)).encode())
+    for array in [A.indptr, A.indices, A.data]:
+        checksum.update(np.ascontiguousarray(array).view(np.uint8))
+
+    return checksum.hexdigest()
+
+
+class SymmetricEigenSolver:
+    """ This class evaluates the eigenpairs of the undamped generalized eigenproblem K x = lambda M x, where K and
+    M are real symmetric matrices. The shift-invert factorization of K - sigma*M is kept and reused by subsequent
+    calls with matrices of the same pattern and data and the same shift, e.g., when more modes are requested or when
+    a frequency window is expanded. The matrices are identified by checksums, hence they are not kept alive by the
+    solver. The release method frees the factorization.
+
+    Parameters
+    ----------
+    method : str, ['eigsh' | 'lobpcg'], optional
+        Eigen solver:
+            'eigsh' : ARPACK Lanczos solver in shift-invert mode.
+            'lobpcg' : LOBPCG solver preconditioned by the factorization of K - sigma*M. It evaluates the
+                       lowest modes with a smaller memory footprint on very large models.
+        Default is 'eigsh'.
+
+    tolerance : float, optional
+        Convergence tolerance of the LOBPCG solver relative to the 1-norm of the stiffness matrix.
+        Default is 1e-8.
+
+    max_iterations : int, optional
+        Maximum number of iterations of the LOBPCG solver.
+        Default is 500.
+    """
+    def __init__(self, **kwargs):
+
+        self.method = kwargs.get("method", "eigsh")
+        self.tolerance = kwargs.get("tolerance", 1e-8)
+        self.max_iterations = kwargs.get("max_iterations", 500)
+
+        if self.method not in ["eigsh", "lobpcg"]:
+            raise ValueError(f"Invalid symmetric eigen solver '{self.method}'. Use 'eigsh' or 'lobpcg'.")
+
+        self.key = None
+        self.operator = None
+
+        self.factorization_count = 0
+
+    def get_shift_invert_operator(self, K, M, sigma):
+        """
+        This method returns the inverse of K - sigma*M as a LinearOperator. The factorization is reused while
+        the checksums of the matrices and the shift are kept.
+        """
+
+        key = (get_matrix_checksum(K), get_matrix_checksum(M), float(sigma))
+
+        if self.operator is None or key != self.key:
+
+            self.release()
+            lu = splu((K - sigma*M).tocsc())
+            self.operator = LinearOperator(K.shape, matvec=lu.solve, matmat=lu.solve, dtype=K.dtype)
+
+            self.key = key
+            self.factorization_count += 1
+
+        return self.operator
+
+    def release(self):
+        """
+        This method frees the shift-invert factorization.
+        """
+        self.key = None
+        self.operator = None
+
+    def solve(self, K, M, modes, sigma):
+        """
+        This method evaluates the eigenpairs closest to the shift (eigsh) or the lowest eigenpairs (lobpcg).
+
+        Parameters
+        ----------
+        K, M : sparse matrices
+            Real symmetric stiffness and mass matrices.
+
+        modes : int
+            Number of eigenpairs.
+
+        sigma : float
+            Shift in (rad/s)^2.
+
+        Returns
+        ----------
+        eigen_values : array
+            Eigenvalues in ascending order.
+
+        eigen_vectors : array
+            Mass normalized eigenvectors.
+        """
+
+        modes = min(modes, K.shape[0] - 1)
+        operator = self.get_shift_invert_operator(K, M, sigma)
+
+        if self.method == "lobpcg":
+            X = np.random.default_rng(0).standard_normal((K.shape[0], modes))
+            tolerance = self.tolerance * norm(K, 1)
+            eigen_values, eigen_vectors = lobpcg(   K, X, B=M, M=operator, largest=False,
+                                                    tol=tolerance, maxiter=self.max_iterations   )
+        else:
+            eigen_values, eigen_vectors = eigsh(K, k=modes, M=M, sigma=sigma, which="LM", OPinv=operator)
+
+        index_order = np.argsort(eigen_values)
+
+        return eigen_values[index_order], eigen_vectors[:, index_order]
+
+    def solve_in_window(self, K, M, f_min, f_max, **kwargs):
+        """
+        This method evaluates all eigenpairs whose natural frequencies lie between f_min and f_max. The shift
+        is placed at the center of the window in (rad/s)^2 and the number of requested eigenpairs is doubled
+        until the eigenvalues found around the shift cover the whole window.
+
+        Parameters
+        ----------
+        K, M : sparse matrices
+            Real symmetric stiffness and mass matrices.
+
+        f_min, f_max : float
+            Frequency window in Hz.
+
+        modes : int, optional
+            Initial number of requested eigenpairs.
+            Default is 20.
+
+        Returns
+        ----------
+        eigen_values : array
+            Eigenvalues inside the window in ascending order.
+
+        eigen_vectors : array
+            Mass normalized eigenvectors.
+        """
+
+        modes = kwargs.get("modes", 20)
+
+        if f_min > f_max:
+            f_min, f_max = f_max, f_min
+
+        lambda_min = (2*np.pi*f_min)**2
+        lambda_max = (2*np.pi*f_max)**2
+        sigma = (lambda_min + lambda_max) / 2
+        radius = (lambda_max - lambda_min) / 2
+
+        max_modes = K.shape[0] - 1
+        operator = self.get_shift_invert_operator(K, M, sigma)
+
+        while True:
+            modes = min(modes, max_modes)
+            eigen_values, eigen_vectors = eigsh(K, k=modes, M=M, sigma=sigma, which="LM", OPinv=operator)
+            if np.max(np.abs(eigen_values - sigma)) > radius or modes == max_modes:
+                break
+            modes *= 2
+
+        # the rigid body modes can have small negative eigenvalues
+        if f_min <= 0:
+            lambda_min = -np.inf
+
+        mask = (eigen_values >= lambda_min) & (eigen_values <= lambda_max)
+        eigen_values = eigen_values[mask]
+        eigen_vectors = eigen_vectors[:, mask]
+
+        index_order = np.argsort(eigen_values)
+
+        return eigen_values[index_order], eigen_vectors[:, index_order]
+
+
+
+class SpectrumSlicingEigenSolver:
+    """ This class evaluates all eigenpairs of the undamped generalized eigenproblem K x = lambda M x inside a wide
+    frequency band. The band is split into slightly overlapping frequency slices and the shift-invert problem of
+    each slice is solved by a separate worker with its own factorization, so the memory of each worker is bounded
+    by the factorization and the eigenvectors of one slice. The modes found in the overlaps are deduplicated and
+    the eigenpairs of all slices are merged in ascending order.
+
+    Parameters
+    ----------
+    mode : str, ['serial' | 'thread' | 'process'], optional
+        Execution mode of the slices.
+        Default is 'serial'.
+
+    number_of_workers : int, optional
+        Number of threads or processes of the pool. If None, the number of CPUs is used.
+        Default is None.
+
+    number_of_slices : int, optional
+        Number of frequency slices. If None, one slice per worker is used.
+        Default is None.
+
+    overlap : float, optional
+        Overlap between neighbor slices relative to the slice width.
+        Default is 0.01.
+
+    modes_per_slice : int, optional
+        Initial number of requested eigenpairs in each slice.
+        Default is 20.
+    """
+    def __init__(self, **kwargs):
+
+        self.mode = kwargs.get("mode", "serial")
+        self.number_of_workers = kwargs.get("number_of_workers", None)
+        self.number_of_slices = kwargs.get("number_of_slices", None)
+        self.overlap = kwargs.get("overlap", 0.01)
+        self.modes_per_slice = kwargs.get("modes_per_slice", 20)
+
+        if self.mode not in ["serial", "thread", "process"]:
+            raise ValueError(f"Invalid execution mode '{self.mode}'. Use 'serial', 'thread' or 'process'.")
+
+        if self.number_of_workers is None:
+            self.number_of_workers = os.cpu_count() or 1
+
+        if self.number_of_slices is None:
+            self.number_of_slices = self.number_of_workers
+
+    def get_slices(self, f_min, f_max):
+        """
+        This method splits the frequency band into overlapping slices of equal width.
+        """
+
+        bounds = np.linspace(f_min, f_max, self.number_of_slices + 1)
+        delta = self.overlap * (bounds[1] - bounds[0])
+
+        slices = list()
+        for f_lower, f_upper in zip(bounds[:-1], bounds[1:]):
+            slices.append((max(f_lower - delta, f_min), min(f_upper + delta, f_max)))
+
+        return slices
+
+    def solve(self, K, M, f_min, f_max):
+        """
+        This method evaluates all eigenpairs whose natural frequencies lie between f_min and f_max.
+
+        Parameters
+        ----------
+        K, M : sparse matrices
+            Real symmetric stiffness and mass matrices.
+
+        f_min, f_max : float
+            Frequency band in Hz.
+
+        Returns
+        ----------
+        eigen_values : array
+            Eigenvalues inside the band in ascending order.
+
+        eigen_vectors : array
+            Mass normalized eigenvectors.
+        """
+
+        if f_min > f_max:
+            f_min, f_max = f_max, f_min
+
+        slices = self.get_slices(f_min, f_max)
+        n_slices = len(slices)
+        results = [None] * n_slices
+
+        if self.mode == "serial" or self.number_of_workers == 1 or n_slices == 1:
+            for i, (f_lower, f_upper) in enumerate(slices):
+                logging.info(f"Solving the spectrum slice from {f_lower : .2f} Hz to {f_upper : .2f} Hz [{i+1}/{n_slices}]")
+                results[i] = _solve_spectrum_slice(K, M, f_lower, f_upper, self.modes_per_slice)
+
+        else:
+
+            workers = min(self.number_of_workers, n_slices)
+            if self.mode == "thread":
+                pool = ThreadPoolExecutor(max_workers=workers)
+            else:
+                # the spawned slices rely on multiprocessing.freeze_support in pulse/launch.py in the frozen builds
+                pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+
+            with pool:
+                futures = { pool.submit(_solve_spectrum_slice, K, M, f_lower, f_upper, self.modes_per_slice) : i 
+                            for i, (f_lower, f_upper) in enumerate(slices) }
+
+                for count, future in enumerate(as_completed(futures)):
+                    i = futures[future]
+                    results[i] = future.result()
+                    f_lower, f_upper = slices[i]
+                    logging.info(f"Solving the spectrum slice from {f_lower : .2f} Hz to {f_upper : .2f} Hz [{count+1}/{n_slices}]")
+
+        eigen_values = [eigen_values for eigen_values, _ in results]
+        eigen_vectors = [eigen_vectors for _, eigen_vectors in results]
+
+        return merge_eigenpairs(eigen_values, eigen_vectors, M)
+
+
+def merge_eigenpairs(eigen_values, eigen_vectors, M, tolerance=1e-6):
+    """
+    This function merges the eigenpairs of several spectrum slices in ascending order. An eigenpair is regarded as
+    a duplicate if its eigenvalue is within the relative tolerance of an already accepted eigenvalue and its
+    eigenvector is mostly contained in the M-span of the accepted eigenvectors of that eigenvalue. Therefore, the
+    repeated eigenvalues of symmetric structures are preserved and their eigenvectors are M-orthogonalized.
+
+    Parameters
+    ----------
+    eigen_values : list of arrays
+        Eigenvalues of each slice.
+
+    eigen_vectors : list of arrays
+        Mass normalized eigenvectors of each slice.
+
+    M : sparse matrix
+        Mass matrix.
+
+    tolerance : float, optional
+        Relative tolerance of the eigenvalues.
+        Default is 1e-6.
+
+    Returns
+    ----------
+    eigen_values : array
+        Merged eigenvalues in ascending order.
+
+    eigen_vectors : array
+        Merged eigenvectors.
+    """
+
+    all_values = np.concatenate(eigen_values)
+    all_vectors = np.concatenate(eigen_vectors, axis=1)
+
+    index_order = np.argsort(all_values)
+    all_values = all_values[index_order]
+    all_vectors = all_vectors[:, index_order]
+
+    scale = max(np.max(np.abs(all_values)), 1) if len(all_values) else 1
+    accepted = list()
+
+    for i, value in enumerate(all_values):
+
+        vector = all_vectors[:, i]
+        cluster = [j for j in accepted if abs(all_values[j] - value) <= tolerance * max(abs(value), tolerance * scale)]
+
+        if cluster:
+            V = all_vectors[:, cluster]
+            MV = M @ V
+            # the accepted eigenvectors of different slices are not necessarily M-orthogonal
+            coefficients = np.linalg.lstsq(V.T @ MV, MV.T @ vector, rcond=None)[0]
+            residual = vector - V @ coefficients
+            residual_norm = np.sqrt(abs(residual @ (M @ residual)))
+            if residual_norm < 0.5:
+                continue
+            # keeps the eigenvectors of repeated eigenvalues M-orthonormal
+            all_vectors[:, i] = residual / residual_norm
+
+        accepted.append(i)
+
+    return all_values[accepted], all_vectors[:, accepted]
+
+
+def _solve_spectrum_slice(K, M, f_min, f_max, modes):
+    return SymmetricEigenSolver().solve_in_window(K, M, f_min, f_max, modes=modes)
@@ -0,0 +1,325 @@
+# fmt: off
+
+from pulse.model.acoustic_element import j2_j0
+
+import numpy as np
+
+
+# element types whose admittance matrices are evaluated by the batched kernels
+FETM_KERNEL_TYPES = [
+                        "undamped",
+                        "proportional",
+                        "wide_duct",
+                        "LRF_fluid_equivalent",
+                        "damped_liquid",
+                        "undamped_mean_flow",
+                        "peters"
+                    ]
+
+# first cut-on of the higher order modes: kappa * radius > 1.84118
+CUT_ON_FACTOR = 1.84118
+
+
+def is_batchable(element):
+    """
+    This function returns True if the admittance matrix of the element can be evaluated by the batched kernels.
+    The perforated plates, the 'LRF full' and 'howe' models and the damped liquid with mean flow are
+    evaluated element by element.
+    """
+    if element.perforated_plate:
+        return False
+    if element.element_type not in FETM_KERNEL_TYPES:
+        return False
+    if element.element_type == "damped_liquid" and element.volumetric_flow_rate != 0:
+        return False
+    return True
+
+
+class ElementGroup:
+    """ This class gathers the geometric, section and fluid properties of a group of acoustic elements of the
+    same element type into arrays. Each array has shape (n_elements, 1) to broadcast against the frequencies.
+
+    Parameters
+    ----------
+    elements : list
+        Acoustic elements of the group.
+
+    length_corrections : array
+        Length corrections of the elements.
+    """
+    def __init__(self, elements, length_corrections):
+
+        self.elements = elements
+
+        def gather(function):
+            return np.array([function(element) for element in elements], dtype=float).reshape(-1, 1)
+
+        first_nodes = np.array([element.first_node.coordinates for element in elements], dtype=float).reshape(-1, 3)
+        last_nodes = np.array([element.last_node.coordinates for element in elements], dtype=float).reshape(-1, 3)
+        lengths = np.linalg.norm(last_nodes - first_nodes, axis=1).reshape(-1, 1)
+
+        self.length = lengths + np.reshape(length_corrections, (-1, 1))
+        self.area_fluid = gather(lambda element: element.cross_section.area_fluid)
+        self.speed_of_sound = gather(lambda element: element.speed_of_sound_corrected())
+        self.density = gather(lambda element: element.fluid.density)
+        self.inner_radius = gather(lambda element: element.cross_section.inner_radius)
+        self.inner_diameter = gather(lambda element: element.cross_section.inner_diameter)
+
+        self.gather = gather
+
+    def fluid_property(self, name):
+        return self.gather(lambda element: getattr(element.fluid, name))
+
+    def mach(self):
+        return self.gather(lambda element: element.volumetric_flow_rate) / (self.speed_of_sound * self.area_fluid)
+
+
+def fetm_matrices(elements, length_corrections, frequencies):
+    """
+    This function evaluates the FETM admittance matrices of a list of acoustic elements for all frequencies of
+    analysis. The elements are grouped by element type and the wavenumbers, impedances and trigonometric
+    functions of each group are evaluated for all elements and frequencies at once. The validity flags of the
+    elements (plane wave, wide-duct and LRF limits) are updated as in the AcousticElement.matrix method.
+
+    Parameters
+    ----------
+    elements : list
+        Acoustic elements. All elements must be batchable.
+
+    length_corrections : array
+        Length corrections of the elements.
+
+    frequencies : array
+        Frequencies of analysis in Hz.
+
+    Returns
+    ----------
+    array
+        Admittance matrices with shape (n_elements, n_frequencies, 4).
+    """
+
+    frequencies = np.asarray(frequencies, dtype=float)
+    length_corrections = np.asarray(length_corrections, dtype=float)
+
+    data = np.zeros((len(elements), len(frequencies), 4), dtype=complex)
+
+    element_types = np.array([element.element_type for element in elements])
+
+    for element_type in np.unique(element_types):
+
+        indexes = np.flatnonzero(element_types == element_type)
+        group = ElementGroup([elements[i] for i in indexes], length_corrections[indexes])
+
+        for element, area_fluid in zip(group.elements, group.area_fluid.ravel()):
+            element.area_fluid = area_fluid
+            element.reset()
+
+        if element_type in ["undamped_mean_flow", "peters"]:
+            data[indexes] = _mean_flow_matrices(group, element_type, frequencies)
+        else:
+            data[indexes] = _fetm_matrices(group, element_type, frequencies)
+
+    return data
+
+
+def _fetm_matrices(group, element_type, frequencies):
+
+    if element_type == "proportional":
+        kappa, impedance = _proportional(group, frequencies)
+    elif element_type == "wide_duct":
+        kappa, impedance = _wide_duct(group, frequencies)
+    elif element_type == "LRF_fluid_equivalent":
+        kappa, impedance = _lrf_fluid_equivalent(group, frequencies)
+    elif element_type == "damped_liquid":
+        # the damped liquid model without mean flow reduces to the undamped model
+        kappa, impedance = _wave_number(group, frequencies), group.speed_of_sound * group.density
+    else:
+        kappa, impedance = _undamped(group, frequencies)
+
+    kappaLe = kappa * group.length
+    sine = np.sin(kappaLe)
+    cossine = np.cos(kappaLe)
+    Zf = impedance / group.area_fluid
+
+    admittance = 1j / (Zf * sine)
+
+    matrices = np.empty(kappaLe.shape + (4,), dtype=complex)
+    matrices[:, :, 0] = -cossine * admittance
+    matrices[:, :, 1] = admittance
+    matrices[:, :, 2] = admittance
+    matrices[:, :, 3] = -cossine * admittance
+
+    return matrices
+
+
+def _mean_flow_matrices(group, element_type, frequencies):
+
+    if element_type == "peters":
+        k, z, M = _peters(group, frequencies)
+    else:
+        k, z, M = _undamped_mean_flow(group, frequencies)
+
+    kLe = k * group.length
+    cotanh = 1 / np.tanh(1j*kLe)
+    sineh = np.sinh(1j*kLe)
+    adm = group.area_fluid / (z * (1 - M**2))
+
+    matrices = np.empty(kLe.shape + (4,), dtype=complex)
+    matrices[:, :, 0] = adm * (cotanh - M)
+    matrices[:, :, 1] = adm * (-np.exp(-1j*kLe*M) / sineh)
+    matrices[:, :, 2] = adm * (-np.exp(1j*kLe*M) / sineh)
+    matrices[:, :, 3] = adm * (cotanh + M)
+
+    return matrices
+
+
+def _wave_number(group, frequencies):
+    omega = 2 * np.pi * frequencies
+    return omega / group.speed_of_sound
+
+
+def _update_validity_flags(group, frequencies, flag, mask, limit="max_valid_freq"):
+    """
+    This function sets the validity flag of the elements with at least one invalid frequency and updates their
+    maximum (minimum) valid frequency with the lowest (highest) invalid frequency.
+    """
+    rows = np.flatnonzero(np.any(mask, axis=1))
+    if len(rows) == 0:
+        return
+
+    if limit == "max_valid_freq":
+        values = np.min(np.where(mask[rows], frequencies, np.inf), axis=1)
+    else:
+        values = np.max(np.where(mask[rows], frequencies, -np.inf), axis=1)
+
+    for row, value in zip(rows, values):
+        element = group.elements[row]
+        setattr(element, flag, True)
+        if limit == "max_valid_freq":
+            element.max_valid_freq = min(element.max_valid_freq, value)
+        else:
+            element.min_valid_freq = value
+
+
+def _undamped(group, frequencies):
+
+    kappa_real = _wave_number(group, frequencies)
+    Z_0 = group.speed_of_sound * group.density
+
+    mask = np.real(kappa_real * group.inner_radius) > CUT_ON_FACTOR
+    _update_validity_flags(group, frequencies, "flag_plane_wave", mask)
+
+    return kappa_real, Z_0
+
+
+def _proportional(group, frequencies):
+
+    kappa_real, Z_0 = _undamped(group, frequencies)
+    hysteresis = 1 - 1j*group.gather(lambda element: element.proportional_damping)
+
+    return kappa_real * hysteresis, Z_0 * hysteresis
+
+
+def _wide_duct(group, frequencies):
+
+    omega = 2 * np.pi * frequencies
+    kappa_real = _wave_number(group, frequencies)
+    radius = group.inner_radius
+    c_0 = group.speed_of_sound
+    Z_0 = c_0 * group.density
+
+    nu = group.fluid_property("kinematic_viscosity")
+    pr = group.fluid_property("prandtl")
+    gamma = group.fluid_property("isentropic_exponent")
+    k0 = group.fluid_property("thermal_conductivity")
+
+    mask_min = (radius < 10*np.sqrt(2*nu/omega)) | (radius < 10*np.sqrt(2*k0/omega))
+    mask_max = np.sqrt(2*omega*nu) / c_0 > 1/10
+
+    _update_validity_flags(group, frequencies, "flag_wide_duct", mask_min, limit="min_valid_freq")
+    _update_validity_flags(group, frequencies, "flag_wide_duct", mask_max)
+
+    mask = np.real(kappa_real * radius) > CUT_ON_FACTOR
+    _update_validity_flags(group, frequencies, "flag_plane_wave", mask)
+
+    const = 1 - 1j*np.sqrt(nu/(2*omega)) * ((1 + (gamma - 1)/np.sqrt(pr))/radius)
+
+    return kappa_real * const, Z_0 * const
+
+
+def _lrf_fluid_equivalent(group, frequencies):
+
+    kappa_real = _wave_number(group, frequencies)
+    radius = group.inner_radius
+    Z_0 = group.speed_of_sound * group.density
+
+    nu = group.fluid_property("kinematic_viscosity")
+    gamma = group.fluid_property("isentropic_exponent")
+    alpha = group.fluid_property("thermal_diffusivity")
+
+    aux = np.sqrt(2 * np.pi * frequencies)
+    kappa_v = aux * np.sqrt(-1j / nu)
+    kappa_t = aux * np.sqrt(-1j / alpha)
+
+    mask = (np.abs(kappa_t / kappa_real) < 10) | (np.abs(kappa_v / kappa_real) < 10)
+    _update_validity_flags(group, frequencies, "flag_lrf_fluid_eq", mask)
+
+    y_v = - j2_j0(kappa_v * radius)
+    y_t =   j2_j0(kappa_t * radius) * (gamma - 1) + gamma
+
+    kappa_complex = kappa_real * np.sqrt(y_t / y_v)
+    impedance_complex = Z_0 / np.sqrt(y_t * y_v)
+
+    mask = np.real(kappa_complex * radius) > CUT_ON_FACTOR
+    _update_validity_flags(group, frequencies, "flag_plane_wave", mask)
+
+    return kappa_complex, impedance_complex
+
+
+def _undamped_mean_flow(group, frequencies):
+
+    kappa_real = _wave_number(group, frequencies)
+    Z_0 = group.speed_of_sound * group.density
+    mach = group.mach()
+
+    mask = np.real(kappa_real * (1 - mach**2) * group.inner_radius) > CUT_ON_FACTOR
+    _update_validity_flags(group, frequencies, "flag_plane_wave", mask)
+
+    return kappa_real, Z_0, mach
+
+
+def _peters(group, frequencies):
+
+    omega = 2 * np.pi * frequencies
+    kappa_real = _wave_number(group, frequencies)
+    c_0 = group.speed_of_sound
+    di = group.inner_diameter
+
+    nu = group.fluid_property("kinematic_viscosity")
+    gamma = group.fluid_property("isentropic_exponent")
+    pr = group.fluid_property("prandtl")
+    mach = group.mach()
+
+    U = mach * c_0
+    ur = np.sqrt(0.03955) * (nu/di)**(1/8) * U**(7/8)
+
+    delta_vs = 12.5
+    delta_a = np.sqrt(2*nu/omega)
+    delta_ap = delta_a*ur/nu
+
+    aux1 = delta_a/di
+    aux2 = (1 + np.exp(-2*(1+1j)*(delta_vs / delta_ap) -200j/delta_ap**2 ))/(1 - np.exp(-2*(1+1j)*(delta_vs / delta_ap)))
+    aux3 = (1 + (gamma - 1)/np.sqrt(pr))
+
+    kappa_m = kappa_real/(1-mach) * ( -1 - (1-1j)*aux1*aux2*aux3)
+    kappa_M = kappa_real/(1+mach) * ( +1 + (1-1j)*aux1*aux2*aux3)
+
+    kappa = (kappa_M - kappa_m)/2
+    c = omega/kappa
+    z = group.density * c
+    mach_ef = U / c
+
+    mask = np.real(kappa * (1 - mach_ef**2) * group.inner_radius) > CUT_ON_FACTOR
+    _update_validity_flags(group, frequencies, "flag_plane_wave", mask)
+
+    return kappa, z, mach_ef
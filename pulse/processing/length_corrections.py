@@ -0,0 +1,223 @@
+
+import numpy as np
+from scipy.special import jn_zeros, jv
+
+
+# number of terms of the Bessel series of the expansion length correction
+NUMBER_OF_BESSEL_TERMS = 200
+
+# diameter ratios are rounded to this number of decimals to build the cache keys
+RATIO_DECIMALS = 12
+
+# roots of the Bessel function of first kind and first order, evaluated on the first use
+_bessel_roots = None
+
+# expansion factors already evaluated, keyed by the diameter ratio
+_expansion_factors = dict()
+
+
+def get_bessel_roots():
+    """
+    This function returns the roots of the Bessel function of first kind and first order used in the series of
+    the expansion length correction. The roots are evaluated once.
+    """
+    global _bessel_roots
+    if _bessel_roots is None:
+        _bessel_roots = jn_zeros(1, NUMBER_OF_BESSEL_TERMS)
+    return _bessel_roots
+
+
+def expansion_factors(ratios):
+    """
+    This function returns the Bessel series factors H of the expansion length correction for an array of
+    diameter ratios. The factors are cached by diameter ratio and the series of the missing ratios are
+    evaluated at once.
+
+    Parameters
+    ----------
+    ratios : array
+        Ratios between the smaller and the larger diameters.
+
+    Returns
+    -------
+    array
+        Expansion factors.
+    """
+
+    ratios = np.round(np.asarray(ratios, dtype=float), RATIO_DECIMALS)
+    unique_ratios, positions = np.unique(ratios, return_inverse=True)
+
+    missing = [xi for xi in unique_ratios if xi not in _expansion_factors]
+    if missing:
+        jm = get_bessel_roots()
+        xi = np.array(missing).reshape(-1, 1)
+        factors = (3*np.pi/2) * np.sum(((jv(1, jm * xi))**2) / (jm * xi * ((jm * jv(0, jm))**2)), axis=1)
+        _expansion_factors.update(zip(missing, factors))
+
+    factors = np.array([_expansion_factors[xi] for xi in unique_ratios], dtype=float)
+    return factors[positions].reshape(ratios.shape)
+
+
+def length_correction_expansion(smaller_diameter, larger_diameter):
+    """ This function returns the acoustic length correction due to expansion in the acoustic domain. This discontinuity is characterized by two elements in line with different diameters.
+
+    Parameters
+    ----------
+    smaller_diameter: float or array
+        Smaller diameter between the two elements diameters.
+
+    larger_diameter: float or array
+        Larger diameter between the two elements diameters.
+
+    Returns
+    -------
+    float or array
+        Length correction due to expansion.
+
+    See also
+    --------
+    length_correction_branch : Length correction due to sidebranch in the acoustic domain.
+    """
+
+    r_min = np.divide(smaller_diameter, 2)
+    xi = np.divide(smaller_diameter, larger_diameter)
+
+    H = expansion_factors(xi)
+    delta_L = ((8 * r_min) / (3 * np.pi)) * H
+
+    # proprosed approximation
+    # if xi <= 0.5:
+    #     delta_L = ((8 * r_min) / (3 * np.pi)) * (1 - 1.238 * xi)
+    # else:
+    #     delta_L = ((8 * r_min) / (3 * np.pi)) * (0.875 * (1 - xi) * (1.371 - xi))
+
+    if np.ndim(delta_L) == 0:
+        return float(delta_L)
+    return delta_L
+
+
+def length_correction_branch(branch_diameter, principal_diameter):
+    """ This function returns the acoustic length correction due to sidebranch in the acoustic domain. This discontinuity is characterized by three elements, two with the same diameters in line, and the other with different diameter connected to these two.
+
+    Parameters
+    ----------
+    branch_diameter: float or array
+        Diameter of the side branch.
+
+    principal_diameter: float or array
+        Diameter of the principal pipe.
+
+    Returns
+    -------
+    float or array
+        Length correction due to side branch.
+
+    See also
+    --------
+    length_correction_expansion : Length correction due to expansion in the acoustic domain.
+    """
+    xi = np.divide(branch_diameter, principal_diameter)
+    factor = np.where(xi <= 0.4, 0.8216 - 0.0644 * xi - 0.694 * xi**2, 0.9326 - 0.6196 * xi)
+    delta_L = np.multiply(branch_diameter, factor) / 2
+
+    if np.ndim(delta_L) == 0:
+        return float(delta_L)
+    return delta_L
+
+
+def get_element_length_corrections(elements, neighbor_diameters):
+    """
+    This function evaluates the acoustic length corrections of a list of acoustic elements in a single pass.
+    For each end of an element with length correction data, the neighbor elements with larger inner diameter
+    are gathered from the node to diameters map and the largest correction is taken. The corrections of both
+    ends are summed. The acoustic links are corrected as expansions between the link diameters.
+
+    Parameters
+    ----------
+    elements : list
+        Acoustic elements.
+
+    neighbor_diameters : dict
+        Diameters of the elements connected to each node, as returned by the
+        Preprocessor.neighbor_elements_diameter_global method.
+
+    Returns
+    -------
+    array
+        Length corrections of the elements in the order of the list.
+    """
+
+    corrections = np.zeros(len(elements), dtype=float)
+
+    link_positions = list()
+    link_diameters = list()
+
+    positions = list()
+    sides = list()
+    actual_diameters = list()
+    diameters = list()
+    correction_types = list()
+    neighbor_counts = list()
+
+    for position, element in enumerate(elements):
+
+        if element.acoustic_link_diameters:
+            link_positions.append(position)
+            link_diameters.append(element.acoustic_link_diameters)
+            continue
+
+        if element.length_correction_data is None:
+            continue
+
+        correction_type = element.length_correction_data["correction_type"]
+        di_actual = element.cross_section.inner_diameter
+
+        for side, node in enumerate([element.first_node, element.last_node]):
+            neighbors = neighbor_diameters[node.global_index]
+            for _, _, di in neighbors:
+                positions.append(position)
+                sides.append(side)
+                actual_diameters.append(di_actual)
+                diameters.append(di)
+                correction_types.append(correction_type)
+                neighbor_counts.append(len(neighbors))
+
+    if link_positions:
+        d_minor, d_major = np.array(link_diameters, dtype=float).T
+        corrections[link_positions] = length_correction_expansion(d_minor, d_major)
+
+    if not positions:
+        return corrections
+
+    positions = np.array(positions, dtype=int)
+    sides = np.array(sides, dtype=int)
+    actual_diameters = np.array(actual_diameters, dtype=float)
+    diameters = np.array(diameters, dtype=float)
+    correction_types = np.array(correction_types)
+    neighbor_counts = np.array(neighbor_counts, dtype=int)
+
+    # only the neighbor elements with larger diameter lead to corrections
+    mask = actual_diameters < diameters
+    expansion = mask & np.isin(correction_types, [0, 2])
+    branch = mask & (correction_types == 1)
+
+    if np.any(mask & ~expansion & ~branch):
+        print("Datatype not understood")
+
+    if np.any(branch & (neighbor_counts == 2)):
+        message = "Warning: Expansion identified in acoustic "
+        message += "domain is being corrected as side branch."
+        print(message)
+
+    values = np.zeros(len(positions), dtype=float)
+    if np.any(expansion):
+        values[expansion] = length_correction_expansion(actual_diameters[expansion], diameters[expansion])
+    if np.any(branch):
+        values[branch] = length_correction_branch(actual_diameters[branch], diameters[branch])
+
+    # the largest correction of each element end
+    end_corrections = np.zeros((len(elements), 2), dtype=float)
+    np.maximum.at(end_corrections, (positions, sides), values)
+    corrections += np.sum(end_corrections, axis=1)
+
+    return corrections
@@ -0,0 +1,398 @@
+
+from pulse.processing.sweep_solver import SweepSolver
+
+import os
+import ctypes
+import numpy as np
+from importlib.metadata import version, PackageNotFoundError
+from scipy.sparse import csr_matrix, csc_matrix
+
+try:
+    import scikits.umfpack as umfpack
+except ImportError:
+    umfpack = None
+
+try:
+    from pypardiso import PyPardisoSolver
+except ImportError:
+    PyPardisoSolver = None
+
+
+LINEAR_SOLVERS = dict()
+
+# pypardiso-mopt releases whose private _call_pardiso entry point is known to run the PARDISO phases separately
+PARDISO_SPLIT_PHASES_RELEASES = ("0.1.",)
+
+# minimum number of degrees of freedom to select a multithreaded backend in the "auto" mode
+AUTO_REAL_SIZE_LIMIT = 20000
+AUTO_COMPLEX_SIZE_LIMIT = 10000
+
+
+def register_linear_solver(name: str):
+    """
+    This function registers a sparse linear solver backend class under a name.
+    """
+    def decorator(solver_class):
+        solver_class.name = name
+        LINEAR_SOLVERS[name] = solver_class
+        return solver_class
+    return decorator
+
+
+def get_available_linear_solvers():
+    """
+    This function returns the names of the registered backends that can be used in the current installation.
+    """
+    return [name for name, solver_class in LINEAR_SOLVERS.items() if solver_class.is_available()]
+
+
+def get_linear_solver(name="auto", **kwargs):
+    """
+    This function returns a sparse linear solver backend object.
+
+    Parameters
+    ----------
+    name : str, ['auto' | 'superlu' | 'umfpack' | 'pardiso'], optional
+        Name of the backend. The 'auto' mode selects the backend from the problem size and from
+        the complex/real type of the first matrix to be solved.
+        Default is 'auto'.
+
+    Returns
+    ----------
+    Linear solver object
+        Object with the solve, factorize and release methods.
+    """
+
+    if name in [None, "auto"]:
+        return AutoLinearSolver(**kwargs)
+
+    if name not in LINEAR_SOLVERS.keys():
+        raise ValueError(f"Invalid linear solver '{name}'. Available options: {['auto'] + list(LINEAR_SOLVERS.keys())}")
+
+    solver_class = LINEAR_SOLVERS[name]
+    if not solver_class.is_available():
+        print(f"Warning: the '{name}' linear solver is not available. The SuperLU solver will be used instead.")
+        solver_class = LINEAR_SOLVERS["superlu"]
+
+    return solver_class(**kwargs)
+
+
+def select_linear_solver(size: int, is_complex: bool):
+    """
+    This function returns the name of the backend selected by the 'auto' mode. SuperLU has the smallest
+    overhead on small models. On large models the multithreaded PARDISO solver is preferred followed by
+    UMFPACK. Complex systems demand about four times the floating point operations of the real ones,
+    so the multithreaded backends pay off on smaller models.
+
+    Parameters
+    ----------
+    size : int
+        Number of equations of the linear system.
+
+    is_complex : bool
+        True if the system matrix is complex.
+
+    Returns
+    ----------
+    str
+        Name of the backend.
+    """
+
+    size_limit = AUTO_COMPLEX_SIZE_LIMIT if is_complex else AUTO_REAL_SIZE_LIMIT
+
+    if size >= size_limit:
+        for name in ["pardiso", "umfpack"]:
+            if LINEAR_SOLVERS[name].is_available():
+                return name
+
+    return "superlu"
+
+
+@register_linear_solver("superlu")
+class SuperLUSolver(SweepSolver):
+    """ This class wraps the SciPy SuperLU solver. The fill-reducing ordering is evaluated once and reused
+    by every numerical factorization of the frequency sweep.
+    """
+    @classmethod
+    def is_available(cls):
+        return True
+
+    def release(self):
+        pass
+
+
+@register_linear_solver("umfpack")
+class UMFPACKSolver:
+    """ This class wraps the UMFPACK solver from the scikit-umfpack package. The symbolic object is evaluated
+    once and reused by every numerical factorization of the frequency sweep.
+    """
+    def __init__(self, **kwargs):
+
+        self.context = None
+        self.family = None
+        self.indptr = None
+        self.indices = None
+
+        self.analysis_count = 0
+        self.factorization_count = 0
+
+    @classmethod
+    def is_available(cls):
+        return umfpack is not None
+
+    def _get_family(self, A):
+        value_type = "z" if np.iscomplexobj(A.data) else "d"
+        index_type = "l" if A.indices.dtype == np.int64 else "i"
+        return value_type + index_type
+
+    def analyze(self, A):
+        """
+        This method evaluates the UMFPACK symbolic object.
+        """
+        A = self._to_csc(A)
+
+        self.release()
+        self.family = self._get_family(A)
+        self.context = umfpack.UmfpackContext(self.family)
+        self.context.symbolic(A)
+
+        self.indptr = A.indptr.copy()
+        self.indices = A.indices.copy()
+        self.analysis_count += 1
+
+    def _to_csc(self, A):
+        A = csc_matrix(A)
+        if not A.has_canonical_format:
+            A = A.copy()
+            A.sum_duplicates()
+        if A.dtype not in [np.float64, np.complex128]:
+            A = A.astype(complex if np.iscomplexobj(A.data) else float)
+        return A
+
+    def _pattern_changed(self, A):
+        if self.context is None or self.family != self._get_family(A):
+            return True
+        return not (np.array_equal(A.indptr, self.indptr) and np.array_equal(A.indices, self.indices))
+
+    def factorize(self, A):
+        """
+        This method evaluates the numerical factorization reusing the symbolic object.
+        """
+        A = self._to_csc(A)
+        if self._pattern_changed(A):
+            self.analyze(A)
+        self.context.numeric(A)
+        self.factorization_count += 1
+        return A
+
+    def solve(self, A, b):
+        """
+        This method solves the linear system A x = b.
+        """
+        A = self.factorize(A)
+        b = np.asarray(b)
+
+        if b.ndim == 2:
+            return np.array([self.solve_factorized(A, b[:, j]) for j in range(b.shape[1])]).T
+
+        return self.solve_factorized(A, b)
+
+    def solve_factorized(self, A, b):
+
+        if np.iscomplexobj(b) and not np.iscomplexobj(A.data):
+            x_real = self.context.solve(umfpack.UMFPACK_A, A, np.ascontiguousarray(b.real), autoTranspose=False)
+            x_imag = self.context.solve(umfpack.UMFPACK_A, A, np.ascontiguousarray(b.imag), autoTranspose=False)
+            return x_real + 1j*x_imag
+
+        return self.context.solve(umfpack.UMFPACK_A, A, np.asarray(b, dtype=A.dtype), autoTranspose=False)
+
+    def release(self):
+        if self.context is not None:
+            self.context.free()
+            self.context = None
+
+
+def pardiso_split_phases_available():
+    """
+    This function returns True if the installed pypardiso-mopt release is known to support the separate
+    symbolic (11), numerical (22) and solution (33) phases through its private entry point.
+    """
+    if PyPardisoSolver is None or not hasattr(PyPardisoSolver, "_call_pardiso"):
+        return False
+    try:
+        release = version("pypardiso-mopt")
+    except PackageNotFoundError:
+        return False
+    return release.startswith(PARDISO_SPLIT_PHASES_RELEASES)
+
+
+def set_pardiso_number_of_threads(number_of_threads: int):
+    """
+    This function limits the number of threads of the MKL runtime used by PARDISO in the current process. The
+    environment variables are also set, hence the limit holds if the MKL runtime is loaded afterwards.
+
+    Parameters
+    ----------
+    number_of_threads : int
+        Maximum number of MKL and OpenMP threads.
+    """
+    number_of_threads = max(1, int(number_of_threads))
+    os.environ["MKL_NUM_THREADS"] = str(number_of_threads)
+    os.environ["OMP_NUM_THREADS"] = str(number_of_threads)
+
+    if PyPardisoSolver is None:
+        return
+
+    try:
+        libmkl = PyPardisoSolver().libmkl
+    except Exception:
+        # the MKL runtime library was not found
+        return
+
+    libmkl.MKL_Set_Num_Threads(ctypes.c_int(number_of_threads))
+
+
+@register_linear_solver("pardiso")
+class PARDISOSolver:
+    """ This class wraps the multithreaded Intel MKL PARDISO solver from the pypardiso package. The public
+    pypardiso API evaluates the reordering and the factorization together (phase 12) for every frequency of
+    analysis and then the solution (phase 33). For the pypardiso-mopt releases listed in
+    PARDISO_SPLIT_PHASES_RELEASES, the reordering and symbolic factorization (phase 11) are evaluated once per
+    sparsity pattern and every frequency runs just the numerical factorization (phase 22) and the solution.
+    """
+    _available = None
+
+    def __init__(self, **kwargs):
+
+        self.solver = None
+        self.is_complex = None
+        self.indptr = None
+        self.indices = None
+        self.split_phases = pardiso_split_phases_available()
+
+        self.analysis_count = 0
+        self.factorization_count = 0
+
+    @classmethod
+    def is_available(cls):
+        if cls._available is None:
+            try:
+                PyPardisoSolver()
+                cls._available = True
+            except Exception:
+                # the package is missing or the MKL runtime library was not found
+                cls._available = False
+        return cls._available
+
+    def _to_csr(self, A):
+        A = csr_matrix(A)
+        if not A.has_canonical_format:
+            A = A.copy()
+            A.sum_duplicates()
+        if A.dtype not in [np.float64, np.complex128]:
+            A = A.astype(complex if np.iscomplexobj(A.data) else float)
+        # PARDISO expects 32-bit integer indexes
+        if A.indptr.dtype != np.int32 or A.indices.dtype != np.int32:
+            A = csr_matrix((A.data, A.indices.astype(np.int32), A.indptr.astype(np.int32)), shape=A.shape)
+        return A
+
+    def _pattern_changed(self, A):
+        if self.solver is None or self.is_complex != np.iscomplexobj(A.data):
+            return True
+        return not (np.array_equal(A.indptr, self.indptr) and np.array_equal(A.indices, self.indices))
+
+    def _call(self, phase, A, b=None):
+        # private pypardiso entry point, only used by the releases checked in pardiso_split_phases_available
+        if b is None:
+            b = np.zeros(A.shape[0], dtype=A.dtype)
+        self.solver.set_phase(phase)
+        return self.solver._call_pardiso(A, b)
+
+    def analyze(self, A):
+        """
+        This method creates the PARDISO solver of the sparsity pattern. If the separate phases are available, the
+        reordering and symbolic factorization (phase 11) are evaluated.
+        """
+        A = self._to_csr(A)
+
+        self.release()
+        self.is_complex = np.iscomplexobj(A.data)
+        # 13: complex and nonsymmetric matrix | 11: real and nonsymmetric matrix
+        self.solver = PyPardisoSolver(mtype = 13 if self.is_complex else 11)
+        if self.split_phases:
+            self._call(11, A)
+
+        self.indptr = A.indptr.copy()
+        self.indices = A.indices.copy()
+        self.analysis_count += 1
+
+    def factorize(self, A):
+        """
+        This method evaluates the PARDISO numerical factorization (phase 22), or the reordering and factorization
+        (phase 12) through the public pypardiso API.
+        """
+        A = self._to_csr(A)
+        if self._pattern_changed(A):
+            self.analyze(A)
+        if self.split_phases:
+            self._call(22, A)
+        else:
+            self.solver.factorize(A)
+        self.factorization_count += 1
+        return A
+
+    def _solve(self, A, b):
+        if self.split_phases:
+            return self._call(33, A, b)
+        return self.solver.solve(A, b)
+
+    def solve(self, A, b):
+        """
+        This method solves the linear system A x = b (phase 33).
+        """
+        A = self.factorize(A)
+        b = np.asfortranarray(b)
+
+        if np.iscomplexobj(b) and not self.is_complex:
+            x_real = self._solve(A, np.asfortranarray(b.real))
+            x_imag = self._solve(A, np.asfortranarray(b.imag))
+            return x_real + 1j*x_imag
+
+        return self._solve(A, np.asarray(b, dtype=A.dtype, order="F"))
+
+    def release(self):
+        if self.solver is not None:
+            self.solver.free_memory(everything=True)
+            self.solver = None
+
+
+class AutoLinearSolver:
+    """ This class selects the backend in the first call of the solve or factorize methods according to the
+    problem size and complex/real type. The selected backend is kept for the whole frequency sweep.
+    """
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.solver = None
+
+    @property
+    def name(self):
+        if self.solver is None:
+            return "auto"
+        return self.solver.name
+
+    def _select(self, A):
+        if self.solver is None:
+            name = select_linear_solver(A.shape[0], np.iscomplexobj(A.data))
+            self.solver = LINEAR_SOLVERS[name](**self.kwargs)
+
+    def factorize(self, A):
+        self._select(A)
+        return self.solver.factorize(A)
+
+    def solve(self, A, b):
+        self._select(A)
+        return self.solver.solve(A, b)
+
+    def release(self):
+        if self.solver is not None:
+            self.solver.release()
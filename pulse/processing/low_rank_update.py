@@ -0,0 +1,95 @@
+
+import numpy as np
+
+
+class LowRankUpdate:
+    """ This class solves the frequency steps of a sweep system whose matrices change only in the rows and
+    columns of a few degrees of freedom through the Sherman-Morrison-Woodbury identity. With the base matrices
+    A_0, the selection U of the p modified degrees of freedom and the p x p changes D of each frequency
+
+        (A_0 + U D U^T)^(-1) b = x_0 - Z D (I + U^T Z D)^(-1) U^T x_0,
+
+    where x_0 = A_0^(-1) b and Z = A_0^(-1) U are solved once with the base factorizations. Each update costs a
+    batch of p x p solves and a product with Z, hence no matrix is assembled or factorized again.
+
+    Parameters
+    ----------
+    positions : array
+        Rows of the modified degrees of freedom in the sweep system.
+    """
+    def __init__(self, positions):
+
+        self.positions = np.asarray(positions, dtype=int)
+        self.base_solution = None
+        self.unit_solutions = None
+
+    @property
+    def rank(self):
+        return len(self.positions)
+
+    def get_unit_rhs(self, rows, steps):
+        """
+        This method returns the right-hand sides of the unit vectors of the modified degrees of freedom.
+
+        Returns
+        ----------
+        array
+            Right-hand sides with shape (rows, steps, rank).
+        """
+
+        rhs = np.zeros((rows, steps, self.rank), dtype=complex)
+        rhs[self.positions, :, np.arange(self.rank)] = 1
+        return rhs
+
+    def set_base_solutions(self, base_solution, unit_solutions):
+        """
+        This method stores the solutions of the base systems.
+
+        Parameters
+        ----------
+        base_solution : array
+            Solution of the base systems x_0. Each column corresponds to a frequency of analysis.
+
+        unit_solutions : array
+            Solutions of the base systems for the unit right-hand sides Z with shape (rows, steps, rank).
+        """
+
+        self.base_solution = base_solution
+        self.unit_solutions = unit_solutions
+
+        # U^T Z of each frequency
+        self.capacitance = unit_solutions[self.positions, :, :].transpose(1, 0, 2)
+
+    def solve(self, delta, indexes=None):
+        """
+        This method returns the solution of the updated systems.
+
+        Parameters
+        ----------
+        delta : array
+            Changes of the matrices in the modified degrees of freedom with shape (steps, rank, rank).
+
+        indexes : array, optional
+            Frequency steps to be solved. If None, all frequency steps are solved.
+
+        Returns
+        ----------
+        array
+            Solution. Each column corresponds to a solved frequency step.
+        """
+
+        if indexes is None:
+            indexes = np.arange(self.base_solution.shape[1])
+
+        base_solution = self.base_solution[:, indexes]
+
+        if self.rank == 0:
+            return base_solution.copy()
+
+        delta = delta[indexes]
+        identity = np.broadcast_to(np.eye(self.rank), (len(indexes), self.rank, self.rank))
+
+        x_0 = base_solution[self.positions, :].T[:, :, None]
+        w = np.linalg.solve(identity + self.capacitance[indexes] @ delta, x_0)
+
+        return base_solution - np.einsum("nfp,fp->nf", self.unit_solutions[:, indexes, :], (delta @ w)[:, :, 0])
@@ -0,0 +1,331 @@
+from pulse.processing.linear_solvers import get_linear_solver
+from pulse.processing.sweep_executor import SweepSystem
+
+import logging
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+# maximum number of CSR entries of the data chunks evaluated at once
+CHUNK_ENTRIES = 2**19
+
+
+class ReducedOrderSweep:
+    """ This class solves the frequency steps of a sweep system through a multi-point Galerkin projection. The
+    full systems are solved only at a few expansion frequencies, where the solution and, optionally, its first
+    frequency derivative (the first two moments of the local Padé expansion) are added to an orthonormal Krylov
+    basis V. The small projected systems
+
+        (V^H K(f) V) y = V^H b(f)
+
+    are solved at every frequency of analysis and the solution is recovered as x = V y. The relative residual
+    ||b - K V y|| / ||b|| is used as error estimator of each frequency and the frequencies with the largest
+    estimates are added as new expansion points until all estimates are below the tolerance. The frequencies
+    that do not converge within the maximum number of expansion points are solved by the full systems.
+
+    The projected matrices are updated with the new basis vectors only. Since all matrices of the sweep share
+    the same sparsity pattern, the projections and residuals are evaluated on the CSR data of chunks of
+    frequencies at once instead of one sparse product per frequency.
+
+    Parameters
+    ----------
+    tolerance : float, optional
+        Relative residual tolerance.
+        Default is 1e-6.
+
+    max_expansion_points : int, optional
+        Maximum number of expansion frequencies.
+        Default is 30.
+
+    initial_expansion_points : int, optional
+        Number of expansion frequencies evenly spaced in the sweep before the adaptive refinement.
+        Default is 3.
+
+    include_derivatives : bool, optional
+        True if the first frequency derivative of the solution is added to the basis at each expansion point.
+        The derivatives of the matrix and right-hand side are evaluated by finite differences between the
+        neighbor frequencies of analysis.
+        Default is True.
+
+    points_per_iteration : int, optional
+        Maximum number of expansion frequencies added at each refinement. The largest local maxima of the error
+        estimates are selected.
+        Default is 4.
+
+    linear_solver : str, optional
+        Name of the sparse linear solver backend used at the expansion points.
+        Default is 'auto'.
+    """
+    def __init__(self, **kwargs):
+
+        self.tolerance = kwargs.get("tolerance", 1e-6)
+        self.max_expansion_points = kwargs.get("max_expansion_points", 30)
+        self.initial_expansion_points = kwargs.get("initial_expansion_points", 3)
+        self.include_derivatives = kwargs.get("include_derivatives", True)
+        self.points_per_iteration = kwargs.get("points_per_iteration", 4)
+        self.linear_solver = kwargs.get("linear_solver", "auto")
+
+        self.solver = None
+        self._reset()
+
+    def _reset(self):
+
+        self.basis = None
+        self.expansion_indexes = list()
+        self.direct_indexes = list()
+        self.error_estimates = None
+
+    @property
+    def basis_size(self):
+        if self.basis is None:
+            return 0
+        return self.basis.shape[1]
+
+    def release(self):
+        if self.solver is not None:
+            self.solver.release()
+            self.solver = None
+
+    def solve(self, system: SweepSystem, **kwargs):
+        """
+        This method solves all frequency steps of the sweep system through the reduced order model.
+
+        Parameters
+        ----------
+        system : SweepSystem object
+            Linear systems of the frequency sweep.
+
+        frequencies : array, optional
+            Frequencies of analysis. They are used in the finite differences of the derivatives and in the
+            progress messages.
+
+        stop_processing : callable, optional
+            Function that returns True if the user requested the interruption of the solution.
+
+        Returns
+        ----------
+        array
+            Solution. Each column corresponds to a frequency of analysis. None if the solution was interrupted.
+        """
+
+        frequencies = kwargs.get("frequencies", None)
+        stop_processing = kwargs.get("stop_processing", None)
+
+        steps = system.number_of_steps
+
+        if frequencies is None:
+            frequencies = np.arange(steps)
+        frequencies = np.asarray(frequencies, dtype=float)
+
+        if stop_processing is None:
+            stop_processing = lambda: False
+
+        if self.solver is None:
+            self.solver = get_linear_solver(self.linear_solver)
+
+        self._reset()
+        projection = _Projection(system)
+
+        points = min(self.initial_expansion_points, self.max_expansion_points, steps)
+        new_indexes = list(np.unique(np.round(np.linspace(0, steps - 1, max(points, 1))).astype(int)))
+
+        while True:
+
+            vectors = list()
+            for index in new_indexes:
+
+                logging.info(f"Reduced order sweep: expansion point {len(self.expansion_indexes) + 1} at {frequencies[index] : .3f} Hz")
+
+                vectors.append(self._get_expansion_vectors(system, frequencies, index))
+                self.expansion_indexes.append(int(index))
+
+                if stop_processing():
+                    self.release()
+                    return None
+
+            self._update_basis(projection, np.concatenate(vectors, axis=1))
+
+            reduced_solution = projection.solve()
+            solution = self.basis @ reduced_solution
+            self.error_estimates = projection.residuals(solution)
+
+            available = self.max_expansion_points - len(self.expansion_indexes)
+            new_indexes = self._get_new_expansion_indexes(self.error_estimates, available)
+
+            if not new_indexes:
+                break
+
+        # the frequencies that did not converge are solved by the full systems
+        self.direct_indexes = [int(index) for index in np.flatnonzero(self.error_estimates > self.tolerance)]
+        for index in self.direct_indexes:
+            solution[:, index] = self.solver.solve(system.matrix(index), system.rhs[:, index])
+            self.error_estimates[index] = 0
+
+        message = f"Reduced order sweep: basis size {self.basis_size}, "
+        message += f"{len(self.expansion_indexes)} expansion points, "
+        message += f"{len(self.direct_indexes)} frequencies solved by the full systems"
+        logging.info(message)
+
+        return solution
+
+    def _get_new_expansion_indexes(self, error_estimates, available):
+        """
+        This method returns the frequencies of the largest local maxima of the error estimates above the
+        tolerance. Each local maximum is related to a resonance that is not yet represented by the basis.
+        """
+
+        if available <= 0:
+            return list()
+
+        errors = np.r_[-np.inf, error_estimates, -np.inf]
+        peaks = np.flatnonzero((errors[1:-1] >= errors[:-2]) & (errors[1:-1] >= errors[2:]))
+        peaks = peaks[error_estimates[peaks] > self.tolerance]
+        peaks = np.setdiff1d(peaks, self.expansion_indexes)
+
+        points = min(self.points_per_iteration, available)
+        return list(peaks[np.argsort(error_estimates[peaks])[::-1][:points]])
+
+    def _get_expansion_vectors(self, system: SweepSystem, frequencies, index):
+        """
+        This method returns the solution and its first frequency derivative at an expansion frequency.
+        """
+
+        A = system.matrix(index)
+        b = system.rhs[:, index]
+
+        x = self.solver.solve(A, b)
+
+        if not self.include_derivatives or system.number_of_steps == 1:
+            return x.reshape(-1, 1)
+
+        previous = max(index - 1, 0)
+        following = min(index + 1, system.number_of_steps - 1)
+        delta = frequencies[following] - frequencies[previous]
+
+        dA = (system.matrix(following) - system.matrix(previous)) / delta
+        db = (system.rhs[:, following] - system.rhs[:, previous]) / delta
+
+        dx = self.solver.solve(A, db - dA @ x)
+
+        return np.c_[x, dx]
+
+    def _update_basis(self, projection, vectors):
+        """
+        This method orthonormalizes the vectors against the basis through two passes of the modified Gram-Schmidt
+        method and adds the independent vectors to the basis and to the projected systems.
+        """
+
+        vectors = np.array(vectors, dtype=complex)
+        n = vectors.shape[0]
+
+        if self.basis is None:
+            self.basis = np.zeros((n, 0), dtype=complex)
+
+        new_vectors = list()
+        for vector in vectors.T:
+
+            norm = np.linalg.norm(vector)
+            if norm == 0:
+                continue
+
+            for _ in range(2):
+                for column in [*self.basis.T, *new_vectors]:
+                    vector = vector - np.vdot(column, vector) * column
+
+            reduced_norm = np.linalg.norm(vector)
+            if reduced_norm > 1e-10 * norm:
+                new_vectors.append(vector / reduced_norm)
+
+        if new_vectors:
+            new_vectors = np.array(new_vectors).T
+            projection.add(self.basis, new_vectors)
+            self.basis = np.c_[self.basis, new_vectors]
+
+
+class _Projection:
+    """ This class stores the projected matrices V^H K V and the projected right-hand sides V^H b of all
+    frequencies of analysis. Since all matrices of the sweep share the same sparsity pattern, the products
+    with the matrices of a chunk of frequencies are evaluated at once. The projected matrices are the product
+    of the CSR data with the contributions of each entry to the projection, and the products K x are the CSR
+    data multiplied by the gathered entries of x and summed by row through a sparse operator with one column
+    per CSR entry.
+    """
+    def __init__(self, system: SweepSystem, chunk_entries=CHUNK_ENTRIES):
+
+        self.system = system
+
+        n = system.shape[0]
+        nnz = len(system.indices)
+        steps = system.number_of_steps
+
+        self.rows = np.repeat(np.arange(n), np.diff(system.indptr))
+        self.cols = np.asarray(system.indices)
+
+        entries = np.arange(nnz)
+        self.row_sums = csr_matrix((np.ones(nnz), entries, system.indptr), shape=(n, nnz))
+
+        chunk_size = max(1, chunk_entries // max(nnz, 1))
+        self.chunks = [slice(start, min(start + chunk_size, steps)) for start in range(0, steps, chunk_size)]
+
+        self.matrices = np.zeros((steps, 0, 0), dtype=complex)
+        self.rhs = np.zeros((steps, 0), dtype=complex)
+        self.rhs_norms = np.linalg.norm(system.rhs, axis=0)
+
+    def add(self, V, W):
+        """
+        This method adds the new basis vectors W to the projections on the basis V.
+        """
+
+        steps = self.system.number_of_steps
+        r, s = V.shape[1], W.shape[1]
+
+        matrices = np.zeros((steps, r + s, r + s), dtype=complex)
+        matrices[:, :r, :r] = self.matrices
+
+        # the contribution of each CSR entry to the new blocks of the projected matrices
+        U = np.c_[V, W]
+        G_right = np.einsum("ei,ej->eij", U[self.rows].conj(), W[self.cols]).reshape(len(self.rows), -1)
+        G_bottom = np.einsum("ei,ej->eij", W[self.rows].conj(), V[self.cols]).reshape(len(self.rows), -1)
+
+        for indexes in self.chunks:
+            data = self.system.data(indexes)
+            matrices[indexes, :, r:] = (data @ G_right).reshape(-1, r + s, s)
+            if r:
+                matrices[indexes, r:, :r] = (data @ G_bottom).reshape(-1, s, r)
+
+        self.matrices = matrices
+        self.rhs = np.c_[self.rhs, (W.conj().T @ self.system.rhs).T]
+
+    def residuals(self, solution):
+        """
+        This method returns the relative residuals ||b - K x|| / ||b|| of all frequencies of analysis.
+        """
+
+        residuals = np.zeros(self.system.number_of_steps, dtype=float)
+
+        for indexes in self.chunks:
+            data = self.system.data(indexes).T
+            Kx = self.row_sums @ (data * solution[self.cols, indexes])
+            residuals[indexes] = np.linalg.norm(self.system.rhs[:, indexes] - Kx, axis=0)
+
+        mask = self.rhs_norms > 0
+        residuals[mask] /= self.rhs_norms[mask]
+
+        return residuals
+
+    def solve(self):
+        """
+        This method solves the projected systems of all frequencies of analysis.
+
+        Returns
+        ----------
+        array
+            Reduced solution. Each column corresponds to a frequency of analysis.
+        """
+
+        try:
+            y = np.linalg.solve(self.matrices, self.rhs[:, :, None])[:, :, 0]
+        except np.linalg.LinAlgError:
+            y = np.array([np.linalg.lstsq(A, b, rcond=None)[0] for A, b in zip(self.matrices, self.rhs)])
+
+        return y.T
@@ -0,0 +1,114 @@
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+class FixedSparsityPattern:
+    """ This class stores the CSR sparsity pattern of a reduced global matrix and the permutation
+    that scatters the COO data of the assembly process into it. The pattern is evaluated just once
+    and the matrices of every frequency of analysis share the same indices and indptr arrays.
+
+    Parameters
+    ----------
+    rows : array
+        Global row indexes of the COO entries.
+
+    cols : array
+        Global column indexes of the COO entries.
+
+    kept_rows : array
+        Global indexes of the rows kept in the reduced matrix. The order is preserved.
+
+    kept_cols : array
+        Global indexes of the columns kept in the reduced matrix. The order is preserved.
+
+    total_dof : int
+        Number of rows and columns of the global matrix.
+    """
+    def __init__(self, rows, cols, kept_rows, kept_cols, total_dof):
+
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.cols = np.asarray(cols, dtype=np.int64)
+        self.shape = (len(kept_rows), len(kept_cols))
+
+        self._process_pattern(kept_rows, kept_cols, total_dof)
+
+    def _process_pattern(self, kept_rows, kept_cols, total_dof):
+        """
+        This method maps the global COO entries into the reduced matrix, sorts them in CSR order and
+        builds the scatter matrix that sums the duplicated entries.
+        """
+
+        n_rows, n_cols = self.shape
+
+        row_map = np.full(total_dof, -1, dtype=np.int64)
+        col_map = np.full(total_dof, -1, dtype=np.int64)
+        row_map[np.asarray(kept_rows, dtype=np.int64)] = np.arange(n_rows)
+        col_map[np.asarray(kept_cols, dtype=np.int64)] = np.arange(n_cols)
+
+        reduced_rows = row_map[self.rows]
+        reduced_cols = col_map[self.cols]
+
+        self.entries = np.flatnonzero((reduced_rows >= 0) & (reduced_cols >= 0))
+        keys = reduced_rows[self.entries] * n_cols + reduced_cols[self.entries]
+
+        unique_keys, self.positions = np.unique(keys, return_inverse=True)
+
+        self.nnz = len(unique_keys)
+        self.indices = (unique_keys % max(n_cols, 1)).astype(np.int32)
+        self.indptr = np.zeros(n_rows + 1, dtype=np.int32)
+        self.indptr[1:] = np.cumsum(np.bincount(unique_keys // max(n_cols, 1), minlength=n_rows))
+
+        ones = np.ones(len(self.entries))
+        self.scatter_matrix = csr_matrix((ones, (self.positions, np.arange(len(self.entries)))),
+                                         shape=(self.nnz, len(self.entries)))
+
+    def matches(self, rows, cols):
+        """
+        This method returns True if the COO indexes are the same used to build the pattern.
+        """
+        if len(rows) != len(self.rows):
+            return False
+        return np.array_equal(rows, self.rows) and np.array_equal(cols, self.cols)
+
+    def scatter(self, data):
+        """
+        This method writes the COO data into the reduced CSR data array. Duplicated entries are summed.
+
+        Parameters
+        ----------
+        data : array
+            COO data. Each row corresponds to a frequency of analysis and each column to an entry of
+            the rows and cols arrays.
+
+        Returns
+        ----------
+        array
+            CSR data with shape (number of frequencies, nnz).
+        """
+        data = np.atleast_2d(data)
+        if self.nnz == 0:
+            return np.zeros((data.shape[0], 0), dtype=complex)
+        return np.asarray((self.scatter_matrix @ data[:, self.entries].T).T, dtype=complex)
+
+    def matrix(self, data):
+        """
+        This method returns the reduced sparse matrix related to one row of the CSR data array.
+
+        Parameters
+        ----------
+        data : array
+            CSR data of a frequency of analysis.
+
+        Returns
+        ----------
+        sparse csr_matrix
+            Reduced matrix.
+        """
+        return csr_matrix((data, self.indices, self.indptr), shape=self.shape, copy=False)
+
+    def matrices(self, data):
+        """
+        This method returns the list of reduced sparse matrices related to the CSR data array.
+        """
+        return [self.matrix(_data) for _data in data]
@@ -0,0 +1,595 @@
+# fmt: off
+
+from pulse.model.node import DOF_PER_NODE_STRUCTURAL
+from pulse.model.structural_element import DOF_PER_ELEMENT, gauss_quadrature, shape_function
+
+import numpy as np
+from collections import OrderedDict
+
+
+# element types whose stiffness and mass matrices are evaluated by the batched kernels
+TIMOSHENKO_KERNEL_TYPES = ["pipe_1", "valve", "beam_1"]
+
+# element lengths are rounded to this number of decimals (in meters) to build the cache keys
+LENGTH_DECIMALS = 12
+
+# attributes of the pipe elements required by the stress recovery and by the stress stiffening
+PIPE_ELEMENT_ATTRIBUTES = ["_Dab", "_Dts", "_Bab", "_Bts", "Phi_y", "Phi_z", "Jx_Ax"]
+
+
+def is_batchable(element):
+    """
+    This function returns True if the stiffness and mass matrices of the element can be evaluated by the
+    batched kernels. The pipes with variable section and the elements with stress stiffening (geometric
+    stiffness from a previous static analysis) are evaluated element by element.
+    """
+    if element.element_type not in TIMOSHENKO_KERNEL_TYPES:
+        return False
+    if element.element_type in ["pipe_1", "valve"]:
+        if element.variable_section or element.static_analysis_evaluated:
+            return False
+    return True
+
+
+class LocalMatrixCache:
+    """ This class stores the local stiffness and mass matrices of the structural elements in a bounded least
+    recently used cache. The matrices are keyed by element type, cross section and material properties and
+    element length, hence the elements that share these data are evaluated once and the assembly only applies
+    the rotations to the global coordinate system. The keys are built from the property values, but the cache
+    must be invalidated when the cross sections, materials or stress stiffening data change to release the
+    outdated entries.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        Maximum number of local matrices stored in the cache.
+        Default is 4096.
+    """
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, requests=1):
+        """
+        This method returns the entry related to the key or None if it is not cached. The requests argument
+        is the number of elements that share the key. Only the first request of a missing key is a miss.
+        """
+        entry = self.entries.get(key, None)
+        if entry is None:
+            self.misses += 1
+            self.hits += requests - 1
+        else:
+            self.hits += requests
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self):
+        """
+        This method removes all local matrices from the cache. The hit and miss counters are kept.
+        """
+        self.entries.clear()
+
+    def reset_statistics(self):
+        """
+        This method sets the hit and miss counters to zero.
+        """
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        requests = self.hits + self.misses
+        if requests == 0:
+            return 0.
+        return self.hits / requests
+
+    def report(self):
+        """
+        This method returns the cache statistics.
+        """
+        return {    "size" : len(self.entries),
+                    "max_size" : self.max_size,
+                    "hits" : self.hits,
+                    "misses" : self.misses,
+                    "hit_rate" : self.hit_rate  }
+
+
+def timoshenko_matrices(elements, transformation_matrices=None, cache=None):
+    """
+    This function evaluates the stiffness and mass matrices of a list of structural elements according to the
+    3D Timoshenko beam theory in the global coordinate system. The elements are grouped by element type and the
+    local matrices of each group are built from stacked section and material arrays. Only one element of each
+    set of elements with equal properties and length is evaluated and the local matrices are read from the
+    cache when available. The local matrices are rotated to the global coordinate system by a batched product
+    with the element transformation matrices.
+
+    Parameters
+    ----------
+    elements : list
+        Structural elements. All elements must be batchable.
+
+    transformation_matrices : array, optional
+        Element transformation matrices with shape (n_elements, 3, 3). If None, the sub transformation
+        matrices of the elements are used.
+        Default is None.
+
+    cache : LocalMatrixCache object, optional
+        Cache of local matrices. If None, the local matrices are shared only within this call.
+        Default is None.
+
+    Returns
+    ----------
+    stiffness : array
+        Element stiffness matrices in the global coordinate system with shape (n_elements, 12, 12).
+
+    mass : array
+        Element mass matrices in the global coordinate system with shape (n_elements, 12, 12).
+    """
+
+    number_elements = len(elements)
+
+    if transformation_matrices is None:
+        transformation_matrices = np.array([element.sub_transformation_matrix for element in elements], dtype=float)
+    transformation_matrices = np.reshape(transformation_matrices, (number_elements, 3, 3))
+
+    if cache is None:
+        cache = LocalMatrixCache(max_size=np.inf)
+
+    Ke = np.zeros((number_elements, DOF_PER_ELEMENT, DOF_PER_ELEMENT), dtype=float)
+    Me = np.zeros((number_elements, DOF_PER_ELEMENT, DOF_PER_ELEMENT), dtype=float)
+
+    element_types = np.array([element.element_type for element in elements])
+
+    for element_type in np.unique(element_types):
+
+        indexes = np.flatnonzero(element_types == element_type)
+        group = [elements[i] for i in indexes]
+
+        keys = _element_keys(group, element_type)
+        unique_keys = dict()
+        positions = np.array([unique_keys.setdefault(key, len(unique_keys)) for key in keys], dtype=int)
+        unique_keys = list(unique_keys)
+
+        requests = np.bincount(positions)
+        entries = [cache.get(key, requests=int(count)) for key, count in zip(unique_keys, requests)]
+        missing = [i for i, entry in enumerate(entries) if entry is None]
+
+        if missing:
+            # the first element related to each missing key is evaluated
+            _, representatives = np.unique(positions, return_index=True)
+            computed = _local_matrices([group[representatives[i]] for i in missing], element_type)
+            for i, entry in zip(missing, computed):
+                entries[i] = entry
+                cache.put(unique_keys[i], entry)
+
+        Ke[indexes] = np.array([entry[0] for entry in entries])[positions]
+        Me[indexes] = np.array([entry[1] for entry in entries])[positions]
+
+        if element_type in ["pipe_1", "valve"]:
+            for element, position in zip(group, positions):
+                for name, value in zip(PIPE_ELEMENT_ATTRIBUTES, entries[position][2]):
+                    setattr(element, name, value)
+
+    R = _element_rotation_matrices(transformation_matrices)
+    Rt = R.transpose(0, 2, 1)
+
+    # the element rotation matrices are kept to evaluate the element loads
+    for element, rotation in zip(elements, Rt):
+        element.transpose_rotation_matrix = rotation
+
+    return _rotate(Ke, transformation_matrices), _rotate(Me, transformation_matrices)
+
+
+def _local_matrices(elements, element_type):
+    """
+    This function evaluates the local stiffness and mass matrices of the elements. It returns a list of
+    entries (stiffness, mass, attributes) where attributes are the pipe element attributes.
+    """
+
+    attributes = [()] * len(elements)
+
+    if element_type == "beam_1":
+        Ke, Me = _beam_matrices(elements)
+
+    else:
+        Ke = _pipe_stiffness_matrices(elements)
+        if element_type == "valve":
+            Ke *= _gather(elements, lambda element: element.valve_stiffening_factor).reshape(-1, 1, 1)
+            Me = _valve_mass_matrices(elements)
+        else:
+            Me = _pipe_mass_matrices(elements)
+        attributes = [tuple(getattr(element, name) for name in PIPE_ELEMENT_ATTRIBUTES) for element in elements]
+
+    return list(zip(Ke, Me, attributes))
+
+
+def _element_keys(elements, element_type):
+    """
+    This function returns the cache keys of the elements. The section and material signatures are evaluated
+    once for each section and material object.
+    """
+
+    if element_type == "beam_1":
+        update = lambda section: section.offset_rotation(el_type='beam_1')
+    else:
+        update = None
+
+    sections = dict()
+    materials = dict()
+    lengths = np.round(_lengths(elements), LENGTH_DECIMALS)
+
+    keys = list()
+    for element, length in zip(elements, lengths):
+
+        section = element.cross_section
+        if id(section) not in sections:
+            if update is not None:
+                update(section)
+            sections[id(section)] = _section_signature(section, element_type)
+
+        material = element.material
+        if id(material) not in materials:
+            materials[id(material)] = ( material.elasticity_modulus,
+                                        material.poisson_ratio,
+                                        material.shear_modulus,
+                                        material.mu_parameter,
+                                        material.density   )
+
+        if element_type == "beam_1":
+            extra = element.decoupling_matrix.tobytes()
+        elif element_type == "valve":
+            extra = (element.valve_length, element.valve_mass, element.valve_stiffening_factor)
+        elif element.fluid is not None and element.adding_mass_effect:
+            extra = element.fluid.density
+        else:
+            extra = None
+
+        keys.append((element_type, sections[id(section)], materials[id(material)], float(length), extra))
+
+    return keys
+
+
+def _section_signature(section, element_type):
+
+    if element_type == "beam_1":
+        properties = (  section.area,
+                        section.second_moment_area_y,
+                        section.second_moment_area_z,
+                        section._polar_moment_area()  )
+    else:
+        properties = (  section.area,
+                        section.second_moment_area_y,
+                        section.second_moment_area_z,
+                        section.polar_moment_area,
+                        section.res_y,
+                        section.res_z,
+                        section.area_fluid,
+                        section.area_insulation,
+                        section.insulation_density  )
+
+    return properties + (np.asarray(section.principal_axis, dtype=float).tobytes(),)
+
+
+def _gather(elements, function):
+    return np.array([function(element) for element in elements], dtype=float)
+
+
+def _lengths(elements):
+    first_nodes = np.array([element.first_node.coordinates for element in elements], dtype=float).reshape(-1, 3)
+    last_nodes = np.array([element.last_node.coordinates for element in elements], dtype=float).reshape(-1, 3)
+    return np.linalg.norm(last_nodes - first_nodes, axis=1)
+
+
+def _principal_axes(elements, update=None):
+    """
+    This function stacks the principal axis matrices of the element cross sections. The cross sections shared
+    by several elements are processed once.
+    """
+    sections = dict()
+    positions = np.zeros(len(elements), dtype=int)
+
+    for i, element in enumerate(elements):
+        key = id(element.cross_section)
+        if key not in sections:
+            if update is not None:
+                update(element.cross_section)
+            sections[key] = (len(sections), element.cross_section.principal_axis)
+        positions[i] = sections[key][0]
+
+    axes = np.array([axis for _, axis in sections.values()], dtype=float)
+    return axes[positions]
+
+
+def _element_rotation_matrices(transformation_matrices):
+    R = np.zeros((len(transformation_matrices), DOF_PER_ELEMENT, DOF_PER_ELEMENT), dtype=float)
+    for i in range(0, DOF_PER_ELEMENT, 3):
+        R[:, i:i+3, i:i+3] = transformation_matrices
+    return R
+
+
+def _rotate(matrices, transformation_matrices):
+    """
+    This function evaluates Rt @ matrices @ R for block diagonal rotation matrices R without assembling them.
+    """
+    n = len(matrices)
+    blocks = matrices.reshape(n, 4, 3, 4, 3)
+    rotated = np.einsum("nji,najbk,nkl->naibl", transformation_matrices, blocks, transformation_matrices, optimize=True)
+    return rotated.reshape(n, DOF_PER_ELEMENT, DOF_PER_ELEMENT)
+
+
+def _congruence(P, matrices):
+    """
+    This function evaluates P.T @ matrices @ P for stacks of matrices.
+    """
+    return np.einsum("nki,nkl,nlj->nij", P, matrices, P, optimize=True)
+
+
+def _pipe_stiffness_matrices(elements):
+    """
+    This function evaluates the pipe stiffness matrices in the local coordinate system. It reproduces the
+    single point Gauss quadrature of StructuralElement.stiffness_matrix_pipes and stores the constitutive and
+    strain-displacement matrices used by the stress recovery in the elements.
+    """
+
+    n = len(elements)
+    L = _lengths(elements)
+
+    E = _gather(elements, lambda element: element.material.elasticity_modulus)
+    mu = _gather(elements, lambda element: element.material.mu_parameter)
+    G = _gather(elements, lambda element: element.material.shear_modulus)
+
+    A = _gather(elements, lambda element: element.cross_section.area)
+    Iy = _gather(elements, lambda element: element.cross_section.second_moment_area_y)
+    Iz = _gather(elements, lambda element: element.cross_section.second_moment_area_z)
+    J = _gather(elements, lambda element: element.cross_section.polar_moment_area)
+    aly = 1 / _gather(elements, lambda element: element.cross_section.res_y)
+    alz = 1 / _gather(elements, lambda element: element.cross_section.res_z)
+
+    principal_axis = _principal_axes(elements)
+
+    # Constitutive matrices (Qy = Qz = Iyz = 0 for pipe sections)
+    Dts = np.zeros((n, 3, 3), dtype=float)
+    Dts[:, 0, 0] = mu * J
+    Dts[:, 1, 1] = mu * aly * A
+    Dts[:, 2, 2] = mu * alz * A
+
+    Dab = np.zeros((n, 3, 3), dtype=float)
+    Dab[:, 0, 0] = E * A
+    Dab[:, 1, 1] = E * Iy
+    Dab[:, 2, 2] = E * Iz
+
+    Phi_y = (12*E*Iz)/(G*aly*A*L**2)
+    Phi_z = (12*E*Iy)/(G*alz*A*L**2)
+    Jx_Ax = J/A
+
+    det_jacob = L / 2
+    inv_jacob = 1 / det_jacob
+
+    points, weigths = gauss_quadrature(1)
+    phi, derivative_phi = shape_function(points[0])
+    weigth = weigths[0]
+
+    dphi_0 = inv_jacob * derivative_phi[0]
+    dphi_1 = inv_jacob * derivative_phi[1]
+
+    # Axial and Bending B-matrices
+    Bab = np.zeros((n, 3, DOF_PER_ELEMENT), dtype=float)
+    Bab[:, [0,1,2], [0,4,5]] = dphi_0.reshape(-1, 1)
+    Bab[:, [0,1,2], [6,10,11]] = dphi_1.reshape(-1, 1)
+
+    # Torsional and Shear B-matrices
+    Bts = np.zeros((n, 3, DOF_PER_ELEMENT), dtype=float)
+    Bts[:, [0,1,2], [3,1,2]] = dphi_0.reshape(-1, 1)
+    Bts[:, 1, 5] = -phi[0]
+    Bts[:, 2, 4] = phi[0]
+    Bts[:, [0,1,2], [9,7,8]] = dphi_1.reshape(-1, 1)
+    Bts[:, 1, 11] = -phi[1]
+    Bts[:, 2, 10] = phi[1]
+
+    scale = (det_jacob * weigth).reshape(-1, 1, 1)
+    Ke = _congruence(Bab, Dab) * scale + _congruence(Bts, Dts) * scale
+
+    for i, element in enumerate(elements):
+        element._Dab = Dab[i]
+        element._Dts = Dts[i]
+        element._Bab = Bab[i]
+        element._Bts = Bts[i]
+        element.Phi_y = Phi_y[i]
+        element.Phi_z = Phi_z[i]
+        element.Jx_Ax = Jx_Ax[i]
+
+    return _congruence(principal_axis, Ke)
+
+
+def _pipe_mass_matrices(elements):
+    """
+    This function evaluates the pipe mass matrices in the local coordinate system. The inertia matrix of the
+    pipe sections is diagonal, hence the two point Gauss quadrature of StructuralElement.mass_matrix_pipes
+    reduces to a Kronecker product between the shape function products and the inertia matrix.
+    """
+
+    n = len(elements)
+    L = _lengths(elements)
+    rho = _gather(elements, lambda element: element.material.density)
+
+    A = _gather(elements, lambda element: element.cross_section.area)
+    Iy = _gather(elements, lambda element: element.cross_section.second_moment_area_y)
+    Iz = _gather(elements, lambda element: element.cross_section.second_moment_area_z)
+    J = _gather(elements, lambda element: element.cross_section.polar_moment_area)
+    Ais = _gather(elements, lambda element: element.cross_section.area_insulation)
+    rho_insulation = _gather(elements, lambda element: element.cross_section.insulation_density)
+
+    def added_mass(element):
+        if element.fluid is not None and element.adding_mass_effect:
+            return element.fluid.density * element.cross_section.area_fluid
+        return 0.
+
+    principal_axis = _principal_axes(elements)
+
+    # Inertia matrices (diagonal)
+    Ggm = rho.reshape(-1, 1) * np.array([A, A, A, J, Iy, Iz]).T
+    Ggm[:, 0:3] += (_gather(elements, added_mass) + rho_insulation * Ais).reshape(-1, 1)
+
+    # Shape function products integrated over the normalized domain
+    points, weigths = gauss_quadrature(2)
+    Nphi = np.zeros((2, 2), dtype=float)
+    for point, weigth in zip(points, weigths):
+        phi, _ = shape_function(point)
+        Nphi += np.outer(phi, phi) * weigth
+
+    det_jacob = L / 2
+    Me = np.einsum("ab,ni,ij->naibj", Nphi, Ggm, np.eye(DOF_PER_NODE_STRUCTURAL))
+    Me = Me.reshape(n, DOF_PER_ELEMENT, DOF_PER_ELEMENT) * det_jacob.reshape(-1, 1, 1)
+
+    return _congruence(principal_axis, Me)
+
+
+def _valve_mass_matrices(elements):
+
+    L_e = _gather(elements, lambda element: element.valve_length) / _lengths(elements)
+    masses = _gather(elements, lambda element: element.valve_mass) / (2 * L_e)
+
+    Me = np.zeros((len(elements), DOF_PER_ELEMENT, DOF_PER_ELEMENT), dtype=float)
+    indexes = np.array([0,1,2,6,7,8], dtype=int)
+    Me[:, indexes, indexes] = masses.reshape(-1, 1)
+
+    return Me
+
+
+def _symmetrize(matrices):
+    diagonal = np.einsum("nii->ni", matrices)
+    symmetric = matrices + matrices.transpose(0, 2, 1)
+    symmetric[:, np.arange(DOF_PER_ELEMENT), np.arange(DOF_PER_ELEMENT)] -= diagonal
+    return symmetric
+
+
+def _beam_matrices(elements):
+    """
+    This function evaluates the beam stiffness and mass matrices in the local coordinate system as in the
+    StructuralElement.stiffness_matrix_beam and StructuralElement.mass_matrix_beam methods. The shear
+    coefficient is currently disabled in these methods, hence the shear deflection terms vanish.
+    """
+
+    n = len(elements)
+    L = _lengths(elements)
+
+    E = _gather(elements, lambda element: element.material.elasticity_modulus)
+    G = _gather(elements, lambda element: element.material.shear_modulus)
+    rho = _gather(elements, lambda element: element.material.density)
+
+    A = _gather(elements, lambda element: element.cross_section.area)
+    I_2 = _gather(elements, lambda element: element.cross_section.second_moment_area_y)
+    I_3 = _gather(elements, lambda element: element.cross_section.second_moment_area_z)
+    J = _gather(elements, lambda element: element.cross_section._polar_moment_area())
+
+    principal_axis = _principal_axes(elements, update=lambda section: section.offset_rotation(el_type='beam_1'))
+    decoupling = np.array([element.decoupling_matrix for element in elements], dtype=float)
+
+    # Stiffness matrices (Phi_12 = Phi_13 = 0)
+    beta_12_a = E * I_3
+    beta_13_a = E * I_2
+    beta_12_b = 4. * beta_12_a
+    beta_13_b = 4. * beta_13_a
+    beta_12_c = 2. * beta_12_a
+    beta_13_c = 2. * beta_13_a
+
+    ke = np.zeros((n, DOF_PER_ELEMENT, DOF_PER_ELEMENT), dtype=float)
+
+    diagonal = np.array([   E * A / L,
+                            12 * beta_12_a / L**3,
+                            12 * beta_13_a / L**3,
+                            G * J / L,
+                            beta_13_b / L,
+                            beta_12_b / L   ]).T
+
+    rows, cols = np.diag_indices(DOF_PER_ELEMENT)
+    ke[:, rows, cols] = np.tile(diagonal, 2)
+
+    ke[:, 6, 0] = - E * A / L
+    ke[:, 9, 3] = - G * J / L
+    ke[:, 7, 1] = - 12 * beta_12_a / L**3
+    ke[:, 11, 5] = beta_12_c / L
+    ke[:, 8, 2] = - 12 * beta_13_a / L**3
+    ke[:, 10, 4] = beta_13_c / L
+
+    ke[:, [5,11], [1,1]] = (6 * beta_12_a / L**2).reshape(-1, 1)
+    ke[:, [7,11], [5,7]] = (- 6 * beta_12_a / L**2).reshape(-1, 1)
+    ke[:, [4,10], [2,2]] = (- 6 * beta_13_a / L**2).reshape(-1, 1)
+    ke[:, [8,10], [4,8]] = (6 * beta_13_a / L**2).reshape(-1, 1)
+
+    Ke = _symmetrize(ke) * decoupling
+
+    # Mass matrices (a_12 = a_13 = 0)
+    b_12 = 1. / (E * I_3)
+    b_13 = 1. / (E * I_2)
+
+    a_12u_1 = 156 * b_12**2 * L**4
+    a_12u_2 = 2 * L * (11 * b_12**2 * L**4)
+    a_12u_3 = 54 * b_12**2 * L**4
+    a_12u_4 = -L * (13 * b_12**2 * L**4)
+    a_12u_5 = L**2 * (4 * b_12**2 * L**4)
+    a_12u_6 = -3 * L**2 * (b_12**2 * L**4)
+
+    a_12t_1 = 36 * b_12**2 * L**2
+    a_12t_2 = -3 * L * b_12 * (-b_12 * L**2)
+    a_12t_3 = 4 * b_12**2 * L**4
+    a_12t_4 = -b_12**2 * L**4
+
+    a_13u_1 = 156 * b_13**2 * L**4
+    a_13u_2 = -2 * L * (11 * b_13**2 * L**4)
+    a_13u_3 = 54 * b_13**2 * L**4
+    a_13u_4 = L * (13 * b_13**2 * L**4)
+    a_13u_5 = L**2 * (4 * b_13**2 * L**4)
+    a_13u_6 = -3 * L**2 * (b_13**2 * L**4)
+
+    a_13t_1 = 36 * b_13**2 * L**2
+    a_13t_2 = 3 * L * b_13 * (-b_13 * L**2)
+    a_13t_3 = 4 * b_13**2 * L**4
+    a_13t_4 = -b_13**2 * L**4
+
+    gamma_12 = rho * L / (b_12 * L**2)**2
+    gamma_13 = rho * L / (b_13 * L**2)**2
+
+    me = np.zeros((n, DOF_PER_ELEMENT, DOF_PER_ELEMENT), dtype=float)
+
+    diagonal = np.array([   rho * A * L / 3,
+                            gamma_12 * (A * a_12u_1 / 420 + I_3 * a_12t_1 / 30),
+                            gamma_13 * (A * a_13u_1 / 420 + I_2 * a_13t_1 / 30),
+                            rho * J * L / 3,
+                            gamma_13 * (A * a_13u_5 / 420 + I_2 * a_13t_3 / 30),
+                            gamma_12 * (A * a_12u_5 / 420 + I_3 * a_12t_3 / 30)    ]).T
+
+    me[:, rows, cols] = np.tile(diagonal, 2)
+
+    me[:, 9, 3] =  rho * J * L / 6
+    me[:, 6, 0] =  rho * A * L / 6
+    me[:, 5, 1] =  gamma_12 * (A * a_12u_2 / 420 + I_3 * a_12t_2 / 30)
+    me[:, 11, 7] = -gamma_12 * (A * a_12u_2 / 420 + I_3 * a_12t_2 / 30)
+    me[:, 4, 2] =  gamma_13 * (A * a_13u_2 / 420 + I_2 * a_13t_2 / 30)
+    me[:, 10, 8] = -gamma_13 * (A * a_13u_2 / 420 + I_2 * a_13t_2 / 30)
+    me[:, 7, 1] =  gamma_12 * (A * a_12u_3 / 420 - I_3 * a_12t_1 / 30)
+    me[:, 8, 2] =  gamma_13 * (A * a_13u_3 / 420 - I_2 * a_13t_1 / 30)
+    me[:, 11, 1] =  gamma_12 * (A * a_12u_4 / 420 + I_3 * a_12t_2 / 30)
+    me[:, 7, 5] = -gamma_12 * (A * a_12u_4 / 420 + I_3 * a_12t_2 / 30)
+    me[:, 10, 2] =  gamma_13 * (A * a_13u_4 / 420 + I_2 * a_13t_2 / 30)
+    me[:, 8, 4] = -gamma_13 * (A * a_13u_4 / 420 + I_2 * a_13t_2 / 30)
+    me[:, 11, 5] =  gamma_12 * (A * a_12u_6 / 420 + I_3 * a_12t_4 / 30)
+    me[:, 10, 4] =  gamma_13 * (A * a_13u_6 / 420 + I_2 * a_13t_4 / 30)
+
+    Me = _symmetrize(me) * decoupling
+
+    return _congruence(principal_axis, Ke), _congruence(principal_axis, Me)
@@ -2,13 +2,17 @@
 
 from pulse.model.model import Model
 from pulse.processing.assembly_structural import AssemblyStructural
+from pulse.processing.eigen_solvers import SpectrumSlicingEigenSolver, SymmetricEigenSolver, get_real_symmetric_matrix
+from pulse.processing.linear_solvers import get_linear_solver
+from pulse.processing.sparse_pattern import FixedSparsityPattern
+from pulse.processing.sweep_executor import SweepExecutor, SweepSystem
 from pulse.interface.user_input.project.print_message import PrintMessageInput
 
 import logging
 import numpy as np
 
 from scipy.sparse import triu
-from scipy.sparse.linalg import eigs, spsolve
+from scipy.sparse.linalg import eigs
 
 
 window_title_1 = "Error"
@@ -64,6 +68,11 @@ class StructuralSolver:
         self.dict_reactions_at_springs = None
         self.dict_reactions_at_dampers = None
 
+        self.eigen_solver = None
+        self.sweep_executor = SweepExecutor(mode = self.model.sweep_execution,
+                                            number_of_workers = self.model.number_of_workers,
+                                            linear_solver = self.model.linear_solver)
+
     def update_global_matrices(self):
         self.K, self.M, self.Kr, self.Mr = self.assembly.get_global_matrices()
 
@@ -134,55 +143,30 @@ class StructuralSolver:
         F_eq = np.zeros((rows,cols), dtype=complex)
         
         if np.sum(self.array_prescribed_values):
-            
-            Kr_add_lump = complex(0)
-            Mr_add_lump = complex(0)
-            Cr_add_lump = complex(0)
 
-            lumped_masses = False
-            lumped_stiffness = False
-            lumped_dampings = False
+            prescribed_values = self.array_prescribed_values[:, :cols]
+            omega = 2*np.pi*np.array(_frequencies, dtype=float)
 
-            for (_property, *args) in self.model.properties.nodal_properties.items():
-                
-                if _property == "lumped_masses":
-                    lumped_masses = True
-                    continue
+            # the frequency independent products are evaluated for all frequencies at once
+            Kr_add = (self.Kr @ prescribed_values)[unprescribed_indexes, :]
+            Mr_add = ((self.Mr + self.Mr_exp_joint) @ prescribed_values)[unprescribed_indexes, :]
 
-                if _property == "lumped_stiffness":
-                    lumped_stiffness = True
-                    continue
+            Kr_add_lump = np.zeros((rows, cols), dtype=complex)
+            Mr_add_lump = np.zeros((rows, cols), dtype=complex)
+            Cr_add_lump = np.zeros((rows, cols), dtype=complex)
 
-                if _property == "lumped_dampings":
-                    lumped_dampings = True
-            
-            Kr = (self.Kr.toarray())[unprescribed_indexes, :]
-            _Mr = (self.Mr.toarray())[unprescribed_indexes, :] + (self.Mr_exp_joint.toarray())[unprescribed_indexes, :]
-            
-            for i, freq in enumerate(_frequencies):
-                
-                _Kr = Kr + (self.Kr_exp_joint[i].toarray())[unprescribed_indexes, :]
-                Kr_add = np.sum(_Kr*self.array_prescribed_values[:,i], axis=1)
-                Mr_add = np.sum(_Mr*self.array_prescribed_values[:,i], axis=1)
-                                
-                if lumped_stiffness:
-                    Kr_lump_i = (self.Kr_lump[i].toarray())[unprescribed_indexes, :]
-                    Kr_add_lump = np.sum(Kr_lump_i*self.array_prescribed_values[:,i], axis=1)
-
-                if lumped_masses:
-                    Mr_lump_i = (self.Mr_lump[i].toarray())[unprescribed_indexes, :]
-                    Mr_add_lump = np.sum(Mr_lump_i*self.array_prescribed_values[:,i], axis=1)
-
-                if lumped_dampings:
-                    Cr_lump_i = (self.Cr_lump[i].toarray())[unprescribed_indexes, :]
-                    Cr_add_lump = np.sum(Cr_lump_i*self.array_prescribed_values[:,i], axis=1)
-
-                omega = 2*np.pi*freq
-                F_Kadd = Kr_add + Kr_add_lump
-                F_Madd = (-(omega**2))*(Mr_add + Mr_add_lump) 
-                F_Cadd = 1j*((beta_h + omega*beta_v)*Kr_add + (alpha_h + omega*alpha_v)*Mr_add)
-                F_Cadd_lump = 1j*omega*Cr_add_lump
-                F_eq[:, i] = F_Kadd + F_Madd + F_Cadd + F_Cadd_lump
+            for i in range(cols):
+                values = prescribed_values[:, i]
+                Kr_add[:, i] += (self.Kr_exp_joint[i] @ values)[unprescribed_indexes]
+                Kr_add_lump[:, i] = (self.Kr_lump[i] @ values)[unprescribed_indexes]
+                Mr_add_lump[:, i] = (self.Mr_lump[i] @ values)[unprescribed_indexes]
+                Cr_add_lump[:, i] = (self.Cr_lump[i] @ values)[unprescribed_indexes]
+
+            F_Kadd = Kr_add + Kr_add_lump
+            F_Madd = (-(omega**2))*(Mr_add + Mr_add_lump) 
+            F_Cadd = 1j*((beta_h + omega*beta_v)*Kr_add + (alpha_h + omega*alpha_v)*Mr_add)
+            F_Cadd_lump = 1j*omega*Cr_add_lump
+            F_eq = F_Kadd + F_Madd + F_Cadd + F_Cadd_lump
 
         F_combined = F - F_eq
 
@@ -212,6 +196,24 @@ class StructuralSolver:
         sigma : float, optional
             Find eigenvalues near sigma in (rad/s)^2 using shift-invert mode. 
 
+        eigen_solver : str, ['eigsh' | 'lobpcg' | 'eigs'], optional
+            Eigen solver:
+                'eigsh' : symmetric shift-invert Lanczos solver.
+                'lobpcg' : LOBPCG solver for the lowest modes of very large models.
+                'eigs' : general shift-invert Arnoldi solver.
+            The 'eigs' solver is always used if the matrices are not real symmetric.
+            Default is 'eigsh'.
+
+        frequency_window : tuple of floats, optional
+            Frequency range (f_min, f_max) in Hz. If defined, all modes inside the window are evaluated and 
+            the number of modes is used just as the initial guess.
+            Default is None.
+
+        number_of_slices : int, optional
+            Number of spectrum slices of the frequency window. If greater than one, the slices are solved by the 
+            workers of the sweep execution mode and the modes of all slices are merged.
+            Default is 1.
+
         harmonic_analysis : boll, optional
             True when the modal analysis is used to perform mode superposition. False otherwise.
             Default is False.
@@ -225,16 +227,19 @@ class StructuralSolver:
             Modal shapes
         """
 
-        K = kwargs.get("K", list())
-        M = kwargs.get("M", list())
+        K = kwargs.get("K", None)
+        M = kwargs.get("M", None)
         modes = kwargs.get("modes", 40)
         which = kwargs.get("which", "LM")
         sigma_factor = kwargs.get("sigma_factor", 1e-2)
+        eigen_solver = kwargs.get("eigen_solver", "eigsh")
+        frequency_window = kwargs.get("frequency_window", None)
+        number_of_slices = kwargs.get("number_of_slices", 1)
         harmonic_analysis = kwargs.get("harmonic_analysis", False)
 
         self.warning_modal_prescribed_dofs = ""
 
-        if K == list() and M == list():
+        if K is None and M is None:
 
             if self.model.preprocessor.stress_stiffening_enabled:
                 static_solution = self.static_analysis()
@@ -248,7 +253,27 @@ class StructuralSolver:
             Kadd_lump = K
             Madd_lump = M
 
-        eigen_values, eigen_vectors = eigs(Kadd_lump, M=Madd_lump, k=modes, which=which, sigma=sigma_factor)
+        K_sym = get_real_symmetric_matrix(Kadd_lump)
+        M_sym = get_real_symmetric_matrix(Madd_lump)
+
+        if eigen_solver == "eigs" or K_sym is None or M_sym is None:
+            eigen_values, eigen_vectors = eigs(Kadd_lump, M=Madd_lump, k=modes, which=which, sigma=sigma_factor)
+
+        else:
+
+            if self.eigen_solver is None or self.eigen_solver.method != eigen_solver:
+                self.eigen_solver = SymmetricEigenSolver(method=eigen_solver)
+
+            if frequency_window is None:
+                eigen_values, eigen_vectors = self.eigen_solver.solve(K_sym, M_sym, modes, sigma_factor)
+            elif number_of_slices > 1:
+                slicing_solver = SpectrumSlicingEigenSolver(mode = self.model.sweep_execution,
+                                                            number_of_workers = self.model.number_of_workers,
+                                                            number_of_slices = number_of_slices,
+                                                            modes_per_slice = modes)
+                eigen_values, eigen_vectors = slicing_solver.solve(K_sym, M_sym, *frequency_window)
+            else:
+                eigen_values, eigen_vectors = self.eigen_solver.solve_in_window(K_sym, M_sym, *frequency_window, modes=modes)
 
         positive_real = np.absolute(np.real(eigen_values))
         natural_frequencies = np.sqrt(positive_real) / (2 * np.pi)
@@ -277,6 +302,106 @@ class StructuralSolver:
         return natural_frequencies, modal_shapes
 
 
+    def get_residual_flexibility_response(self, K, F, modal_shape, F_modal, omega_n):
+        """
+        This method evaluates the static response of the modes that were truncated from the modal basis, i.e., 
+        the static solution minus its projection onto the retained modes.
+
+        Parameters
+        ----------
+        K : sparse matrix
+            Stiffness matrix.
+
+        F : array
+            Loads. Each column corresponds to a frequency of analysis.
+
+        modal_shape : array
+            Mass normalized modal shapes.
+
+        F_modal : array
+            Modal loads.
+
+        omega_n : array
+            Natural angular frequencies.
+
+        Returns
+        ----------
+        array
+            Residual response. None if the stiffness matrix is singular.
+        """
+
+        if np.any(omega_n < 1e-3*np.max(omega_n)):
+            print("Warning: the residual flexibility has been ignored due to the rigid body modes of the model.")
+            return None
+
+        linear_solver = get_linear_solver(self.model.linear_solver)
+        static_solution = linear_solver.solve(K, F)
+        linear_solver.release()
+
+        return static_solution - modal_shape @ (F_modal / (omega_n**2).reshape(-1, 1))
+
+
+    def get_sweep_system(self, F):
+        """
+        This method returns the linear systems of the harmonic analysis in a fixed sparsity pattern. The stiffness 
+        and mass matrices are stored once with their frequency coefficients, while the expansion joints and lumped 
+        elements are stored as frequency dependent data.
+
+        Parameters
+        ----------
+        F : array
+            Combined loads. Each column corresponds to a frequency of analysis.
+
+        Returns
+        ----------
+        SweepSystem object
+            Linear systems of the frequency sweep.
+        """
+
+        alpha_v, beta_v, alpha_h, beta_h = self.model.global_damping
+        omega = 2*np.pi*np.array(self.frequencies, dtype=float)
+
+        stiffness_coefficients = 1 + 1j*(beta_h + omega*beta_v)
+        mass_coefficients = -(omega**2) + 1j*(alpha_h + omega*alpha_v)
+
+        K = self.K.tocoo()
+        M = (self.M + self.M_exp_joint).tocoo()
+
+        variable = list()
+        for i in range(len(omega)):
+            A_i = ( stiffness_coefficients[i]*self.K_exp_joint[i] + self.K_lump[i]
+                    - (omega[i]**2)*self.M_lump[i] + 1j*omega[i]*self.C_lump[i] )
+            variable.append(A_i.tocoo())
+
+        rows = np.concatenate([K.row, M.row] + [A_i.row for A_i in variable])
+        cols = np.concatenate([K.col, M.col] + [A_i.col for A_i in variable])
+
+        size = self.K.shape[0]
+        pattern = FixedSparsityPattern(rows, cols, np.arange(size), np.arange(size), size)
+
+        entries = np.zeros((2, len(rows)), dtype=complex)
+        entries[0, :K.nnz] = K.data
+        entries[1, K.nnz : K.nnz + M.nnz] = M.data
+        constant_data = pattern.scatter(entries)
+
+        # the frequency dependent entries are summed into the positions of the pattern
+        offset = K.nnz + M.nnz
+        variable_positions, inverse = np.unique(pattern.positions[offset:], return_inverse=True)
+        steps = np.concatenate([np.full(A_i.nnz, i) for i, A_i in enumerate(variable)] + [np.zeros(0, dtype=int)])
+        variable_data = np.zeros((len(omega), len(variable_positions)), dtype=complex)
+        if len(steps):
+            np.add.at(variable_data, (steps, inverse), np.concatenate([A_i.data for A_i in variable]))
+
+        return SweepSystem( pattern.indices,
+                            pattern.indptr,
+                            pattern.shape,
+                            F,
+                            constant_data = constant_data,
+                            coefficients = np.array([stiffness_coefficients, mass_coefficients]),
+                            variable_data = variable_data,
+                            variable_positions = variable_positions )
+
+
     def direct_method(self):
         """
         This method evaluates the harmonic analysis through direct method. It is suitable for Viscous Proportional and Hysteretic Proportional damping models.
@@ -299,131 +424,123 @@ class StructuralSolver:
             self.model.preprocessor.update_nodal_solution_info(np.real(static_solution))
             self.update_global_matrices()
 
-        rows = self.K.shape[0]
-        cols = len(self.frequencies)
-
         F = self.get_combined_loads()
-        solution = np.zeros((rows, cols), dtype=complex)
-        
+
         #TODO: remember to remove these lines
         # np.savetxt("loads.csv", F, delimiter=",", fmt="%.12e")
         # np.savetxt("frequencies.dat", self.frequencies)
 
-        for i, freq in enumerate(self.frequencies):
+        solution = self.sweep_executor.solve(   self.get_sweep_system(F),
+                                                frequencies = self.frequencies,
+                                                stop_processing = self.stop_processing   )
 
-            logging.info(f"Solution step {i+1} and frequency {freq : .3f} Hz [{i+1}/{len(self.frequencies)}]")
+        self.sweep_executor.release()
 
-            omega = 2*np.pi*freq
-
-            # F_K = (self.K + self.K_lump[i])
-            # F_M =  (-(omega**2))*(self.M + self.M_lump[i])
-            # F_C = 1j*(( beta_h + omega*beta_v )*self.K + ( alpha_h + omega*alpha_v )*self.M)
-
-            F_K = (self.K + self.K_exp_joint[i] + self.K_lump[i])
-            F_M =  (-(omega**2))*(self.M + self.M_exp_joint + self.M_lump[i])
-            F_C = 1j*(( beta_h + omega*beta_v )*(self.K + self.K_exp_joint[i]) + ( alpha_h + omega*alpha_v )*(self.M + self.M_exp_joint))
-
-            F_Clump = 1j*omega*self.C_lump[i]
-            
-            A = F_K + F_M + F_C + F_Clump
-            solution[:, i] = spsolve(A, F[:, i])
-
-            if self.stop_processing():
-                return None
+        if solution is None:
+            return None
 
         self.solution = self._reinsert_prescribed_dofs(solution)
 
         return self.solution
 
 
-    def mode_superposition(self, modes, fastest=True):
+    def mode_superposition(self, modes, fastest=True, **kwargs):
         """
         This method evaluates the harmonic analysis through mode superposition method. It is suitable for Viscous Proportional and Hysteretic Proportional damping models.
+        The loads are projected onto the modal basis just once and the modal receptances are applied by broadcasting, 
+        so the solution is written in frequency chunks with a memory footprint proportional to the chunk size.
 
         Parameters
         ----------
-        global_damping : list of floats.
-            Damping coefficients alpha viscous, beta viscous, alpha histeretic, and beta histeretic.
-
-        F_loaded : ,optional.
-            
-            Default None.
+        modes : int
+            Number of modes of the modal basis.
 
         fastest : boll, optional.
-            True if 3D matrix solution procedure must be used. False otherwise.
+            True if the frequencies must be evaluated in chunks. False if each frequency must be evaluated at once.
             Default True.
 
+        chunk_size : int, optional
+            Number of frequencies of each chunk. If None, the chunk size is limited by the size of the solution block.
+            Default is None.
+
+        residual_flexibility : bool, optional
+            True if the static correction of the truncated modes must be added to the solution. It demands one 
+            factorization of the stiffness matrix, therefore it is skipped if there are rigid body modes.
+            Default is False.
+
         Returns
         ----------
         array
             Solution. Each column corresponds to a frequency of analysis. Each row corresponds to a degree of freedom.
         """
+        chunk_size = kwargs.get("chunk_size", None)
+        residual_flexibility = kwargs.get("residual_flexibility", False)
+
         global_damping = self.model.global_damping
         alpha_v, beta_v, alpha_h, beta_h = global_damping
 
         self.warning_mode_sup_prescribed_dofs = ""
 
         if np.sum(self.prescribed_values) > 0:
-            solution = self.direct_method(global_damping)
+            solution = self.direct_method()
             self.warning_mode_sup_prescribed_dofs = "The Harmonic Analysis of prescribed DOF's problems "
             self.warning_mode_sup_prescribed_dofs += "had been solved through the Direct Method."
             return solution
 
         else:
-            F = self.assembly.get_global_loads(loads_matrix3D=fastest)
+            F = self.assembly.get_global_loads()
             if self.model.preprocessor.stress_stiffening_enabled:
                 static_solution = self.static_analysis()
                 self.model.preprocessor.update_nodal_solution_info(np.real(static_solution))
                 self.update_global_matrices()
             
-            # Kadd_lump = self.K + self.K_lump[0]
-            # Madd_lump = self.M + self.M_lump[0]
             Kadd_lump = self.K + self.K_exp_joint[0] + self.K_lump[0]
             Madd_lump = self.M + self.M_exp_joint + self.M_lump[0]
 
         if not self.assembly.no_table:
             return
 
-        #TODO: in the future version implement lets F_loaded operational
-
         natural_frequencies, modal_shape = self.modal_analysis(K=Kadd_lump, M=Madd_lump, modes=modes, harmonic_analysis=True)
         rows = Kadd_lump.shape[0]
         cols = len(self.frequencies)
 
-        if fastest:    
-        
-            number_modes = len(natural_frequencies)
-            omega = 2 * np.pi * self.frequencies.reshape(cols,1,1)
-            omega_n = 2 * np.pi * natural_frequencies
-            F_kg = (omega_n**2)
-            F_mg =  -(omega**2)
-            F_cg = 1j*((beta_h + beta_v*omega)*(omega_n**2) + (alpha_h + omega*alpha_v)) 
-            diag = np.divide(1, (F_kg + F_mg + F_cg))*np.eye(number_modes)
-            F_aux = modal_shape.T @ F
-            solution = modal_shape @ (diag @ F_aux)
-            solution = solution.reshape(cols, rows).T 
+        omega_n = 2*np.pi*natural_frequencies
+        F_kg = (omega_n**2).reshape(-1, 1)
 
-            if self.stop_processing():
-                return None
-        
+        # modal loads: projected once for all frequencies
+        F_modal = modal_shape.T @ F
+
+        if residual_flexibility:
+            F_residual = self.get_residual_flexibility_response(Kadd_lump, F, modal_shape, F_modal, omega_n)
         else:
-        
-            solution = np.zeros((rows, cols), dtype=complex)
-            F_aux = modal_shape.T @ F
-            omega_n = 2*np.pi*natural_frequencies
-            F_kg = (omega_n**2)
+            F_residual = None
 
-            for i, freq in enumerate(self.frequencies):
+        if not fastest:
+            chunk_size = 1
+        elif chunk_size is None:
+            # limits each chunk of the modal and physical responses to about 32 MB
+            chunk_size = max(1, int(2e6 / max(rows, len(omega_n), 1)))
 
-                omega = 2*np.pi*freq
-                F_mg =  - (omega**2)
-                F_cg = 1j*((beta_h + beta_v*omega)*(omega_n**2) + (alpha_h + omega*alpha_v)) 
-                data = np.divide(1, (F_kg + F_mg + F_cg))
-                diag = np.diag(data)
-                solution[:,i] = modal_shape @ (diag @ F_aux[:,i])
+        solution = np.zeros((rows, cols), dtype=complex)
 
-                if self.stop_processing():
-                    return None
+        for start in range(0, cols, chunk_size):
+
+            stop = min(start + chunk_size, cols)
+            omega = 2*np.pi*self.frequencies[start:stop]
+
+            F_mg = -(omega**2)
+            F_cg = 1j*((beta_h + beta_v*omega)*F_kg + (alpha_h + omega*alpha_v))
+            receptance = 1 / (F_kg + F_mg + F_cg)
+
+            solution[:, start:stop] = modal_shape @ (receptance * F_modal[:, start:stop])
+
+            if F_residual is not None:
+                solution[:, start:stop] += F_residual[:, start:stop]
+
+            logging.info(f"Mode superposition up to frequency {self.frequencies[stop-1] : .3f} Hz [{stop}/{cols}]")
+
+            if self.stop_processing():
+                return None
 
         self.solution = self._reinsert_prescribed_dofs(solution)
 
@@ -466,7 +583,10 @@ class StructuralSolver:
         F_Clump = 1j*omega*self.C_lump[0]
         A = F_K + F_M + F_C + F_Clump
 
-        solution[:, 0] = spsolve(A, F[:, 0])
+        linear_solver = get_linear_solver(self.model.linear_solver)
+        solution[:, 0] = linear_solver.solve(A, F[:, 0])
+        linear_solver.release()
+
         self.solution = self._reinsert_prescribed_dofs(solution)
 
         return self.solution
@@ -491,39 +611,33 @@ class StructuralSolver:
 
         if self.solution is not None:    
 
-            if self.Kr == [] or self.Mr == []:
+            if len(self.prescribed_indexes) == 0:
                 return None
 
             else:
 
                 if static_analysis:
-                    rows = 1
                     _frequencies = np.array([0.])
                 else:
-                    rows = len(self.frequencies)
                     _frequencies = self.frequencies
 
-                cols = len(self.prescribed_indexes)
-                _reactions = np.zeros((rows, cols), dtype=complex)
+                U = self.solution
+                omega = 2*np.pi*np.array(_frequencies, dtype=float).reshape(-1, 1)
 
-                Ut = self.solution.T
-                Kr = self.Kr.toarray()
-                Mr = self.Mr.toarray() + self.Mr_exp_joint.toarray()
-                Ut_Mr = Ut @ Mr
+                # only the columns of the prescribed dofs are evaluated
+                Ut_Kr = (self.Kr.T @ U).T
+                Ut_Mr = ((self.Mr + self.Mr_exp_joint).T @ U).T
 
                 n_freq = len(_frequencies)
-                for j, freq in enumerate(_frequencies):
-
+                for j in range(n_freq):
                     logging.info(f"Evaluating the structural reactions for constrained dofs [{j+1}/{n_freq}]")
+                    Ut_Kr[j, :] += self.Kr_exp_joint[j].T @ U[:, j]
 
-                    omega = 2*np.pi*freq
-                    Ut_Kr = Ut[j,:] @ (Kr + self.Kr_exp_joint[j].toarray())
-
-                    F_K = Ut_Kr
-                    F_M = -(omega**2) * Ut_Mr[j, :]
-                    F_C = 1j*((beta_h + omega*beta_v) * Ut_Kr + (alpha_h + omega*alpha_v) * Ut_Mr[j, :])
+                F_K = Ut_Kr
+                F_M = -(omega**2) * Ut_Mr
+                F_C = 1j*((beta_h + omega*beta_v) * Ut_Kr + (alpha_h + omega*alpha_v) * Ut_Mr)
 
-                    _reactions[j, :] = F_K + F_M + F_C
+                _reactions = F_K + F_M + F_C
 
                 load_reactions = dict()
                 for i, prescribed_index in enumerate(self.prescribed_indexes):
@@ -0,0 +1,448 @@
+
+from pulse.processing.linear_solvers import get_linear_solver, set_pardiso_number_of_threads
+
+import os
+import logging
+import threading
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from scipy.sparse import csr_matrix
+
+
+SWEEP_EXECUTION_MODES = ["serial", "thread", "process"]
+
+# state of the process pool workers
+_worker_state = dict()
+
+
+class SweepSystem:
+    """ This class stores the linear systems of a frequency sweep in a fixed CSR sparsity pattern. The data
+    of the matrix related to the i-th frequency of analysis is evaluated as
+
+        sum_k coefficients[k, i] * constant_data[k, :]
+
+    plus variable_data[i, :] added at the variable_positions of the data array.
+
+    Parameters
+    ----------
+    indices : array
+        CSR column indices of the pattern.
+
+    indptr : array
+        CSR index pointer of the pattern.
+
+    shape : tuple
+        Shape of the matrices.
+
+    rhs : array
+        Right-hand sides. Each column corresponds to a frequency of analysis. A third axis can be used to solve
+        several load cases with each factorization.
+
+    constant_data : array, optional
+        CSR data of the frequency independent matrices. Each row corresponds to a matrix.
+
+    coefficients : array, optional
+        Frequency coefficients of the constant matrices. Each column corresponds to a frequency of analysis.
+
+    variable_data : array, optional
+        Frequency dependent data. Each row corresponds to a frequency of analysis.
+
+    variable_positions : array, optional
+        Positions of the variable data in the CSR data array. If None, the variable data covers the whole
+        data array.
+    """
+    def __init__(self, indices, indptr, shape, rhs, **kwargs):
+
+        self.indices = indices
+        self.indptr = indptr
+        self.shape = tuple(shape)
+        self.rhs = rhs
+
+        nnz = len(indices)
+        steps = rhs.shape[1]
+
+        self.constant_data = kwargs.get("constant_data", np.zeros((0, nnz), dtype=complex))
+        self.coefficients = kwargs.get("coefficients", np.zeros((0, steps), dtype=complex))
+        self.variable_data = kwargs.get("variable_data", np.zeros((steps, 0), dtype=complex))
+        self.variable_positions = kwargs.get("variable_positions", None)
+
+    @property
+    def number_of_steps(self):
+        return self.rhs.shape[1]
+
+    @property
+    def solution_shape(self):
+        return (self.shape[0], *self.rhs.shape[1:])
+
+    def data(self, indexes):
+        """
+        This method returns the CSR data of the matrices related to a list of frequencies of analysis.
+
+        Parameters
+        ----------
+        indexes : array or slice
+            Indexes of the frequencies of analysis. If a slice is given and there are no constant matrices,
+            a view of the variable data is returned.
+
+        Returns
+        ----------
+        array
+            CSR data. Each row corresponds to a frequency of analysis.
+        """
+
+        if not isinstance(indexes, slice):
+            indexes = np.atleast_1d(indexes)
+
+        if self.variable_positions is None and self.variable_data.shape[1]:
+            data = self.variable_data[indexes]
+            if len(self.constant_data):
+                data = data.astype(complex)
+        else:
+            steps = self.rhs[:, indexes].shape[1]
+            data = np.zeros((steps, len(self.indices)), dtype=complex)
+            if self.variable_data.shape[1]:
+                data[:, self.variable_positions] += self.variable_data[indexes]
+
+        if len(self.constant_data):
+            data += self.coefficients[:, indexes].T @ self.constant_data
+
+        return data
+
+    def matrix(self, index):
+        """
+        This method returns the sparse matrix related to a frequency of analysis.
+        """
+        data = np.array(self.data(index)[0], dtype=complex)
+        return csr_matrix((data, self.indices, self.indptr), shape=self.shape)
+
+    def arrays(self):
+        """
+        This method returns the arrays that must be transferred to the process pool workers.
+        """
+        arrays = {  "indices" : self.indices,
+                    "indptr" : self.indptr,
+                    "rhs" : self.rhs,
+                    "constant_data" : self.constant_data,
+                    "coefficients" : self.coefficients,
+                    "variable_data" : self.variable_data  }
+
+        if self.variable_positions is not None:
+            arrays["variable_positions"] = self.variable_positions
+
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, shape):
+        return cls( arrays["indices"],
+                    arrays["indptr"],
+                    shape,
+                    arrays["rhs"],
+                    constant_data = arrays["constant_data"],
+                    coefficients = arrays["coefficients"],
+                    variable_data = arrays["variable_data"],
+                    variable_positions = arrays.get("variable_positions", None) )
+
+
+class SweepExecutor:
+    """ This class solves the frequency steps of a sweep system. The steps can be solved serially or split in
+    contiguous chunks across a pool of threads or processes. In the process mode, the matrix data, the
+    right-hand sides and the solution are transferred through shared memory blocks. The solution columns
+    are written in the order of the frequency vector regardless of the order in which the chunks finish.
+
+    Parameters
+    ----------
+    mode : str, ['serial' | 'thread' | 'process'], optional
+        Execution mode.
+        Default is 'serial'.
+
+    number_of_workers : int, optional
+        Number of threads or processes of the pool. If None, the number of CPUs is used.
+        Default is None.
+
+    linear_solver : str, optional
+        Name of the sparse linear solver backend used by each worker.
+        Default is 'auto'.
+
+    chunk_size : int, optional
+        Number of frequency steps solved by a worker at once. If None, each worker receives four chunks.
+        Default is None.
+    """
+    def __init__(self, **kwargs):
+
+        self.mode = kwargs.get("mode", "serial")
+        self.number_of_workers = kwargs.get("number_of_workers", None)
+        self.linear_solver = kwargs.get("linear_solver", "auto")
+        self.chunk_size = kwargs.get("chunk_size", None)
+
+        if self.mode not in SWEEP_EXECUTION_MODES:
+            raise ValueError(f"Invalid sweep execution mode '{self.mode}'. Available options: {SWEEP_EXECUTION_MODES}")
+
+        if self.number_of_workers is None:
+            self.number_of_workers = os.cpu_count() or 1
+
+        # the serial solver is kept to reuse the analyzed pattern in subsequent sweeps
+        self.solver = None
+
+    def release(self):
+        if self.solver is not None:
+            self.solver.release()
+            self.solver = None
+
+    def get_chunks(self, number_of_steps):
+        """
+        This method splits the frequency steps in contiguous chunks.
+        """
+        if self.chunk_size is None:
+            chunk_size = int(np.ceil(number_of_steps / (4 * self.number_of_workers)))
+        else:
+            chunk_size = self.chunk_size
+        chunk_size = max(chunk_size, 1)
+        return [np.arange(start, min(start + chunk_size, number_of_steps)) for start in range(0, number_of_steps, chunk_size)]
+
+    def solve(self, system: SweepSystem, **kwargs):
+        """
+        This method solves all frequency steps of the sweep system.
+
+        Parameters
+        ----------
+        system : SweepSystem object
+            Linear systems of the frequency sweep.
+
+        frequencies : array, optional
+            Frequencies of analysis used in the progress messages.
+
+        stop_processing : callable, optional
+            Function that returns True if the user requested the interruption of the solution.
+
+        log_progress : bool, optional
+            True if the progress of each frequency step must be logged.
+            Default is True.
+
+        Returns
+        ----------
+        array
+            Solution. Each column corresponds to a frequency of analysis. None if the solution was interrupted.
+        """
+
+        frequencies = kwargs.get("frequencies", None)
+        stop_processing = kwargs.get("stop_processing", None)
+        log_progress = kwargs.get("log_progress", True)
+
+        if frequencies is None:
+            frequencies = np.arange(system.number_of_steps)
+
+        if stop_processing is None:
+            stop_processing = lambda: False
+
+        progress = _ProgressLogger(frequencies, log_progress)
+
+        if self.mode == "serial" or self.number_of_workers == 1 or system.number_of_steps == 1:
+            return self._solve_serial(system, progress, stop_processing)
+        else:
+            return self._solve_parallel(system, progress, stop_processing)
+
+    def _solve_serial(self, system: SweepSystem, progress, stop_processing):
+
+        if self.solver is None:
+            self.solver = get_linear_solver(self.linear_solver)
+
+        solution = np.zeros(system.solution_shape, dtype=complex)
+
+        for i in range(system.number_of_steps):
+
+            progress.step(i)
+            solution[:, i] = self.solver.solve(system.matrix(i), system.rhs[:, i])
+
+            if stop_processing():
+                self.release()
+                return None
+
+        return solution
+
+    def _solve_parallel(self, system: SweepSystem, progress, stop_processing):
+
+        chunks = self.get_chunks(system.number_of_steps)
+        workers = min(self.number_of_workers, len(chunks))
+
+        if self.mode == "thread":
+            solution = np.zeros(system.solution_shape, dtype=complex)
+            stop_flag = np.zeros(1, dtype=np.int8)
+            state = _ThreadState(system, solution, stop_flag, self.linear_solver)
+            pool = ThreadPoolExecutor(max_workers=workers)
+            try:
+                futures = {pool.submit(_solve_steps, state, chunk) for chunk in chunks}
+                return self._wait(pool, futures, solution, stop_flag, progress, stop_processing)
+            finally:
+                for solver in state.solvers:
+                    solver.release()
+
+        shared_arrays = _SharedArrays()
+        try:
+
+            for name, array in system.arrays().items():
+                shared_arrays.add(name, array)
+
+            solution = shared_arrays.add("solution", np.zeros(system.solution_shape, dtype=complex))
+            stop_flag = shared_arrays.add("stop_flag", np.zeros(1, dtype=np.int8))
+
+            # the cores are shared by the workers, otherwise each multithreaded PARDISO process would take all of them
+            threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+
+            # the spawn context avoids forking the graphical interface process. The frozen application must call
+            # multiprocessing.freeze_support at startup (see pulse/launch.py) so the workers do not run it again
+            pool = ProcessPoolExecutor( max_workers = workers,
+                                        mp_context = get_context("spawn"),
+                                        initializer = _initialize_process_worker,
+                                        initargs = (shared_arrays.specs, system.shape, self.linear_solver, threads_per_worker) )
+
+            futures = {pool.submit(_solve_steps_in_process, chunk) for chunk in chunks}
+            solution = self._wait(pool, futures, solution, stop_flag, progress, stop_processing)
+
+            if solution is not None:
+                solution = np.array(solution)
+
+            return solution
+
+        finally:
+            shared_arrays.release()
+
+    def _wait(self, pool, futures, solution, stop_flag, progress, stop_processing):
+        """
+        This method waits for the chunks, logs the progress in the main thread and checks the interruption
+        requests of the user.
+        """
+        try:
+            while futures:
+
+                done, futures = wait(futures, timeout=0.5, return_when=FIRST_COMPLETED)
+
+                if not done:
+                    # keeps the main thread (and the loading window) alive
+                    progress.refresh()
+
+                for future in done:
+                    for i in future.result():
+                        progress.step(i)
+
+                if stop_processing():
+                    stop_flag[0] = 1
+                    for future in futures:
+                        future.cancel()
+                    return None
+
+            return solution
+
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+class _ProgressLogger:
+
+    def __init__(self, frequencies, log_progress):
+        self.frequencies = frequencies
+        self.log_progress = log_progress
+        self.count = 0
+        self.message = None
+
+    def step(self, index):
+        self.count += 1
+        if self.log_progress:
+            freq = self.frequencies[index]
+            self.message = f"Solution step {self.count} and frequency {freq : .3f} Hz [{self.count}/{len(self.frequencies)}]"
+            logging.info(self.message)
+
+    def refresh(self):
+        if self.message is not None:
+            logging.info(self.message)
+
+
+class _ThreadState:
+
+    def __init__(self, system, solution, stop_flag, linear_solver):
+        self.system = system
+        self.solution = solution
+        self.stop_flag = stop_flag
+        self.linear_solver = linear_solver
+        self.local = threading.local()
+        self.solvers = list()
+        self.lock = threading.Lock()
+
+    @property
+    def solver(self):
+        if not hasattr(self.local, "solver"):
+            self.local.solver = get_linear_solver(self.linear_solver)
+            with self.lock:
+                self.solvers.append(self.local.solver)
+        return self.local.solver
+
+
+class _ProcessState:
+
+    def __init__(self, system, solution, stop_flag, solver):
+        self.system = system
+        self.solution = solution
+        self.stop_flag = stop_flag
+        self.solver = solver
+
+
+class _SharedArrays:
+    """ This class copies numpy arrays into shared memory blocks.
+    """
+    def __init__(self):
+        self.blocks = list()
+        self.specs = dict()
+
+    def add(self, name, array):
+        array = np.ascontiguousarray(array)
+        block = SharedMemory(create=True, size=max(array.nbytes, 1))
+        view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+        view[...] = array
+        self.blocks.append(block)
+        self.specs[name] = (block.name, array.shape, array.dtype.str)
+        return view
+
+    def release(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks.clear()
+
+
+def _solve_steps(state, indexes):
+    """
+    This function solves a chunk of frequency steps and writes the columns of the solution.
+    """
+    solved = list()
+    for i in indexes:
+        if state.stop_flag[0]:
+            break
+        state.solution[:, i] = state.solver.solve(state.system.matrix(i), state.system.rhs[:, i])
+        solved.append(i)
+    return solved
+
+
+def _initialize_process_worker(specs, shape, linear_solver, number_of_threads):
+
+    # the limit is set before the worker solver loads the MKL runtime
+    set_pardiso_number_of_threads(number_of_threads)
+
+    arrays = dict()
+    blocks = list()
+
+    for name, (block_name, array_shape, dtype) in specs.items():
+        block = SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(array_shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+    _worker_state["blocks"] = blocks
+    _worker_state["state"] = _ProcessState( SweepSystem.from_arrays(arrays, shape),
+                                            arrays["solution"],
+                                            arrays["stop_flag"],
+                                            get_linear_solver(linear_solver) )
+
+
+def _solve_steps_in_process(indexes):
+    return _solve_steps(_worker_state["state"], indexes)
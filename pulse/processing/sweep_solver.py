@@ -0,0 +1,167 @@
+
+import numpy as np
+from scipy.sparse import csr_matrix, csc_matrix
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+from scipy.sparse.linalg import splu
+
+
+class SweepSolver:
+    """ This class solves the sequence of sparse linear systems of a frequency sweep. The systems of all
+    frequencies of analysis share the same sparsity pattern, therefore the fill-reducing ordering and the
+    permuted pattern are evaluated just once and reused by every numerical factorization. The pattern is
+    analyzed again only if a matrix with a different sparsity pattern is received.
+
+    Parameters
+    ----------
+    ordering : str, ['rcm' | 'colamd'], optional
+        Fill-reducing ordering evaluated in the analysis step:
+            'rcm' : symmetric reverse Cuthill-McKee ordering. It is well suited for the banded pipe networks.
+            'colamd' : column approximate minimum degree ordering evaluated by SuperLU.
+        Default is 'rcm'.
+    """
+    def __init__(self, **kwargs):
+
+        self.ordering = kwargs.get("ordering", "rcm")
+
+        if self.ordering not in ["rcm", "colamd"]:
+            raise ValueError(f"Invalid ordering '{self.ordering}'. Use 'rcm' or 'colamd'.")
+
+        self._reset()
+
+    def _reset(self):
+
+        self.shape = None
+        self.indptr = None
+        self.indices = None
+
+        self.row_permutation = None
+        self.col_permutation = None
+
+        self.data_map = None
+        self.permuted_indices = None
+        self.permuted_indptr = None
+
+        self.analysis_count = 0
+        self.factorization_count = 0
+
+    def _to_csr(self, A):
+
+        A = csr_matrix(A)
+        if not A.has_canonical_format:
+            A = A.copy()
+            A.sum_duplicates()
+        return A
+
+    def pattern_changed(self, A):
+        """
+        This method returns True if the sparsity pattern of the matrix differs from the analyzed one.
+        """
+        if self.indptr is None or A.shape != self.shape:
+            return True
+        if len(A.indices) != len(self.indices):
+            return True
+        return not (np.array_equal(A.indptr, self.indptr) and np.array_equal(A.indices, self.indices))
+
+    def analyze(self, A):
+        """
+        This method evaluates the fill-reducing ordering and maps the CSR data of the matrix into the
+        data of the permuted CSC matrix that is factorized.
+
+        Parameters
+        ----------
+        A : sparse matrix
+            Matrix whose sparsity pattern is shared by the systems of the sweep.
+        """
+
+        A = self._to_csr(A)
+        n = A.shape[0]
+
+        if self.ordering == "rcm":
+            perm = reverse_cuthill_mckee(A, symmetric_mode=False)
+            if len(perm) != n:
+                perm = np.arange(n)
+            self.row_permutation = perm
+            self.col_permutation = perm
+
+        else:
+            lu = splu(A.tocsc(), permc_spec="COLAMD")
+            self.row_permutation = np.arange(n)
+            self.col_permutation = np.argsort(lu.perm_c)
+
+        # the position of each CSR entry is carried as data to get the permuted positions
+        positions = csr_matrix((np.arange(1, A.nnz + 1, dtype=float), A.indices, A.indptr), shape=A.shape)
+        permuted = positions[self.row_permutation, :][:, self.col_permutation].tocsc()
+        permuted.sort_indices()
+
+        self.shape = A.shape
+        self.indptr = A.indptr.copy()
+        self.indices = A.indices.copy()
+
+        self.data_map = permuted.data.astype(np.int64) - 1
+        self.permuted_indices = permuted.indices
+        self.permuted_indptr = permuted.indptr
+
+        self.analysis_count += 1
+
+    def factorize(self, A):
+        """
+        This method evaluates the numerical factorization of the matrix reusing the analyzed ordering.
+
+        Parameters
+        ----------
+        A : sparse matrix
+            System matrix.
+
+        Returns
+        ----------
+        SuperLU object
+            Factorization of the permuted matrix.
+        """
+
+        A = self._to_csr(A)
+
+        if self.pattern_changed(A):
+            self.analyze(A)
+
+        data = A.data[self.data_map]
+        permuted = csc_matrix((data, self.permuted_indices, self.permuted_indptr), shape=self.shape)
+
+        self.factorization_count += 1
+
+        if self.ordering == "rcm":
+            return splu(permuted, permc_spec="NATURAL", options=dict(SymmetricMode=True))
+        else:
+            return splu(permuted, permc_spec="NATURAL")
+
+    def solve(self, A, b):
+        """
+        This method solves the linear system A x = b reusing the analyzed ordering.
+
+        Parameters
+        ----------
+        A : sparse matrix
+            System matrix.
+
+        b : array
+            Right-hand side. It can have one column per load case.
+
+        Returns
+        ----------
+        array
+            Solution of the linear system.
+        """
+
+        A = self._to_csr(A)
+        lu = self.factorize(A)
+
+        b = np.asarray(b)[self.row_permutation]
+
+        if np.iscomplexobj(b) and not np.iscomplexobj(A.data):
+            y = lu.solve(np.ascontiguousarray(b.real)) + 1j*lu.solve(np.ascontiguousarray(b.imag))
+        else:
+            y = lu.solve(np.asarray(b, dtype=A.dtype))
+
+        x = np.empty_like(y)
+        x[self.col_permutation] = y
+
+        return x
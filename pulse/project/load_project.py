@@ -5,6 +5,7 @@ from pulse.model.cross_section import CrossSection
 from pulse.model.properties.fluid import Fluid
 from pulse.model.properties.material import Material
 from pulse.model.perforated_plate import PerforatedPlate
+from pulse.processing.acoustic_transfer_functions import AcousticTransferFunctions
 from pulse.interface.user_input.project.print_message import PrintMessageInput
 from pulse.utils.common_utils import get_color_rgb
 
@@ -530,6 +531,12 @@ class LoadProject:
         if isinstance(analysis_setup, dict):
             self.project.model.set_frequency_setup(analysis_setup)
             self.project.model.set_global_damping(analysis_setup)
+            self.project.model.set_linear_solver_setup(analysis_setup)
+            self.project.model.set_sweep_execution_setup(analysis_setup)
+            self.project.model.set_acoustic_condensation_setup(analysis_setup)
+            self.project.model.set_reduced_order_setup(analysis_setup)
+            self.project.model.set_acoustic_load_cases_setup(analysis_setup)
+            self.project.model.set_transfer_function_setup(analysis_setup)
 
 
     def load_analysis_id(self):
@@ -632,23 +639,30 @@ class LoadProject:
         aux_nodal = dict()
         non_mapped_nodes = list()
 
+        nodal_coords = dict()
+        for key, data in self.properties.nodal_properties.items():
+            if "coords" in data.keys():
+                coords = np.array(data["coords"], dtype=float)
+                if len(coords) in [3, 6]:
+                    nodal_coords[key] = coords
+
+        # all points are mapped at once through the spatial index of the mesh
+        points = [coords.reshape(-1, 3) for coords in nodal_coords.values()]
+        if points:
+            new_node_ids = iter(self.preprocessor.get_node_ids_by_coordinates(np.concatenate(points)))
+
         for key, data in self.properties.nodal_properties.items():
 
             (property, *args) = key
 
-            if "coords" in data.keys():
-                coords = np.array(data["coords"], dtype=float)
+            if key in nodal_coords.keys():
+                coords = nodal_coords[key]
                 if len(coords) == 6:
 
                     node_id1, node_id2 = args
 
-                    coords_1 = coords[:3]
-                    coords_2 = coords[3:]
-                    new_node_id1 = self.preprocessor.get_node_id_by_coordinates(coords_1)
-                    new_node_id2 = self.preprocessor.get_node_id_by_coordinates(coords_2)
-                    sorted_indexes = np.sort([new_node_id1, new_node_id2])
-
-                    new_key = (property, sorted_indexes[0], sorted_indexes[1])
+                    new_node_id1 = next(new_node_ids)
+                    new_node_id2 = next(new_node_ids)
 
                     if new_node_id1 is None:
                         if new_node_id1 not in non_mapped_nodes:
@@ -660,10 +674,13 @@ class LoadProject:
                             non_mapped_nodes.append((node_id2, coords))
                         continue
 
-                elif len(coords) == 3:
+                    sorted_indexes = np.sort([new_node_id1, new_node_id2])
+                    new_key = (property, sorted_indexes[0], sorted_indexes[1])
+
+                else:
 
                     node_id = args
-                    new_node_id = self.preprocessor.get_node_id_by_coordinates(coords)
+                    new_node_id = next(new_node_ids)
                     new_key = (property, new_node_id)
 
                     if new_node_id is None:
@@ -843,6 +860,12 @@ class LoadProject:
                     self.project.model.frequencies = data["frequencies"]
                     self.project.acoustic_solution = data["solution"]
 
+                if key == "harmonic_acoustic_load_cases":
+                    self.project.acoustic_load_case_solutions = data
+
+                if key == "acoustic_transfer_functions":
+                    self.project.acoustic_transfer_functions = AcousticTransferFunctions(**data)
+
                 if key == "harmonic_structural":
                     str_harmonic_analysis = True
                     self.project.model.frequencies = data["frequencies"]
@@ -68,6 +68,8 @@ class Project:
     def reset_solution(self):
         self.structural_solution = None
         self.acoustic_solution = None
+        self.acoustic_load_case_solutions = dict()
+        self.acoustic_transfer_functions = None
 
         self.natural_frequencies_acoustic = list()
         self.natural_frequencies_structural = list()
@@ -82,6 +84,10 @@ class Project:
 
     def reset_analysis_setup(self):
         self.modes = 0
+        self.eigen_solver = "eigsh"
+        self.modal_frequency_window = None
+        self.modal_number_of_slices = 1
+        self.residual_flexibility = False
         self.global_damping = [0, 0, 0, 0]
         self.analysis_id = None
         self.analysis_type_label = ""
@@ -263,6 +269,10 @@ class Project:
                 self.analysis_id = self.analysis_setup["analysis_id"]
                 self.modes = self.analysis_setup.get("modes", 40)
                 self.sigma_factor = self.analysis_setup.get("sigma_factor", 1e-2)
+                self.eigen_solver = self.analysis_setup.get("eigen_solver", "eigsh")
+                self.modal_frequency_window = self.analysis_setup.get("modal_frequency_window", None)
+                self.modal_number_of_slices = self.analysis_setup.get("modal_number_of_slices", 1)
+                self.residual_flexibility = self.analysis_setup.get("residual_flexibility", False)
                 return True
         return False
 
@@ -379,6 +389,54 @@ class Project:
     def get_acoustic_solution(self):
         return self.acoustic_solution
 
+    def get_acoustic_load_case_solutions(self):
+        return self.acoustic_load_case_solutions
+
+    def update_acoustic_solution_by_superposition(self):
+        """
+        This method updates the acoustic solution by superposition of the acoustic transfer functions with the
+        current volume velocity excitations of the model. The solution is updated only for the acoustic harmonic
+        analysis and only if the transfer functions cover all excited nodes, all nodes of the model and the current
+        frequencies of analysis. The structural solution of the coupled analyses depends on the acoustic solution,
+        hence these analyses must be solved again.
+
+        Returns
+        ----------
+        bool
+            True if the acoustic solution was updated.
+        """
+
+        transfer_functions = self.acoustic_transfer_functions
+        if transfer_functions is None:
+            return False
+
+        if self.analysis_id != 3:
+            return False
+
+        # the harmonics of the current excitations are selected before checking the frequencies
+        self.model.update_frequency_selection()
+        if not transfer_functions.check_frequencies(self.model.frequencies):
+            return False
+
+        excitations = self.model.properties.get_volume_velocity_excitations()
+        if not transfer_functions.check_sources(excitations):
+            return False
+
+        if len(transfer_functions.receiver_node_ids) != len(self.model.preprocessor.nodes):
+            return False
+
+        response = transfer_functions.get_response(excitations)
+
+        indexes = [self.model.preprocessor.nodes[node_id].global_index for node_id in transfer_functions.receiver_node_ids]
+        solution = np.zeros_like(response)
+        solution[indexes, :] = response
+
+        self.acoustic_solution = solution
+        if self.acoustic_solver is not None:
+            self.acoustic_solver.solution = solution
+
+        return True
+
     def get_structural_reactions(self):
         return self.structural_reactions
 
@@ -457,18 +515,22 @@ class Project:
             # self.structural_harmonic_solution = self.structural_solver.solution
 
         elif self.analysis_id == 1: # Structural Harmonic Analysis - Mode Superposition Method
-            self.structural_solver.mode_superposition(self.modes)
+            self.structural_solver.mode_superposition(self.modes, residual_flexibility=self.residual_flexibility)
             self.structural_solution = self.structural_solver.solution
             # self.structural_harmonic_solution = self.structural_solver.solution
 
         elif self.analysis_id == 3: # Acoustic Harmonic Analysis - Direct Method
             self.acoustic_solver.direct_method()
             self.acoustic_solution = self.acoustic_solver.solution
+            self.acoustic_load_case_solutions = self.acoustic_solver.load_case_solutions
+            self.acoustic_transfer_functions = self.acoustic_solver.transfer_functions
             self.perforated_plate_data_log = self.acoustic_solver.convergence_data_log
 
         elif self.analysis_id == 5: # Coupled Harmonic Analysis - Direct Method
             self.acoustic_solver.direct_method()
             self.acoustic_solution = self.acoustic_solver.solution
+            self.acoustic_load_case_solutions = self.acoustic_solver.load_case_solutions
+            self.acoustic_transfer_functions = self.acoustic_solver.transfer_functions
             self.perforated_plate_data_log = self.acoustic_solver.convergence_data_log
 
             self.structural_solver = self.get_structural_solver()
@@ -479,20 +541,29 @@ class Project:
         elif self.analysis_id == 6: # Coupled Harmonic Analysis - Mode Superposition Method
             self.acoustic_solver.direct_method()
             self.acoustic_solution = self.acoustic_solver.solution
+            self.acoustic_load_case_solutions = self.acoustic_solver.load_case_solutions
+            self.acoustic_transfer_functions = self.acoustic_solver.transfer_functions
             self.perforated_plate_data_log = self.acoustic_solver.convergence_data_log
             self.structural_solver = self.get_structural_solver()
-            self.structural_solver.mode_superposition(self.modes)
+            self.structural_solver.mode_superposition(self.modes, residual_flexibility=self.residual_flexibility)
             self.structural_solution = self.structural_solver.solution
             # self.structural_harmonic_solution = self.structural_solver.solution
 
         elif self.analysis_id == 2: # Structural Modal Analysis
-            self.structural_solver.modal_analysis(modes = self.modes, sigma_factor = self.sigma_factor)
+            self.structural_solver.modal_analysis(  modes = self.modes, 
+                                                    sigma_factor = self.sigma_factor,
+                                                    eigen_solver = self.eigen_solver,
+                                                    frequency_window = self.modal_frequency_window,
+                                                    number_of_slices = self.modal_number_of_slices  )
             self.natural_frequencies_structural = self.structural_solver.natural_frequencies
             self.structural_solution = self.structural_solver.modal_shapes
             # self.structural_modal_solution = self.structural_solver.modal_shapes
 
         elif self.analysis_id == 4: # Acoustic Modal Analysis
-            self.acoustic_solver.modal_analysis(modes = self.modes, sigma_factor = self.sigma_factor)
+            self.acoustic_solver.modal_analysis(modes = self.modes, 
+                                                sigma_factor = self.sigma_factor,
+                                                frequency_window = self.modal_frequency_window,
+                                                number_of_slices = self.modal_number_of_slices)
             self.natural_frequencies_acoustic = self.acoustic_solver.natural_frequencies
             self.complex_natural_frequencies_acoustic = self.acoustic_solver.complex_natural_frequencies
             self.acoustic_solution = self.acoustic_solver.modal_shapes
@@ -0,0 +1,118 @@
+import pytest
+import numpy as np
+
+
+def _build_pipe_model(segments, element_size=0.01):
+    """
+    This function builds a pipe model from straight segments (start point, end point, line id, outer diameter)
+    without the geometry kernel. The segments are split into elements of the given size and the nodes shared by
+    the segments are merged.
+    """
+
+    from pulse.project.project import Project
+    from pulse.model.cross_section import CrossSection
+    from pulse.model.properties.fluid import Fluid
+    from pulse.model.properties.material import Material
+
+    project = Project()
+    preprocessor = project.model.preprocessor
+    mesh = project.model.mesh
+    mesh.element_size = element_size
+    preprocessor.reset_variables()
+
+    coordinates = list()
+    node_ids = dict()
+    connectivity = list()
+    element_lines = list()
+
+    def get_node_id(point):
+        key = tuple(np.round(point, 9))
+        if key not in node_ids:
+            node_ids[key] = len(coordinates) + 1
+            coordinates.append(point)
+        return node_ids[key]
+
+    for start, end, line_id, _ in segments:
+        start, end = np.array(start, dtype=float), np.array(end, dtype=float)
+        divisions = int(round(np.linalg.norm(end - start) / element_size))
+        points = [start + (end - start) * i / divisions for i in range(divisions + 1)]
+        for point_a, point_b in zip(points[:-1], points[1:]):
+            connectivity.append((get_node_id(point_a), get_node_id(point_b)))
+            element_lines.append(line_id)
+
+    node_indexes = np.arange(1, len(coordinates) + 1)
+    element_indexes = np.arange(1, len(connectivity) + 1)
+    map_nodes = dict(zip(node_indexes, node_indexes))
+    map_elements = dict(zip(element_indexes, element_indexes))
+
+    # the mesh coordinates are given in millimeters
+    preprocessor._create_nodes(node_indexes, 1000 * np.array(coordinates).flatten(), map_nodes)
+    preprocessor._create_structural_elements(element_indexes, np.array(connectivity).flatten(), map_nodes, map_elements)
+    preprocessor._create_acoustic_elements(element_indexes, np.array(connectivity).flatten(), map_nodes, map_elements)
+
+    for element_id, line_id in zip(element_indexes, element_lines):
+        mesh.elements_from_line[line_id].append(int(element_id))
+        mesh.line_from_element[int(element_id)] = line_id
+    mesh.lines_from_model = list(mesh.elements_from_line.keys())
+
+    preprocessor._load_neighbors()
+    mesh._process_line_nodes()
+    preprocessor._order_global_indexes()
+    preprocessor._mapping_nodes_indexes()
+    preprocessor.get_nodal_coordinates_matrix()
+    preprocessor.get_connectivity_matrix()
+    preprocessor.get_dict_nodes_to_element_indexes()
+    preprocessor.get_principal_diagonal_structure_parallelepiped()
+    preprocessor.process_all_rotation_matrices()
+
+    air = Fluid(    "air", 1.204263, 343.395034, identifier=1, isentropic_exponent=1.401985,
+                    thermal_conductivity=0.025503, specific_heat_Cp=1006.400178,
+                    dynamic_viscosity=1.8247e-5, temperature=293.15, pressure=101325,
+                    molar_mass=28.958601    )
+    steel = Material("steel", 7860, identifier=1, elasticity_modulus=210e9, poisson_ratio=0.3)
+
+    element_ids = list(preprocessor.structural_elements.keys())
+    preprocessor.set_fluid_by_element(element_ids, air)
+    preprocessor.set_material_by_element(element_ids, steel)
+
+    cross_sections = dict()
+    for _, _, line_id, outer_diameter in segments:
+        if outer_diameter not in cross_sections:
+            section_info = {    "section_type_label" : "pipe",
+                                "section_parameters" : [outer_diameter, 0.008, 0, 0, 0, 0]    }
+            cross_sections[outer_diameter] = CrossSection(pipe_section_info=section_info)
+            cross_sections[outer_diameter].update_properties()
+        preprocessor.set_cross_section_by_elements(mesh.elements_from_line[line_id], cross_sections[outer_diameter])
+
+    preprocessor.set_structural_element_type_by_element(element_ids, "pipe_1")
+    preprocessor.set_acoustic_element_type_by_element(element_ids, "undamped")
+
+    return project
+
+
+def _set_nodal_property(project, property, coords, data):
+    """
+    This function attributes a nodal property to the node placed at the coordinates.
+    """
+
+    node_id = project.model.preprocessor.get_node_id_by_coordinates(np.array(coords, dtype=float))
+
+    data = dict(data, coords=list(coords))
+    if "values" in data:
+        values = data.pop("values")
+        data["real_values"] = [None if value is None else np.real(value) for value in values]
+        data["imag_values"] = [None if value is None else np.imag(value) for value in values]
+
+    project.model.properties._set_nodal_property(property, data, node_id)
+
+    return node_id
+
+
+@pytest.fixture
+def build_pipe_model():
+    return _build_pipe_model
+
+
+@pytest.fixture
+def set_nodal_property():
+    return _set_nodal_property
@@ -0,0 +1,107 @@
+import pytest
+import numpy as np
+
+
+BRANCHED_SEGMENTS = [   ((0, 0, 0), (1, 0, 0), 1, 0.1),
+                        ((1, 0, 0), (1.5, 0, 0), 2, 0.1),
+                        ((1.5, 0, 0), (2, 0, 0), 3, 0.2),
+                        ((1, 0, 0), (1, 0.5, 0), 4, 0.05)   ]
+
+# the same model with the first, third and fourth lines pointing towards the branch
+REVERSED_SEGMENTS = [   ((1, 0, 0), (0, 0, 0), 1, 0.1),
+                        ((1, 0, 0), (1.5, 0, 0), 2, 0.1),
+                        ((2, 0, 0), (1.5, 0, 0), 3, 0.2),
+                        ((1, 0.5, 0), (1, 0, 0), 4, 0.05)   ]
+
+# the first two lines start at the same node, hence the chain from the inlet to the specific impedance runs
+# against the orientation of its first elements
+FLIPPED_SEGMENTS = [    ((1, 0, 0), (0, 0, 0), 1, 0.1),
+                        ((1, 0, 0), (1.5, 0, 0), 2, 0.1),
+                        ((1.5, 0, 0), (2, 0, 0), 3, 0.2),
+                        ((1.5, 0, 0), (1.5, 0.5, 0), 4, 0.05)   ]
+
+# segments and radiation end of each model
+LAYOUTS = { "forward" : (BRANCHED_SEGMENTS, (1, 0.5, 0)),
+            "reversed" : (REVERSED_SEGMENTS, (1, 0.5, 0)),
+            "flipped" : (FLIPPED_SEGMENTS, (1.5, 0.5, 0)) }
+
+ELEMENT_TYPES = [   ("undamped", dict()),
+                    ("proportional", dict(proportional_damping=0.01)),
+                    ("wide_duct", dict()),
+                    ("LRF_fluid_equivalent", dict()),
+                    ("undamped_mean_flow", dict(volumetric_flow_rate=0.001)),
+                    ("peters", dict(volumetric_flow_rate=0.001))   ]
+
+
+def solve(build_pipe_model, set_nodal_property, layout, element_type, kwargs, condensation):
+
+    from pulse.processing.acoustic_solver import AcousticSolver
+
+    segments, radiation_end = LAYOUTS[layout]
+    project = build_pipe_model(segments, element_size=0.01)
+    model = project.model
+    model.set_analysis_setup({"f_min" : 1, "f_max" : 200, "f_step" : 1})
+
+    set_nodal_property(project, "volume_velocity", (0, 0, 0), {"values" : [0.01 + 0j]})
+    set_nodal_property(project, "radiation_impedance", radiation_end, {"impedance_type" : 0})
+    set_nodal_property(project, "acoustic_pressure", (2, 0, 0), {"values" : [1 + 0.5j]})
+    set_nodal_property(project, "specific_impedance", (1.2, 0, 0), {"values" : [400 + 100j]})
+
+    element_ids = list(model.preprocessor.acoustic_elements.keys())
+    model.preprocessor.set_acoustic_element_type_by_element(element_ids, element_type, **kwargs)
+    model.acoustic_chain_condensation = condensation
+
+    solver = AcousticSolver(model)
+    solution, _ = solver.direct_method()
+
+    return solution, solver, model
+
+
+@pytest.mark.parametrize("layout", list(LAYOUTS))
+@pytest.mark.parametrize("element_type, kwargs", ELEMENT_TYPES, ids=[label for label, _ in ELEMENT_TYPES])
+def test_condensed_solution_matches_full_solution(build_pipe_model, set_nodal_property, layout, element_type, kwargs):
+
+    from pulse.processing.acoustic_condensation import MEAN_FLOW_TYPES
+
+    full_solution, _, _ = solve(build_pipe_model, set_nodal_property, layout, element_type, kwargs, False)
+    condensed_solution, solver, _ = solve(build_pipe_model, set_nodal_property, layout, element_type, kwargs, True)
+
+    condensation = solver.assembly.chain_condensation
+    assert condensation.number_of_condensed_dofs > 0
+
+    if layout == "flipped" and element_type not in MEAN_FLOW_TYPES:
+        # the two-ports are evaluated with the representative pointing from the end to the start of the chain
+        assert any(chain.reversed for chain in condensation.chains)
+    else:
+        # the other chains follow the orientation of their elements
+        assert not any(chain.reversed for chain in condensation.chains)
+
+    # the interior pressures are recovered from the chain ends
+    interior = condensation.interior_indexes
+    assert np.all(np.isfinite(condensed_solution[interior]))
+
+    scale = np.abs(full_solution).max()
+    np.testing.assert_allclose(condensed_solution[interior], full_solution[interior], rtol=0, atol=1e-9 * scale)
+    np.testing.assert_allclose(condensed_solution, full_solution, rtol=0, atol=1e-9 * scale)
+
+
+def test_condensed_elements_take_the_validity_data_of_their_chains(build_pipe_model, set_nodal_property):
+
+    from pulse.processing.acoustic_condensation import VALIDITY_ATTRIBUTES
+
+    _, solver, model = solve(build_pipe_model, set_nodal_property, "forward", "wide_duct", dict(), True)
+
+    condensation = solver.assembly.chain_condensation
+    assert condensation.chains
+
+    for chain in condensation.chains:
+        for element in chain.elements:
+            for attribute in VALIDITY_ATTRIBUTES:
+                assert getattr(element, attribute) == getattr(chain.representative, attribute)
+
+    # building the COO data must not change the elements
+    chain = condensation.chains[0]
+    element = chain.elements[-1]
+    element.flag_wide_duct = "unchanged"
+    condensation.get_coo_data(model.frequencies)
+    assert element.flag_wide_duct == "unchanged"
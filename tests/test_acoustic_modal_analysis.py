@@ -0,0 +1,59 @@
+import numpy as np
+from scipy.linalg import eig
+
+
+def get_dense_eigenvalues(solver):
+    """
+    This function returns the eigenvalues with positive imaginary parts of the dense linearized pencil
+    [0 I; -K -C] / [I 0; 0 M] of the acoustic FEM matrices.
+    """
+
+    K, M = solver.assembly.get_global_matrices_modal()
+    K_link, M_link = solver.assembly.get_link_global_matrices_modal()
+    C, _ = solver.assembly.get_lumped_matrices_for_FEM()
+
+    K = (K + K_link).toarray()
+    M = (M + M_link).toarray()
+    C = C[0].toarray()
+
+    N = K.shape[0]
+    I = np.eye(N)
+    O = np.zeros((N, N))
+
+    eigen_values = eig(np.block([[O, I], [-K, -C]]), np.block([[I, O], [O, M]]), right=False)
+    eigen_values = eigen_values[np.isfinite(eigen_values) & (eigen_values.imag > 0)]
+
+    return eigen_values
+
+
+def test_damped_acoustic_modes_match_the_dense_pencil(build_pipe_model, set_nodal_property):
+
+    from pulse.processing.acoustic_solver import AcousticSolver
+
+    project = build_pipe_model([((0, 0, 0), (1, 0, 0), 1, 0.1)], element_size=0.02)
+    model = project.model
+    model.set_analysis_setup({"f_min" : 1, "f_max" : 10, "f_step" : 1})
+
+    # the partially reflective termination is a lumped damper of the FEM model
+    set_nodal_property(project, "specific_impedance", (1, 0, 0), {"values" : [4000 + 0j]})
+
+    solver = AcousticSolver(model)
+    natural_frequencies, modal_shapes = solver.modal_analysis(modes=12)
+
+    complex_natural_frequencies = solver.complex_natural_frequencies
+    assert len(complex_natural_frequencies) >= 4
+    assert modal_shapes.shape[1] == len(natural_frequencies)
+
+    eigen_values = 2 * np.pi * complex_natural_frequencies
+    dense_eigen_values = get_dense_eigenvalues(solver)
+
+    closest = [dense_eigen_values[np.argmin(np.abs(dense_eigen_values - value))] for value in eigen_values]
+    closest = np.array(closest)
+
+    np.testing.assert_allclose(eigen_values, closest, rtol=1e-6)
+    np.testing.assert_allclose(natural_frequencies, np.abs(closest) / (2 * np.pi), rtol=1e-6)
+
+    damping_ratios = -np.real(eigen_values) / np.abs(eigen_values)
+    dense_damping_ratios = -np.real(closest) / np.abs(closest)
+    np.testing.assert_allclose(damping_ratios, dense_damping_ratios, rtol=1e-5)
+    assert np.all(damping_ratios > 0)
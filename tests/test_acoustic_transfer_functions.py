@@ -0,0 +1,116 @@
+import pytest
+import numpy as np
+
+from pulse.processing.acoustic_transfer_functions import AcousticTransferFunctions
+
+
+def get_transfer_functions(receivers=5, steps=4):
+    rng = np.random.default_rng(3)
+    frequencies = np.arange(1, steps + 1, dtype=float)
+    transfer_functions = rng.normal(size=(receivers, steps, 2)) + 1j*rng.normal(size=(receivers, steps, 2))
+    prescribed_response = rng.normal(size=(receivers, steps)) + 0j
+    return AcousticTransferFunctions(frequencies, [3, 8], np.arange(receivers), transfer_functions, prescribed_response)
+
+
+def test_transfer_functions_superposition():
+
+    tf = get_transfer_functions()
+    spectrum = np.linspace(0, 1, 4) + 0.5j
+    response = tf.get_response({3: 2 + 1j, 8: spectrum})
+
+    expected = tf.prescribed_response + tf.transfer_functions[:, :, 0]*(2 + 1j) + tf.transfer_functions[:, :, 1]*spectrum
+    np.testing.assert_allclose(response, expected, rtol=1e-12)
+    np.testing.assert_allclose(tf.get_response(dict()), tf.prescribed_response)
+
+
+def test_transfer_functions_checks():
+
+    tf = get_transfer_functions()
+
+    assert tf.check_frequencies([1, 2, 3, 4])
+    assert not tf.check_frequencies([1, 2, 3])
+    assert not tf.check_sources({5: 1 + 0j})
+
+    with pytest.raises(ValueError):
+        tf.get_response({5: 1 + 0j})
+
+    restored = AcousticTransferFunctions(**tf.get_data())
+    np.testing.assert_array_equal(restored.transfer_functions, tf.transfer_functions)
+
+
+def solve_transfer_functions(build_pipe_model, set_nodal_property, analysis_setup, excitation):
+
+    from pulse.processing.acoustic_solver import AcousticSolver
+
+    project = build_pipe_model([((0, 0, 0), (1, 0, 0), 1, 0.1)], element_size=0.05)
+    model = project.model
+    model.set_analysis_setup(analysis_setup)
+
+    source = excitation(project)
+    set_nodal_property(project, "radiation_impedance", (1, 0, 0), {"impedance_type" : 0})
+
+    model.set_transfer_function_setup({ "acoustic_transfer_functions" : True,
+                                        "transfer_function_sources" : [source] })
+
+    solver = AcousticSolver(model)
+    solver.direct_method()
+
+    project.set_analysis_id(3)
+    project.acoustic_solution = solver.solution
+    project.acoustic_transfer_functions = solver.transfer_functions
+
+    return project, source
+
+
+def test_superposition_updates_only_the_acoustic_harmonic_analysis(build_pipe_model, set_nodal_property):
+
+    def excitation(project):
+        return set_nodal_property(project, "volume_velocity", (0, 0, 0), {"values" : [0.01 + 0j]})
+
+    analysis_setup = {"f_min" : 1, "f_max" : 100, "f_step" : 1}
+    project, source = solve_transfer_functions(build_pipe_model, set_nodal_property, analysis_setup, excitation)
+    solution = project.acoustic_solution.copy()
+
+    excitation = project.model.properties.nodal_properties["volume_velocity", source]
+    excitation["values"] = [0.02 + 0j]
+
+    assert project.update_acoustic_solution_by_superposition()
+    np.testing.assert_allclose(project.acoustic_solution, 2 * solution, rtol=1e-9)
+
+    # the structural solution of the coupled analyses would be left behind
+    for analysis_id in [5, 6]:
+        project.set_analysis_id(analysis_id)
+        project.acoustic_solution = solution
+        assert not project.update_acoustic_solution_by_superposition()
+        assert project.acoustic_solution is solution
+
+
+def test_superposition_checks_the_current_harmonics(build_pipe_model, set_nodal_property):
+
+    def excitation(project):
+        model = project.model
+        node_id = model.preprocessor.get_node_id_by_coordinates(np.zeros(3))
+        frequencies = model.frequency_grid
+        table = np.array([frequencies, np.ones_like(frequencies), np.zeros_like(frequencies)], dtype=float).T
+        model.properties.add_imported_tables("acoustic", "compressor", table)
+        data = {    "table_names" : ["compressor"],
+                    "parameters" : {"rotational_speed" : 600}    }
+        model.properties._set_nodal_property("reciprocating_compressor_excitation", data, node_id)
+        model.update_frequency_selection()
+        return node_id
+
+    analysis_setup = {  "f_min" : 0.5, "f_max" : 100, "f_step" : 0.5,
+                        "frequency_mode" : "harmonics"  }
+    project, source = solve_transfer_functions(build_pipe_model, set_nodal_property, analysis_setup, excitation)
+    model = project.model
+
+    np.testing.assert_allclose(model.frequencies, np.arange(10, 101, 10))
+    assert project.update_acoustic_solution_by_superposition()
+
+    # a new rotational speed is attributed without updating the frequency selection
+    data = model.properties.nodal_properties["reciprocating_compressor_excitation", source]
+    data["parameters"]["rotational_speed"] = 1500
+    model.properties._set_nodal_property("reciprocating_compressor_excitation", data, source)
+
+    assert not project.update_acoustic_solution_by_superposition()
+    np.testing.assert_allclose(model.frequencies, np.arange(25, 101, 25))
@@ -0,0 +1,84 @@
+import pytest
+import numpy as np
+from scipy.linalg import eigh
+from scipy.sparse import block_diag, diags
+
+from pulse.processing.eigen_solvers import SpectrumSlicingEigenSolver, SymmetricEigenSolver, get_real_symmetric_matrix
+
+
+def get_chain_matrices(size=200):
+    K = diags([-np.ones(size-1), 2*np.ones(size), -np.ones(size-1)], [-1, 0, 1], format="csr") * 1e6
+    M = diags(np.linspace(1, 2, size), format="csr")
+    return K, M
+
+
+@pytest.mark.parametrize("method", ["eigsh", "lobpcg"])
+def test_symmetric_eigen_solver_lowest_modes(method):
+
+    K, M = get_chain_matrices()
+    expected = eigh(K.toarray(), M.toarray(), eigvals_only=True)[:6]
+
+    eigen_values, eigen_vectors = SymmetricEigenSolver(method=method).solve(K, M, 6, 0.)
+
+    np.testing.assert_allclose(eigen_values, expected, rtol=1e-6)
+    np.testing.assert_allclose(eigen_vectors.T @ M @ eigen_vectors, np.eye(6), atol=1e-6)
+
+
+def test_symmetric_eigen_solver_frequency_window():
+
+    K, M = get_chain_matrices()
+    expected = eigh(K.toarray(), M.toarray(), eigvals_only=True)
+    f_min, f_max = 50., 200.
+    lambda_min, lambda_max = (2*np.pi*f_min)**2, (2*np.pi*f_max)**2
+    expected = expected[(expected >= lambda_min) & (expected <= lambda_max)]
+
+    solver = SymmetricEigenSolver()
+    eigen_values, _ = solver.solve_in_window(K, M, f_min, f_max, modes=4)
+
+    np.testing.assert_allclose(eigen_values, expected, rtol=1e-8)
+    assert solver.factorization_count == 1
+
+
+def test_symmetric_eigen_solver_reuses_the_factorization_of_rebuilt_matrices():
+
+    solver = SymmetricEigenSolver()
+
+    # the matrices are rebuilt before each call, as in the modal analysis
+    for modes in [4, 8]:
+        K, M = get_chain_matrices()
+        eigen_values, _ = solver.solve(K, M, modes, 0.)
+    assert solver.factorization_count == 1
+
+    K, M = get_chain_matrices()
+    solver.solve(2*K, M, 4, 0.)
+    assert solver.factorization_count == 2
+
+    solver.release()
+    assert solver.operator is None
+
+
+def test_complex_matrices_are_not_symmetric_real():
+
+    K, _ = get_chain_matrices()
+
+    assert get_real_symmetric_matrix(K.astype(complex)) is not None
+    assert get_real_symmetric_matrix(K*(1 + 0.1j)) is None
+
+
+@pytest.mark.parametrize("mode", ["serial", "thread"])
+def test_spectrum_slicing_keeps_repeated_modes(mode):
+
+    K, M = get_chain_matrices(100)
+    # two identical chains have every eigenvalue repeated
+    K = block_diag([K, K], format="csr")
+    M = block_diag([M, M], format="csr")
+
+    f_min, f_max = 0., 250.
+    expected = eigh(K.toarray(), M.toarray(), eigvals_only=True)
+    expected = expected[expected <= (2*np.pi*f_max)**2]
+
+    solver = SpectrumSlicingEigenSolver(mode=mode, number_of_workers=2, number_of_slices=4, overlap=0.2, modes_per_slice=4)
+    eigen_values, eigen_vectors = solver.solve(K, M, f_min, f_max)
+
+    np.testing.assert_allclose(eigen_values, expected, rtol=1e-8)
+    np.testing.assert_allclose(eigen_vectors.T @ M @ eigen_vectors, np.eye(len(expected)), atol=1e-6)
@@ -0,0 +1,94 @@
+import pytest
+import numpy as np
+
+from pulse.model.node import Node
+from pulse.model.acoustic_element import AcousticElement
+from pulse.model.cross_section import CrossSection
+from pulse.model.properties.fluid import Fluid
+from pulse.model.properties.material import Material
+from pulse.processing.fetm_kernels import FETM_KERNEL_TYPES, fetm_matrices, is_batchable
+
+
+FLAGS = ["flag_plane_wave", "flag_wide_duct", "flag_lrf_fluid_eq", "max_valid_freq", "min_valid_freq"]
+
+
+def get_fluid():
+    return Fluid(   "air", 1.204263, 343.395034, identifier=1, isentropic_exponent=1.401985,
+                    thermal_conductivity=0.025503, specific_heat_Cp=1006.400178,
+                    dynamic_viscosity=1.8247e-5, temperature=293.15, pressure=101325,
+                    molar_mass=28.958601    )
+
+
+def get_cross_section(outer_diameter, thickness):
+    section_info = {    "section_type_label" : "pipe",
+                        "section_parameters" : [outer_diameter, thickness, 0.0, 0.0, 0.0, 0.0]    }
+    cross_section = CrossSection(pipe_section_info=section_info)
+    cross_section.update_properties()
+    return cross_section
+
+
+def get_elements(element_type, flow_direction=1):
+
+    material = Material("steel", 7860, identifier=1, elasticity_modulus=210e9, poisson_ratio=0.3)
+    fluid = get_fluid()
+
+    # the small and large pipes reach the wide-duct, LRF and plane wave limits inside the frequency range
+    cross_sections = [get_cross_section(0.004, 0.001), get_cross_section(0.1, 0.008), get_cross_section(0.6, 0.01)]
+
+    points = np.cumsum(np.r_[[[0, 0, 0]], np.random.default_rng(1).uniform(0.01, 0.05, (6, 3))], axis=0)
+    nodes = [Node(*point, global_index=index) for index, point in enumerate(points)]
+
+    elements = list()
+    for index in range(6):
+        cross_section = cross_sections[index % 3]
+        element = AcousticElement(  nodes[index],
+                                    nodes[index + 1],
+                                    index + 1,
+                                    element_type = element_type,
+                                    proportional_damping = 0.01,
+                                    material = material,
+                                    fluid = fluid,
+                                    cross_section = cross_section,
+                                    volumetric_flow_rate = flow_direction * 0.2 * cross_section.area_fluid )
+        elements.append(element)
+
+    return elements
+
+
+@pytest.mark.parametrize("flow_direction", [1, -1])
+@pytest.mark.parametrize("element_type", FETM_KERNEL_TYPES)
+def test_fetm_matrices_match_element_matrices(element_type, flow_direction):
+
+    if element_type == "damped_liquid":
+        # the damped liquid with mean flow is evaluated element by element
+        flow_direction = 0
+    if element_type == "peters" and flow_direction < 0:
+        pytest.skip("the Peters friction velocity is not defined for reversed flows")
+
+    elements = get_elements(element_type, flow_direction)
+    assert all(is_batchable(element) for element in elements)
+
+    frequencies = np.linspace(1, 4000, 60)
+    length_corrections = np.linspace(0, 0.01, len(elements))
+
+    data = fetm_matrices(elements, length_corrections, frequencies)
+    flags = [[getattr(element, flag) for flag in FLAGS] for element in elements]
+
+    assert np.all(np.isfinite(data))
+
+    for element, length_correction, matrix, element_flags in zip(elements, length_corrections, data, flags):
+        expected = element.matrix(frequencies, length_correction=length_correction)
+        np.testing.assert_allclose(matrix, expected, rtol=1e-10, atol=1e-14*np.abs(expected).max())
+        assert element_flags == [getattr(element, flag) for flag in FLAGS]
+
+
+def test_fetm_matrices_flag_the_validity_limits():
+
+    frequencies = np.linspace(1, 4000, 60)
+
+    elements = get_elements("wide_duct")
+    fetm_matrices(elements, np.zeros(len(elements)), frequencies)
+    assert elements[0].flag_wide_duct
+    assert not elements[0].flag_plane_wave
+    assert elements[2].flag_plane_wave
+    assert elements[2].max_valid_freq < frequencies[-1]
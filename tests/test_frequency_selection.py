@@ -0,0 +1,124 @@
+import numpy as np
+
+from pulse.project.project import Project
+
+
+def add_excitation(model, node_id, rotational_speed, property="reciprocating_compressor_excitation"):
+
+    table_name = f"excitation_node_{node_id}"
+    frequencies = model.frequency_grid
+    table = np.array([frequencies, np.cos(frequencies), np.sin(frequencies)], dtype=float).T
+
+    model.properties.add_imported_tables("acoustic", table_name, table)
+
+    data = {    "table_names" : [table_name],
+                "parameters" : {"rotational_speed" : rotational_speed}    }
+
+    model.properties._set_nodal_property(property, data, node_id)
+
+    return table
+
+
+def get_model(f_min, f_max, f_step, harmonic_band=0.):
+    model = Project().model
+    model.set_frequency_setup({ "f_min" : f_min,
+                                "f_max" : f_max,
+                                "f_step" : f_step,
+                                "frequency_mode" : "harmonics",
+                                "harmonic_band" : harmonic_band })
+    return model
+
+
+def test_harmonic_frequency_indexes_of_one_machine():
+
+    model = get_model(0.5, 100, 0.5)
+    grid = model.frequency_grid
+    add_excitation(model, 1, 600)
+
+    indexes = model.get_harmonic_frequency_indexes(grid)
+
+    np.testing.assert_allclose(grid[indexes], np.arange(10, 101, 10))
+
+
+def test_harmonic_frequency_indexes_of_several_machines():
+
+    model = get_model(0.5, 100, 0.5)
+    grid = model.frequency_grid
+    add_excitation(model, 1, 600)
+    add_excitation(model, 2, 900, property="reciprocating_pump_excitation")
+
+    indexes = model.get_harmonic_frequency_indexes(grid)
+
+    expected = np.union1d(np.arange(10, 101, 10), np.arange(15, 101, 15))
+    np.testing.assert_allclose(grid[indexes], expected)
+    assert np.all(np.diff(indexes) > 0)
+
+
+def test_harmonic_frequency_indexes_snap_to_the_grid():
+
+    model = get_model(1, 100, 0.7)
+    grid = model.frequency_grid
+    add_excitation(model, 1, 500)
+
+    indexes = model.get_harmonic_frequency_indexes(grid)
+
+    harmonics = (500 / 60) * np.arange(1, 12)
+    expected = [np.abs(grid - harmonic).argmin() for harmonic in harmonics]
+    np.testing.assert_array_equal(indexes, expected)
+
+
+def test_harmonic_frequency_indexes_with_band():
+
+    model = get_model(1, 60, 0.5, harmonic_band=1.)
+    grid = model.frequency_grid
+    add_excitation(model, 1, 1200)
+
+    indexes = model.get_harmonic_frequency_indexes(grid)
+
+    expected = np.concatenate([np.arange(harmonic - 1, harmonic + 1.5, 0.5) for harmonic in [20, 40, 60]])
+    expected = expected[expected <= 60]
+    np.testing.assert_allclose(grid[indexes], expected)
+
+
+def test_harmonic_frequency_indexes_without_excitations():
+
+    model = get_model(1, 100, 1)
+
+    assert model.get_harmonic_frequency_indexes(model.frequency_grid) is None
+    assert model.frequency_indexes is None
+    np.testing.assert_allclose(model.frequencies, model.frequency_grid)
+
+
+def test_table_values_follow_the_frequency_selection():
+
+    model = get_model(0.5, 100, 0.5)
+    grid = model.frequency_grid.copy()
+    table = add_excitation(model, 1, 600)
+    model.update_frequency_selection()
+
+    # the grid of the tables is kept apart from the frequencies of analysis
+    np.testing.assert_allclose(model.frequency_grid, grid)
+    np.testing.assert_allclose(model.frequencies, np.arange(10, 101, 10))
+
+    values = model.properties.nodal_properties["reciprocating_compressor_excitation", 1]["values"][0]
+    expected = table[:, 1] + 1j*table[:, 2]
+    np.testing.assert_allclose(values, expected[model.frequency_indexes])
+
+    # a new rotational speed selects its own harmonics
+    data = model.properties.nodal_properties["reciprocating_compressor_excitation", 1]
+    data["parameters"]["rotational_speed"] = 1500
+    model.properties._set_nodal_property("reciprocating_compressor_excitation", data, 1)
+    model.update_frequency_selection()
+
+    np.testing.assert_allclose(model.frequencies, np.arange(25, 101, 25))
+    np.testing.assert_allclose(model.frequency_grid, grid)
+
+    values = model.properties.nodal_properties["reciprocating_compressor_excitation", 1]["values"][0]
+    np.testing.assert_allclose(values, expected[model.frequency_indexes])
+
+    # the full tables are used again without excitations
+    model.properties._remove_nodal_property("reciprocating_compressor_excitation", 1)
+    model.update_frequency_selection()
+
+    assert model.frequency_indexes is None
+    np.testing.assert_allclose(model.frequencies, grid)
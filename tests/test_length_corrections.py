@@ -0,0 +1,30 @@
+import numpy as np
+from scipy.special import jn_zeros, jv
+
+from pulse.processing.length_corrections import length_correction_branch, length_correction_expansion
+
+
+def expansion_reference(smaller_diameter, larger_diameter):
+    jm = jn_zeros(1, 200)
+    xi = smaller_diameter / larger_diameter
+    H = (3*np.pi/2) * sum(((jv(1, jm * xi))**2) / (jm * xi * ((jm * jv(0, jm))**2)))
+    return ((8 * smaller_diameter / 2) / (3 * np.pi)) * H
+
+
+def test_length_correction_expansion_matches_bessel_series():
+
+    smaller = np.array([0.05, 0.08, 0.05, 0.1])
+    larger = np.array([0.1, 0.2, 0.1, 0.3])
+    expected = [expansion_reference(d, D) for d, D in zip(smaller, larger)]
+
+    np.testing.assert_allclose(length_correction_expansion(smaller, larger), expected, rtol=1e-10)
+    assert np.isclose(length_correction_expansion(0.05, 0.1), expected[0], rtol=1e-10)
+
+
+def test_length_correction_branch_regions():
+
+    branch = np.array([0.02, 0.08])
+    principal = np.array([0.1, 0.1])
+    expected = [0.02 * (0.8216 - 0.0644 * 0.2 - 0.694 * 0.2**2) / 2, 0.08 * (0.9326 - 0.6196 * 0.8) / 2]
+
+    np.testing.assert_allclose(length_correction_branch(branch, principal), expected)
@@ -0,0 +1,82 @@
+import os
+import pytest
+import numpy as np
+from scipy.sparse import diags, random as sparse_random
+from scipy.sparse.linalg import spsolve
+
+from pulse.processing.linear_solvers import get_available_linear_solvers, get_linear_solver, select_linear_solver
+
+
+def get_sweep_matrices(size=300):
+    K = sparse_random(size, size, density=0.01, random_state=1)
+    K = K + K.T + diags(np.full(size, 10.))
+    M = diags(np.linspace(1, 2, size))
+    return K.tocsr(), M.tocsr()
+
+
+@pytest.mark.parametrize("name", ["auto"] + get_available_linear_solvers())
+def test_linear_solvers_frequency_sweep(name):
+
+    K, M = get_sweep_matrices()
+    b = np.ones(K.shape[0], dtype=complex)
+    solver = get_linear_solver(name)
+
+    for omega in [1., 2., 3.]:
+        A = K*(1 + 0.01j) - (omega**2)*M
+        np.testing.assert_allclose(solver.solve(A, b), spsolve(A, b), rtol=1e-8)
+
+    solver.release()
+
+
+def test_superlu_reuses_the_ordering():
+
+    K, M = get_sweep_matrices()
+    solver = get_linear_solver("superlu")
+
+    for omega in [1., 2., 3.]:
+        solver.solve(K - (omega**2)*M, np.ones(K.shape[0]))
+
+    assert solver.analysis_count == 1
+    assert solver.factorization_count == 3
+
+
+def test_auto_selection_of_small_models():
+    assert select_linear_solver(100, is_complex=True) == "superlu"
+
+
+@pytest.mark.skipif("pardiso" not in get_available_linear_solvers(), reason="PARDISO is not available")
+@pytest.mark.parametrize("split_phases", [True, False])
+def test_pardiso_public_and_split_phases(split_phases):
+
+    K, M = get_sweep_matrices()
+    solver = get_linear_solver("pardiso")
+    solver.split_phases = split_phases and solver.split_phases
+
+    for omega in [1., 2.]:
+        A = K*(1 + 0.01j) - (omega**2)*M
+        b = np.ones(K.shape[0], dtype=complex)
+        np.testing.assert_allclose(solver.solve(A, b), spsolve(A, b), rtol=1e-8)
+        A = K - (omega**2)*M
+        np.testing.assert_allclose(solver.solve(A, b), spsolve(A.astype(complex), b), rtol=1e-8)
+
+    assert solver.factorization_count == 4
+    solver.release()
+
+
+@pytest.mark.skipif("pardiso" not in get_available_linear_solvers(), reason="PARDISO is not available")
+def test_pardiso_number_of_threads(monkeypatch):
+
+    from pypardiso import PyPardisoSolver
+    from pulse.processing.linear_solvers import set_pardiso_number_of_threads
+
+    monkeypatch.setenv("MKL_NUM_THREADS", "")
+    monkeypatch.setenv("OMP_NUM_THREADS", "")
+    libmkl = PyPardisoSolver().libmkl
+    previous = libmkl.MKL_Get_Max_Threads()
+
+    try:
+        set_pardiso_number_of_threads(1)
+        assert libmkl.MKL_Get_Max_Threads() == 1
+        assert os.environ["MKL_NUM_THREADS"] == os.environ["OMP_NUM_THREADS"] == "1"
+    finally:
+        set_pardiso_number_of_threads(previous)
@@ -0,0 +1,35 @@
+import numpy as np
+from scipy.sparse import diags
+
+from pulse.processing.low_rank_update import LowRankUpdate
+
+
+def test_low_rank_update_matches_updated_systems():
+
+    size, steps = 50, 6
+    rng = np.random.default_rng(5)
+
+    matrices = [diags([np.full(size - 1, -1.), np.full(size, 2.5 + 0.1j*k), np.full(size - 1, -1.)], [-1, 0, 1]).toarray() for k in range(steps)]
+    b = rng.normal(size=(size, steps)) + 0j
+
+    update = LowRankUpdate([4, 5, 30])
+    unit_rhs = update.get_unit_rhs(size, steps)
+
+    base_solution = np.array([np.linalg.solve(A, b[:, k]) for k, A in enumerate(matrices)]).T
+    unit_solutions = np.array([np.linalg.solve(A, unit_rhs[:, k, :]) for k, A in enumerate(matrices)]).transpose(1, 0, 2)
+    update.set_base_solutions(base_solution, unit_solutions)
+
+    # a perforated plate like admittance between the rows 4 and 5 and a lumped admittance at the row 30
+    delta = np.zeros((steps, 3, 3), dtype=complex)
+    admittance = rng.normal(size=steps) + 1j*rng.normal(size=steps)
+    delta[:, :2, :2] = admittance[:, None, None] * np.array([[-1, 1], [1, -1]])
+    delta[:, 2, 2] = 0.5j
+
+    expected = list()
+    for k, A in enumerate(matrices):
+        A = A.astype(complex)
+        A[np.ix_([4, 5, 30], [4, 5, 30])] += delta[k]
+        expected.append(np.linalg.solve(A, b[:, k]))
+
+    np.testing.assert_allclose(update.solve(delta), np.array(expected).T, rtol=1e-10)
+    np.testing.assert_allclose(update.solve(np.zeros_like(delta)), base_solution)
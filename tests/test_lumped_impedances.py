@@ -0,0 +1,65 @@
+import pytest
+import numpy as np
+
+
+# the lines of the branch and of the outlet have different diameters
+BRANCHED_SEGMENTS = [   ((0, 0, 0), (1, 0, 0), 1, 0.1),
+                        ((1, 0, 0), (1.5, 0, 0), 2, 0.1),
+                        ((1.5, 0, 0), (2, 0, 0), 3, 0.2),
+                        ((1, 0, 0), (1, 0.5, 0), 4, 0.05)   ]
+
+SPECIFIC_IMPEDANCE = 400 + 100j
+
+
+def get_model(build_pipe_model, set_nodal_property, specific_impedance_first):
+
+    project = build_pipe_model(BRANCHED_SEGMENTS, element_size=0.05)
+    model = project.model
+    model.set_analysis_setup({"f_min" : 1, "f_max" : 100, "f_step" : 1})
+
+    set_nodal_property(project, "volume_velocity", (0, 0, 0), {"values" : [0.01 + 0j]})
+    set_nodal_property(project, "acoustic_pressure", (2, 0, 0), {"values" : [1 + 0.5j]})
+
+    # the specific impedance is placed at the outlet line and the radiation impedance at the branch end
+    impedances = [  ("specific_impedance", (1.7, 0, 0), {"values" : [SPECIFIC_IMPEDANCE]}),
+                    ("radiation_impedance", (1, 0.5, 0), {"impedance_type" : 0})  ]
+    if not specific_impedance_first:
+        impedances.reverse()
+
+    for property, coords, data in impedances:
+        set_nodal_property(project, property, coords, data)
+
+    node_id = model.preprocessor.get_node_id_by_coordinates(np.array([1.7, 0, 0]))
+    area_fluid = model.preprocessor.acoustic_elements[model.preprocessor.mesh.elements_from_line[3][0]].cross_section.area_fluid
+
+    return model, model.preprocessor.nodes[node_id].global_index, area_fluid
+
+
+@pytest.mark.parametrize("specific_impedance_first", [True, False])
+def test_specific_impedance_uses_the_area_of_its_node(build_pipe_model, set_nodal_property, specific_impedance_first):
+
+    from pulse.processing.assembly_acoustic import AssemblyAcoustic
+
+    model, position, area_fluid = get_model(build_pipe_model, set_nodal_property, specific_impedance_first)
+    assembly = AssemblyAcoustic(model)
+
+    ind_Klump, data_Klump = assembly.get_lumped_coo_data()
+    column = list(ind_Klump).index(position)
+    np.testing.assert_allclose(data_Klump[:, column], area_fluid / SPECIFIC_IMPEDANCE, rtol=1e-12)
+
+    C_lump, _ = assembly.get_lumped_matrices_for_FEM()
+    row = list(assembly.unprescribed_indexes).index(position)
+    np.testing.assert_allclose([C[row, row] for C in C_lump], area_fluid / SPECIFIC_IMPEDANCE, rtol=1e-12)
+
+
+def test_lumped_impedances_do_not_depend_on_their_order(build_pipe_model, set_nodal_property):
+
+    from pulse.processing.acoustic_solver import AcousticSolver
+
+    solutions = list()
+    for specific_impedance_first in [True, False]:
+        model, _, _ = get_model(build_pipe_model, set_nodal_property, specific_impedance_first)
+        solution, _ = AcousticSolver(model).direct_method()
+        solutions.append(solution)
+
+    np.testing.assert_allclose(solutions[1], solutions[0], rtol=0, atol=1e-10 * np.abs(solutions[0]).max())
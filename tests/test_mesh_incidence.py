@@ -0,0 +1,38 @@
+from pulse.model.mesh_incidence import MeshIncidence
+
+
+def _branched_pipe():
+    # line 1: 10 - 11 - 12 - 13, line 2: 11 - 20 - 21
+    element_ids = [1, 2, 3, 4, 5]
+    first_node_ids = [10, 11, 12, 11, 20]
+    last_node_ids = [11, 12, 13, 20, 21]
+    element_line_ids = [1, 1, 1, 2, 2]
+    return MeshIncidence(element_ids, first_node_ids, last_node_ids, element_line_ids)
+
+
+def test_node_and_element_queries():
+
+    incidence = _branched_pipe()
+
+    assert incidence.number_nodes == 6
+    assert incidence.number_elements == 5
+
+    assert incidence.get_elements_by_node(11) == [1, 2, 4]
+    assert incidence.get_elements_by_node(99) == []
+    assert incidence.get_nodes_by_element(4) == (11, 20)
+    assert incidence.get_neighbor_nodes(11) == [10, 12, 20]
+
+    assert incidence.get_elements_between_nodes([20, 11, 12]) == [2, 4]
+    assert incidence.get_elements_between_nodes([13, 21]) == []
+
+
+def test_line_queries():
+
+    incidence = _branched_pipe()
+
+    assert incidence.get_lines_by_node(11) == [1, 2]
+    assert incidence.get_lines_by_node(21) == [2]
+    assert incidence.get_nodes_by_line(1) == [10, 11, 12, 13]
+    assert incidence.get_nodes_by_line(2) == [11, 20, 21]
+
+    assert incidence.get_node_line_pairs() == [(10, 1), (11, 1), (11, 2), (12, 1), (13, 1), (20, 2), (21, 2)]
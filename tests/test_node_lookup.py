@@ -0,0 +1,114 @@
+import pytest
+import numpy as np
+
+
+STRAIGHT_PIPE = [((0, 0, 0), (1, 0, 0), 1, 0.1)]
+
+
+@pytest.fixture
+def project(build_pipe_model):
+    return build_pipe_model(STRAIGHT_PIPE, element_size=0.1)
+
+
+def get_node_id_at(preprocessor, x):
+    for node_id, node in preprocessor.nodes.items():
+        if np.allclose(node.coordinates, [x, 0, 0]):
+            return node_id
+
+
+def test_node_id_of_exact_match(project):
+
+    preprocessor = project.model.preprocessor
+
+    for x in [0, 0.3, 1]:
+        assert preprocessor.get_node_id_by_coordinates([x, 0, 0]) == get_node_id_at(preprocessor, x)
+
+
+def test_node_id_of_single_node_inside_radius(project):
+
+    preprocessor = project.model.preprocessor
+    node_id = get_node_id_at(preprocessor, 0.3)
+
+    # the default radius is a twentieth of the element size
+    assert preprocessor.get_node_id_by_coordinates([0.302, 0.001, 0]) == node_id
+    assert preprocessor.get_node_id_by_coordinates([0.31, 0, 0]) is None
+
+    assert preprocessor.get_node_id_by_coordinates([0.349, 0, 0], radius=0.05) == node_id
+
+
+def test_node_id_of_two_nodes_inside_radius(project):
+
+    preprocessor = project.model.preprocessor
+
+    assert preprocessor.get_node_id_by_coordinates([0.349, 0, 0], radius=0.06) is None
+    node_ids = preprocessor.get_node_ids_within_radius([[0.349, 0, 0]], 0.06)[0]
+    assert sorted(node_ids) == sorted([get_node_id_at(preprocessor, 0.3), get_node_id_at(preprocessor, 0.4)])
+
+
+def test_node_id_of_coincident_nodes(project):
+
+    preprocessor = project.model.preprocessor
+    node_a = get_node_id_at(preprocessor, 0.4)
+    node_b = get_node_id_at(preprocessor, 0.5)
+
+    node = preprocessor.nodes[node_b]
+    node.x, node.y, node.z = preprocessor.nodes[node_a].coordinates
+    preprocessor.get_nodal_coordinates_matrix()
+
+    # the coincident nodes are resolved by the first row of the coordinates matrix
+    rows = {node_id: preprocessor.nodes[node_id].global_index for node_id in [node_a, node_b]}
+    expected = min(rows, key=rows.get)
+
+    assert preprocessor.get_node_id_by_coordinates([0.4, 0, 0]) == expected
+    assert preprocessor.get_node_id_by_coordinates([0.401, 0, 0]) is None
+
+
+def test_batch_lookups_match_single_lookups(project):
+
+    preprocessor = project.model.preprocessor
+
+    rng = np.random.default_rng(7)
+    points = np.c_[rng.uniform(-0.1, 1.1, 200), rng.normal(scale=0.003, size=200), np.zeros(200)]
+    points[::10, 0] = np.round(points[::10, 0], 1)
+    points[::10, 1] = 0
+
+    for radius in [None, 0.02, 0.06]:
+        node_ids = preprocessor.get_node_ids_by_coordinates(points, radius=radius)
+        assert node_ids == [preprocessor.get_node_id_by_coordinates(point, radius=radius) for point in points]
+        assert any(node_id is not None for node_id in node_ids)
+
+    spheres = preprocessor.get_node_ids_within_radius(points, 0.06)
+    for point, node_ids in zip(points, spheres):
+        distances = {node_id: np.linalg.norm(node.coordinates - point) for node_id, node in preprocessor.nodes.items()}
+        assert node_ids == sorted([node_id for node_id, distance in distances.items() if distance <= 0.06], key=lambda node_id: preprocessor.nodes[node_id].global_index)
+
+
+def test_nodal_properties_are_remapped_after_mesh_changed(project, monkeypatch):
+
+    from types import SimpleNamespace
+    from pulse.project.load_project import LoadProject
+
+    preprocessor = project.model.preprocessor
+    properties = project.model.properties
+    # the project file is not opened
+    monkeypatch.setattr(project, "file", SimpleNamespace(write_nodal_properties_in_file=lambda: None), raising=False)
+
+    node_ids = {x: get_node_id_at(preprocessor, x) for x in [0, 0.2, 0.5, 0.7, 1]}
+
+    # the properties were attributed to the node ids of a previous mesh
+    properties.nodal_properties["lumped_masses", 101] = {"coords" : [0.2, 0, 0], "values" : [1., 1., 1., None, None, None]}
+    properties.nodal_properties["structural_stiffness_links", 102, 103] = {"coords" : [0.7, 0, 0, 0.5, 0, 0], "values" : [1e6, None, None, None, None, None]}
+    properties.nodal_properties["nodal_loads", 104] = {"coords" : [1, 0, 0], "values" : [None, 1., None, None, None, None]}
+    properties.nodal_properties["structural_damping_links", 105, 106] = {"coords" : [0, 0, 0, 1, 0, 0], "values" : [1e2, None, None, None, None, None]}
+
+    LoadProject(project).update_node_ids_after_mesh_changed()
+
+    link_a = tuple(sorted([node_ids[0.7], node_ids[0.5]]))
+    link_b = tuple(sorted([node_ids[0], node_ids[1]]))
+
+    assert set(properties.nodal_properties.keys()) == {  ("lumped_masses", node_ids[0.2]),
+                                                         ("structural_stiffness_links", *link_a),
+                                                         ("nodal_loads", node_ids[1]),
+                                                         ("structural_damping_links", *link_b)  }
+
+    assert properties.nodal_properties[("structural_stiffness_links", *link_a)]["coords"] == [0.7, 0, 0, 0.5, 0, 0]
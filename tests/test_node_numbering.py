@@ -0,0 +1,60 @@
+import numpy as np
+
+from pulse.model.node_numbering import get_adjacency_matrix, get_bandwidth_and_profile, get_node_order
+
+
+def _grid_neighbors(rows, cols):
+    neighbors = [list() for _ in range(rows * cols)]
+    for i in range(rows):
+        for j in range(cols):
+            position = i * cols + j
+            if j + 1 < cols:
+                neighbors[position].append(position + 1)
+                neighbors[position + 1].append(position)
+            if i + 1 < rows:
+                neighbors[position].append(position + cols)
+                neighbors[position + cols].append(position)
+    return neighbors
+
+
+def test_node_orders_are_permutations():
+
+    # two disconnected components and an isolated last node
+    neighbors = _grid_neighbors(4, 6) + [[25], [24], []]
+
+    for method in ["breadth_first", "reverse_cuthill_mckee", "minimum_degree"]:
+        order = get_node_order(neighbors, method=method)
+        np.testing.assert_array_equal(np.sort(order), np.arange(len(neighbors)))
+
+
+def test_breadth_first_order_of_a_branched_pipe():
+
+    # 0 - 1 - 2 - 3 with a branch 1 - 4 - 5
+    neighbors = [[1], [0, 2, 4], [1, 3], [2], [1, 5], [4]]
+
+    np.testing.assert_array_equal(get_node_order(neighbors), [0, 1, 2, 4, 3, 5])
+
+
+def test_reverse_cuthill_mckee_reduces_bandwidth():
+
+    rows, cols = 4, 30
+    neighbors = _grid_neighbors(rows, cols)
+    adjacency = get_adjacency_matrix(neighbors)
+
+    bandwidth, profile = get_bandwidth_and_profile(adjacency, np.arange(rows * cols))
+    assert bandwidth == cols
+
+    order = get_node_order(neighbors, method="reverse_cuthill_mckee")
+    rcm_bandwidth, rcm_profile = get_bandwidth_and_profile(adjacency, order)
+
+    assert rcm_bandwidth < bandwidth // 2
+    assert rcm_profile < profile
+
+
+def test_bandwidth_and_profile_of_a_path():
+
+    neighbors = [[1], [0, 2], [1, 3], [2]]
+    adjacency = get_adjacency_matrix(neighbors)
+
+    assert get_bandwidth_and_profile(adjacency, np.arange(4)) == (1, 3)
+    assert get_bandwidth_and_profile(adjacency, np.array([0, 3, 1, 2])) == (2, 4)
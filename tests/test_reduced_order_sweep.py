@@ -0,0 +1,53 @@
+import numpy as np
+from scipy.sparse import diags
+from scipy.sparse.linalg import spsolve
+
+from pulse.processing.reduced_order_sweep import ReducedOrderSweep
+from pulse.processing.sweep_executor import SweepSystem
+
+
+def get_sweep_system(size=300, steps=400):
+    # fixed-free chain of springs and masses with a few resonances in the sweep
+    K = diags([np.full(size - 1, -1.), np.full(size, 2.), np.full(size - 1, -1.)], [-1, 0, 1]).tocsr()
+    K.sort_indices()
+    M = diags(np.full(size, 1e-4)).tocsr()
+
+    omega = np.linspace(1, 40, steps)
+    rhs = np.zeros((size, steps), dtype=complex)
+    rhs[-1, :] = 1
+
+    mass_data = np.asarray(M[K.nonzero()]).ravel()
+    system = SweepSystem(   K.indices,
+                            K.indptr,
+                            K.shape,
+                            rhs,
+                            constant_data = np.array([K.data, mass_data], dtype=complex),
+                            coefficients = np.array([np.full(steps, 1 + 0.02j), -omega**2])  )
+
+    expected = np.array([spsolve((K*(1 + 0.02j) - (w**2)*M).tocsc(), rhs[:, i]) for i, w in enumerate(omega)]).T
+    return system, omega, expected
+
+
+def test_reduced_order_sweep_matches_full_solution():
+
+    system, omega, expected = get_sweep_system()
+    sweep = ReducedOrderSweep(tolerance=1e-8, linear_solver="superlu")
+    solution = sweep.solve(system, frequencies=omega)
+    sweep.release()
+
+    np.testing.assert_allclose(solution, expected, rtol=1e-6, atol=1e-6*np.abs(expected).max())
+
+    assert len(sweep.expansion_indexes) < system.number_of_steps // 10
+    assert not sweep.direct_indexes
+    assert sweep.error_estimates.max() <= 1e-8
+
+
+def test_reduced_order_sweep_solves_unconverged_frequencies():
+
+    system, omega, expected = get_sweep_system()
+    sweep = ReducedOrderSweep(tolerance=1e-8, max_expansion_points=1, include_derivatives=False, linear_solver="superlu")
+    solution = sweep.solve(system, frequencies=omega)
+
+    assert len(sweep.expansion_indexes) == 1
+    assert sweep.direct_indexes
+    np.testing.assert_allclose(solution[:, sweep.direct_indexes], expected[:, sweep.direct_indexes], rtol=1e-8)
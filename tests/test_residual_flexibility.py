@@ -0,0 +1,59 @@
+import numpy as np
+
+
+STRAIGHT_PIPE = [((0, 0, 0), (1, 0, 0), 1, 0.1)]
+
+
+def get_model(build_pipe_model, set_nodal_property, clamped=True):
+
+    project = build_pipe_model(STRAIGHT_PIPE, element_size=0.05)
+    model = project.model
+    model.set_analysis_setup({  "f_min" : 1,
+                                "f_max" : 50,
+                                "f_step" : 1,
+                                "global_damping" : [1e-3, 1e-5, 0., 0.]  })
+
+    if clamped:
+        for coords in [(0, 0, 0), (1, 0, 0)]:
+            set_nodal_property(project, "prescribed_dofs", coords, {"values" : [0j] * 6})
+
+    set_nodal_property(project, "nodal_loads", (0.3, 0, 0), {"values" : [1 + 0j, 1 + 0j, None, None, None, None]})
+
+    return model
+
+
+def get_relative_error(solution, reference):
+    return np.linalg.norm(solution - reference) / np.linalg.norm(reference)
+
+
+def test_residual_flexibility_approaches_the_direct_method(build_pipe_model, set_nodal_property):
+
+    from pulse.processing.structural_solver import StructuralSolver
+
+    model = get_model(build_pipe_model, set_nodal_property)
+
+    reference = StructuralSolver(model).direct_method()
+    truncated = StructuralSolver(model).mode_superposition(4)
+    corrected = StructuralSolver(model).mode_superposition(4, residual_flexibility=True)
+
+    error_truncated = get_relative_error(truncated, reference)
+    error_corrected = get_relative_error(corrected, reference)
+
+    assert error_truncated > 1e-3
+    assert error_corrected < 0.1 * error_truncated
+
+
+def test_residual_flexibility_is_skipped_with_rigid_body_modes(build_pipe_model, set_nodal_property, capsys):
+
+    from pulse.processing.structural_solver import StructuralSolver
+
+    # the free pipe has rigid body modes, therefore its stiffness matrix is singular
+    model = get_model(build_pipe_model, set_nodal_property, clamped=False)
+
+    truncated = StructuralSolver(model).mode_superposition(10)
+    capsys.readouterr()
+    corrected = StructuralSolver(model).mode_superposition(10, residual_flexibility=True)
+
+    assert "the residual flexibility has been ignored" in capsys.readouterr().out
+    # the rigid body modes are only defined up to round-off in each modal analysis
+    np.testing.assert_allclose(corrected, truncated, rtol=0, atol=1e-6 * np.abs(truncated).max())
@@ -0,0 +1,32 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from pulse.processing.sparse_pattern import FixedSparsityPattern
+
+
+def test_fixed_sparsity_pattern_matches_sliced_matrices():
+
+    rng = np.random.default_rng(0)
+    total_dof = 12
+    rows = rng.integers(0, total_dof, 60)
+    cols = rng.integers(0, total_dof, 60)
+    data = rng.random((5, 60)) + 1j*rng.random((5, 60))
+
+    prescribed = [7, 2]
+    unprescribed = np.delete(np.arange(total_dof), prescribed)
+
+    pattern = FixedSparsityPattern(rows, cols, unprescribed, unprescribed, total_dof)
+    prescribed_pattern = FixedSparsityPattern(rows, cols, unprescribed, prescribed, total_dof)
+
+    data_K = pattern.scatter(data)
+    data_Kr = prescribed_pattern.scatter(data)
+
+    assert data_K.shape == (5, pattern.nnz)
+    assert pattern.matches(rows, cols)
+
+    for i, _data in enumerate(data):
+        full = csr_matrix((_data, (rows, cols)), shape=(total_dof, total_dof))
+        K = full[unprescribed, :][:, unprescribed].toarray()
+        Kr = full[unprescribed, :][:, prescribed].toarray()
+        np.testing.assert_allclose(pattern.matrix(data_K[i]).toarray(), K)
+        np.testing.assert_allclose(prescribed_pattern.matrix(data_Kr[i]).toarray(), Kr)
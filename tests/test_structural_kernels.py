@@ -0,0 +1,101 @@
+import pytest
+import numpy as np
+
+from pulse.model.node import Node
+from pulse.model.structural_element import StructuralElement
+from pulse.model.cross_section import CrossSection, get_beam_section_properties
+from pulse.model.properties.material import Material
+from pulse.processing.structural_kernels import LocalMatrixCache, timoshenko_matrices
+from pulse.utils.common_utils import transformation_matrix_3x3xN
+
+
+def get_cross_section(element_type):
+    if element_type == "beam_1":
+        section_label = "rectangular_beam"
+        section_parameters = [0.06, 0.10, 0.0, 0.0, 0.0, 0.0]
+        section_info = {    "section_type_label" : section_label,
+                            "section_parameters" : section_parameters,
+                            "section_properties" : get_beam_section_properties(section_label, section_parameters)    }
+        cross_section = CrossSection(beam_section_info=section_info)
+    else:
+        section_info = {    "section_type_label" : "pipe",
+                            "section_parameters" : [0.1, 0.008, 0.0, 0.0, 0.01, 50.0]    }
+        cross_section = CrossSection(pipe_section_info=section_info)
+        cross_section.update_properties()
+    return cross_section
+
+
+def get_elements(element_type, number_elements=8):
+
+    material = Material("steel", 7860, identifier=1, elasticity_modulus=210e9, poisson_ratio=0.3)
+    cross_section = get_cross_section(element_type)
+
+    points = np.cumsum(np.r_[[[0, 0, 0]], np.random.default_rng(0).uniform(0.01, 0.1, (number_elements, 3))], axis=0)
+    nodes = [Node(*point, global_index=index) for index, point in enumerate(points)]
+
+    elements = list()
+    for index in range(number_elements):
+        element = StructuralElement(    nodes[index],
+                                        nodes[index + 1],
+                                        index + 1,
+                                        element_type = element_type,
+                                        material = material,
+                                        cross_section = cross_section    )
+        element.valve_length = 0.5
+        element.valve_mass = 20
+        elements.append(element)
+
+    delta = np.array([element.directional_vector for element in elements])
+    transformation_matrices = transformation_matrix_3x3xN(delta[:,0], delta[:,1], delta[:,2])
+    for element, matrix in zip(elements, transformation_matrices):
+        element.sub_transformation_matrix = matrix
+
+    return elements, transformation_matrices
+
+
+@pytest.mark.parametrize("element_type", ["pipe_1", "valve", "beam_1"])
+def test_timoshenko_matrices_match_element_matrices(element_type):
+
+    elements, transformation_matrices = get_elements(element_type)
+
+    expected = [element.matrices_gcs() for element in elements]
+    stiffness, mass = timoshenko_matrices(elements, transformation_matrices)
+
+    for (Ke, Me), K, M in zip(expected, stiffness, mass):
+        np.testing.assert_allclose(K, Ke, rtol=1e-10, atol=1e-10*np.abs(Ke).max())
+        np.testing.assert_allclose(M, Me, rtol=1e-10, atol=1e-10*np.abs(Me).max())
+
+
+def test_local_matrix_cache_shares_equal_elements():
+
+    material = Material("steel", 7860, identifier=1, elasticity_modulus=210e9, poisson_ratio=0.3)
+    cross_section = get_cross_section("pipe_1")
+
+    nodes = [Node(0.1*i, 0, 0, global_index=i) for i in range(11)]
+    elements = [StructuralElement(nodes[i], nodes[i+1], i+1, material=material, cross_section=cross_section) for i in range(10)]
+    for element in elements:
+        element.sub_transformation_matrix = np.eye(3)
+
+    cache = LocalMatrixCache(max_size=2)
+    stiffness, mass = timoshenko_matrices(elements, cache=cache)
+
+    assert len(cache) == 1
+    assert cache.misses == 1
+    assert cache.hits == 9
+
+    expected_stiffness, expected_mass = elements[-1].matrices_gcs()
+    np.testing.assert_allclose(stiffness[-1], expected_stiffness, atol=1e-10*np.abs(expected_stiffness).max())
+    np.testing.assert_allclose(mass[-1], expected_mass, atol=1e-10*np.abs(expected_mass).max())
+
+    timoshenko_matrices(elements, cache=cache)
+    assert cache.hits == 19
+    assert cache.hit_rate == pytest.approx(0.95)
+
+    # the counters of a new assembly start from zero while the entries are kept
+    cache.reset_statistics()
+    timoshenko_matrices(elements, cache=cache)
+    assert (cache.hits, cache.misses) == (10, 0)
+    assert cache.hit_rate == pytest.approx(1.)
+
+    cache.invalidate()
+    assert len(cache) == 0
@@ -0,0 +1,75 @@
+import os
+import pytest
+import numpy as np
+from scipy.sparse import diags, random as sparse_random
+from scipy.sparse.linalg import spsolve
+
+from pulse.processing.sweep_executor import SweepExecutor, SweepSystem
+
+
+def get_sweep_system(size=200, steps=7):
+    K = sparse_random(size, size, density=0.02, random_state=2)
+    K = (K + K.T + diags(np.full(size, 10.))).tocsr()
+    K.sort_indices()
+    M = diags(np.linspace(1, 2, size)).tocsr()
+
+    omega = np.linspace(1, 3, steps)
+    # the mass matrix is stored in the pattern of the stiffness matrix
+    mass_data = np.asarray(M[K.nonzero()]).ravel()
+    system = SweepSystem(   K.indices,
+                            K.indptr,
+                            K.shape,
+                            np.ones((size, steps), dtype=complex),
+                            constant_data = np.array([K.data, mass_data], dtype=complex),
+                            coefficients = np.array([np.full(steps, 1 + 0.01j), -omega**2])  )
+
+    expected = np.array([spsolve(K*(1 + 0.01j) - (w**2)*M, np.ones(size, dtype=complex)) for w in omega]).T
+    return system, expected
+
+
+# the process mode spawns a new interpreter for each worker; set PULSE_SKIP_PROCESS_TESTS=1 where this is too slow
+process_mode = pytest.param("process", marks=pytest.mark.skipif(os.environ.get("PULSE_SKIP_PROCESS_TESTS") == "1",
+                                                                  reason="process pool tests disabled"))
+
+
+@pytest.mark.parametrize("mode", ["serial", "thread", process_mode])
+def test_sweep_executor_modes(mode):
+
+    system, expected = get_sweep_system()
+    executor = SweepExecutor(mode=mode, number_of_workers=3, linear_solver="superlu", chunk_size=2)
+    solution = executor.solve(system)
+    executor.release()
+
+    np.testing.assert_allclose(solution, expected, rtol=1e-8)
+
+
+def test_sweep_executor_stop_processing():
+
+    system, _ = get_sweep_system()
+    executor = SweepExecutor(mode="serial", linear_solver="superlu")
+
+    assert executor.solve(system, stop_processing=lambda: True) is None
+
+
+def test_sweep_executor_chunks():
+
+    executor = SweepExecutor(mode="thread", number_of_workers=2, chunk_size=3)
+    chunks = executor.get_chunks(8)
+
+    assert [list(chunk) for chunk in chunks] == [[0, 1, 2], [3, 4, 5], [6, 7]]
+
+
+@pytest.mark.parametrize("mode", ["serial", "thread", process_mode])
+def test_sweep_executor_load_cases(mode):
+
+    system, expected = get_sweep_system()
+    # the load cases are stacked along the third axis of the right-hand side
+    system.rhs = np.stack([system.rhs, 2j*system.rhs], axis=2)
+
+    executor = SweepExecutor(mode=mode, number_of_workers=3, linear_solver="superlu", chunk_size=2)
+    solution = executor.solve(system)
+    executor.release()
+
+    assert solution.shape == (*expected.shape, 2)
+    np.testing.assert_allclose(solution[:, :, 0], expected, rtol=1e-8)
+    np.testing.assert_allclose(solution[:, :, 1], 2j*expected, rtol=1e-8)
@@ -0,0 +1,35 @@
+import numpy as np
+from scipy.optimize import root, fsolve
+
+from pulse.model.wall_friction import friction_factors, friction_velocities, clear_wall_friction_cache
+
+
+def test_friction_velocities_match_log_law_roots():
+
+    clear_wall_friction_cache()
+
+    U = np.array([0.5, 5., 30., 30.])
+    d = np.array([0.05, 0.1, 0.3, 0.3])
+    nu = np.array([1.5e-5, 1e-6, 1.5e-5, 1.5e-5])
+
+    expected = list()
+    for u, di, n in zip(U, d, nu):
+        transc = lambda x: (u/x - (2.44 * np.log(x * di/(2*n)) + 2))**2
+        expected.append(root(transc, 1e-4, method='hybr').x[0])
+
+    np.testing.assert_allclose(friction_velocities(U, d, nu), expected, rtol=1e-8)
+    np.testing.assert_allclose(friction_velocities(U[0], d[0], nu[0]), expected[0], rtol=1e-8)
+
+
+def test_friction_factors_match_colebrook_roots():
+
+    clear_wall_friction_cache()
+
+    Re = np.array([4e3, 1e5, 1e5, 2e7])
+
+    expected = list()
+    for r in Re:
+        colebrook_equation = lambda x: 2 * np.log10(r * (x**0.5)) - 0.8 - (1 / (x**0.5))
+        expected.append(fsolve(colebrook_equation, 1 / ((-1.8 * np.log10(6.9 / r))**2))[0])
+
+    np.testing.assert_allclose(friction_factors(Re), expected, rtol=1e-8)